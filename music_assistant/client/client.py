@@ -6,13 +6,16 @@ import asyncio
 import logging
 import urllib.parse
 import uuid
-from collections.abc import Callable, Coroutine
+from collections.abc import AsyncGenerator, Callable, Coroutine
 from typing import TYPE_CHECKING, Any
 
 from music_assistant.client.exceptions import ConnectionClosed, InvalidServerVersion, InvalidState
+from music_assistant.common.helpers.json_patch import apply_patch
 from music_assistant.common.models.api import (
+    DELTA_EVENT_TYPES,
     CommandMessage,
     ErrorResultMessage,
+    EventDeltaMessage,
     EventMessage,
     ResultMessageBase,
     ServerInfoMessage,
@@ -55,6 +58,8 @@ class MusicAssistantClient:
         self.connection = WebsocketsConnection(server_url, aiohttp_session)
         self.logger = logging.getLogger(__package__)
         self._result_futures: dict[str | int, asyncio.Future[Any]] = {}
+        self._partial_results: dict[str | int, list[Any]] = {}
+        self._result_queues: dict[str | int, asyncio.Queue[ResultMessageBase | None]] = {}
         self._subscribers: list[EventSubscriptionType] = []
         self._stop_called: bool = False
         self._loop: asyncio.AbstractEventLoop | None = None
@@ -66,6 +71,10 @@ class MusicAssistantClient:
         self._server_info: ServerInfoMessage | None = None
         self._provider_manifests: dict[str, ProviderManifest] = {}
         self._providers: dict[str, ProviderInstance] = {}
+        # (players/queues, object id) --> (sequence number, state), when using delta updates
+        self._states: dict[tuple[str, str], tuple[int, dict[str, Any]]] = {}
+        self._resyncing = False
+        self._pending_deltas: list[EventDeltaMessage] = []
 
     @property
     def server_info(self) -> ServerInfoMessage | None:
@@ -188,6 +197,38 @@ class MusicAssistantClient:
 
         return remove_listener
 
+    async def subscribe_events(
+        self,
+        event_filter: EventType | tuple[EventType, ...] | None = None,
+        id_filter: str | tuple[str, ...] | None = None,
+    ) -> None:
+        """Set the events the server sends to this client (None for all).
+
+        Unlike subscribe, this filters the events at the server so other events are not
+        even sent to the client. Events without object id are not filtered by id.
+        Note that the players and queues state of the client is kept up-to-date by events.
+            :param event_filter: Optionally only receive these events
+            :param id_filter: Optionally only receive events for these id's
+        """
+        if isinstance(event_filter, EventType):
+            event_filter = (event_filter,)
+        if isinstance(id_filter, str):
+            id_filter = (id_filter,)
+        await self.send_command(
+            "subscribe_events",
+            require_schema=27,
+            event_types=event_filter,
+            object_ids=id_filter,
+        )
+
+    async def enable_delta_updates(self) -> None:
+        """Receive the player and queue updates as (smaller) deltas instead of full objects.
+
+        The deltas are applied to the local state of the players and queues,
+        so subscribers still receive the full player and queue events.
+        """
+        await self._resync_state("delta_updates", enabled=True)
+
     async def connect(self) -> None:
         """Connect to the remote Music Assistant Server."""
         self._loop = asyncio.get_running_loop()
@@ -253,6 +294,75 @@ class MusicAssistantClient:
             return await future
         finally:
             self._result_futures.pop(command_message.message_id)
+            self._partial_results.pop(command_message.message_id, None)
+
+    async def iter_command(
+        self,
+        command: str,
+        page_size: int = 500,
+        prefetch_pages: int = 2,
+        **kwargs: Any,
+    ) -> AsyncGenerator[Any, None]:
+        """Send a command and iterate the items of its (large) list result.
+
+        The result is sent in pages of page_size items, the server sends at most
+        prefetch_pages pages ahead of the pages that are consumed.
+        Stopping the iteration early cancels the command at the server.
+        """
+        if not self.connection.connected or not self._loop:
+            msg = "Not connected"
+            raise InvalidState(msg)
+        if self.server_info is not None and self.server_info.schema_version < 29:
+            msg = (
+                "Command not available due to incompatible server version. Update the Music "
+                "Assistant Server to a version that supports at least api schema 29."
+            )
+            raise InvalidServerVersion(msg)
+
+        command_message = CommandMessage(
+            message_id=uuid.uuid4().hex,
+            command=command,
+            args=kwargs,
+            page_size=page_size,
+            credits=prefetch_pages,
+        )
+        queue: asyncio.Queue[ResultMessageBase | None] = asyncio.Queue()
+        self._result_queues[command_message.message_id] = queue
+        finished = False
+        try:
+            await self.connection.send_message(command_message.to_dict())
+            while True:
+                result_msg = await queue.get()
+                if result_msg is None:
+                    # the connection was closed while waiting for the (next) page
+                    finished = True
+                    msg = "Connection closed while receiving the result"
+                    raise ConnectionClosed(msg)
+                if isinstance(result_msg, ErrorResultMessage):
+                    finished = True
+                    exc = ERROR_MAP[result_msg.error_code]
+                    raise exc(result_msg.details)
+                assert isinstance(result_msg, SuccessResultMessage)
+                if not result_msg.partial:
+                    finished = True
+                    if isinstance(result_msg.result, list):
+                        for item in result_msg.result:
+                            yield item
+                    else:
+                        yield result_msg.result
+                    return
+                for item in result_msg.result:
+                    yield item
+                # the page is consumed, the server may send the next one
+                await self.send_command_no_wait(
+                    "ack_result", message_id=command_message.message_id, credits=1
+                )
+        finally:
+            self._result_queues.pop(command_message.message_id)
+            if not finished and self.connection.connected:
+                await self.send_command_no_wait(
+                    "cancel_result", message_id=command_message.message_id
+                )
 
     async def send_command_no_wait(
         self,
@@ -317,6 +427,9 @@ class MusicAssistantClient:
         # cancel all command-tasks awaiting a result
         for future in self._result_futures.values():
             future.cancel()
+        # wake up all iterations awaiting a (next) page of their result
+        for queue in self._result_queues.values():
+            queue.put_nowait(None)
         await self.connection.disconnect()
 
     def _handle_incoming_message(self, raw: dict[str, Any]) -> None:
@@ -328,12 +441,24 @@ class MusicAssistantClient:
         msg = parse_message(raw)
         # handle result message
         if isinstance(msg, ResultMessageBase):
+            if queue := self._result_queues.get(msg.message_id):
+                # (partial) result of iter_command
+                queue.put_nowait(msg)
+                return
+
             future = self._result_futures.get(msg.message_id)
 
             if future is None:
                 # no listener for this result
                 return
+            if isinstance(msg, SuccessResultMessage) and msg.partial:
+                # (large) listings are sent in multiple (partial) results
+                self._partial_results.setdefault(msg.message_id, []).extend(msg.result)
+                return
             if isinstance(msg, SuccessResultMessage):
+                if partial_results := self._partial_results.pop(msg.message_id, None):
+                    future.set_result(partial_results + msg.result)
+                    return
                 future.set_result(msg.result)
                 return
             if isinstance(msg, ErrorResultMessage):
@@ -341,9 +466,18 @@ class MusicAssistantClient:
                 future.set_exception(exc(msg.details))
                 return
 
+        # handle EventDeltaMessage
+        if isinstance(msg, EventDeltaMessage):
+            self.logger.debug("Received event delta: %s", msg)
+            self._handle_event_delta(msg)
+            return
+
         # handle EventMessage
         if isinstance(msg, EventMessage):
             self.logger.debug("Received event: %s", msg)
+            if msg.event == EventType.PLAYER_REMOVED and msg.object_id:
+                self._states.pop(("players", msg.object_id), None)
+                self._states.pop(("queues", msg.object_id), None)
             self._handle_event(msg)
             return
 
@@ -354,6 +488,56 @@ class MusicAssistantClient:
             msg,
         )
 
+    def _handle_event_delta(self, msg: EventDeltaMessage) -> None:
+        """Apply a (player/queue) delta to the local state and forward it as full event."""
+        if self._resyncing:
+            # the delta is applied (or discarded) once the full state is received
+            self._pending_deltas.append(msg)
+            return
+        key = (DELTA_EVENT_TYPES[msg.event], msg.object_id)
+        prev = self._states.get(key)
+        if msg.seq == 0:
+            state = apply_patch({}, msg.patch)
+        elif prev is None or msg.seq > prev[0] + 1:
+            # a delta was missed, get the full state from the server again
+            self.logger.debug("Missed delta for %s/%s, resyncing state", *key)
+            assert self._loop
+            self._resyncing = True
+            self._pending_deltas.append(msg)
+            self._loop.create_task(self._resync_state())
+            return
+        elif msg.seq <= prev[0]:
+            # the delta is already included in the (resynced) state
+            return
+        else:
+            state = apply_patch(prev[1], msg.patch)
+        self._states[key] = (msg.seq, state)
+        self._handle_event(MassEvent(msg.event, msg.object_id, state))
+
+    async def _resync_state(self, command: str = "resync_state", **kwargs: Any) -> None:
+        """Fetch the full state of all players and queues (that the deltas apply to)."""
+        self._resyncing = True
+        try:
+            result = await self.send_command(command, require_schema=28, **kwargs)
+        except Exception:
+            self._pending_deltas = []
+            raise
+        finally:
+            self._resyncing = False
+        self._states = {
+            (kind, object_id): (item["seq"], item["state"])
+            for kind, items in result.items()
+            for object_id, item in items.items()
+        }
+        for (kind, object_id), (_, state) in self._states.items():
+            event = EventType.PLAYER_UPDATED if kind == "players" else EventType.QUEUE_UPDATED
+            self._handle_event(MassEvent(event, object_id, state))
+        # apply the deltas that were received in the meantime
+        pending_deltas = self._pending_deltas
+        self._pending_deltas = []
+        for msg in pending_deltas:
+            self._handle_event_delta(msg)
+
     def _handle_event(self, event: MassEvent) -> None:
         """Forward event to subscribers."""
         if self._stop_called:
@@ -13,6 +13,7 @@ from music_assistant.common.models.media_items import (
     MediaItemImage,
     MediaItemMetadata,
     MediaItemType,
+    PagedItems,
     Playlist,
     PlaylistTrack,
     Radio,
@@ -34,6 +35,30 @@ class Music:
         """Handle Initialization."""
         self.client = client
 
+    async def get_library_items_page(
+        self,
+        media_type: MediaType,
+        favorite: bool | None = None,
+        search: str | None = None,
+        limit: int | None = None,
+        order_by: str | None = None,
+        cursor: str | None = None,
+    ) -> PagedItems:
+        """Get a (cursor based) page of library items of the given type from the server."""
+        result = await self.client.send_command(
+            f"music/{media_type.value}s/library_items_page",
+            favorite=favorite,
+            search=search,
+            limit=limit,
+            order_by=order_by,
+            cursor=cursor,
+        )
+        # library items are always full media items (never an ItemMapping)
+        return PagedItems(
+            items=[cast(MediaItemType, media_from_dict(obj)) for obj in result["items"]],
+            next_cursor=result["next_cursor"],
+        )
+
     #  Tracks related endpoints/commands
 
     async def get_library_tracks(
@@ -47,6 +47,11 @@ def serialize_to_json(obj: Any) -> Any:
 
 def json_dumps(data: Any, indent: bool = False) -> str:
     """Dump json string."""
+    return json_dumps_bytes(data, indent).decode("utf-8")
+
+
+def json_dumps_bytes(data: Any, indent: bool = False) -> bytes:
+    """Dump json as (utf-8 encoded) bytes."""
     # we use the passthrough dataclass option because we use mashumaro for that
     option = orjson.OPT_OMIT_MICROSECONDS | orjson.OPT_PASSTHROUGH_DATACLASS
     if indent:
@@ -55,7 +60,7 @@ def json_dumps(data: Any, indent: bool = False) -> str:
         data,
         default=get_serializable_value,
         option=option,
-    ).decode("utf-8")
+    )
 
 
 json_loads = orjson.loads
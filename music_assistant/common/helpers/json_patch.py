@@ -0,0 +1,71 @@
+"""Helpers to create and apply (JSON-patch style) deltas between (json) dicts."""
+
+from __future__ import annotations
+
+from typing import Any
+
+
+def _escape(key: str) -> str:
+    """Escape a key for use in a JSON pointer path."""
+    return str(key).replace("~", "~0").replace("/", "~1")
+
+
+def _unescape(key: str) -> str:
+    """Unescape a key from a JSON pointer path."""
+    return key.replace("~1", "/").replace("~0", "~")
+
+
+def get_patch(old: dict[str, Any], new: dict[str, Any], path: str = "") -> list[dict[str, Any]]:
+    """
+    Return the (JSON-patch style) operations to get from the old to the new dict.
+
+    Nested dicts are compared recursively, any other changed value is replaced as a whole.
+    """
+    patch: list[dict[str, Any]] = []
+    for key, value in new.items():
+        key_path = f"{path}/{_escape(key)}"
+        if key not in old:
+            patch.append({"op": "add", "path": key_path, "value": value})
+            continue
+        old_value = old[key]
+        if old_value == value:
+            continue
+        if isinstance(value, dict) and isinstance(old_value, dict):
+            patch += get_patch(old_value, value, key_path)
+        else:
+            patch.append({"op": "replace", "path": key_path, "value": value})
+    for key in old:
+        if key not in new:
+            patch.append({"op": "remove", "path": f"{path}/{_escape(key)}"})
+    return patch
+
+
+def apply_patch(obj: dict[str, Any], patch: list[dict[str, Any]]) -> dict[str, Any]:
+    """
+    Return a copy of the dict with the (JSON-patch style) operations applied.
+
+    Only the (nested) dicts that are changed by the patch are copied.
+    An operation on the root path ("") replaces the whole dict.
+    """
+    for operation in patch:
+        if not (path := operation["path"]):
+            obj = operation["value"]
+            continue
+        keys = [_unescape(x) for x in path.split("/")[1:]]
+        obj = _apply_operation(obj, keys, operation)
+    return obj
+
+
+def _apply_operation(
+    obj: dict[str, Any], keys: list[str], operation: dict[str, Any]
+) -> dict[str, Any]:
+    """Return a copy of the dict with a single operation applied at the (nested) key."""
+    result = dict(obj)
+    key = keys[0]
+    if len(keys) > 1:
+        result[key] = _apply_operation(result[key], keys[1:], operation)
+    elif operation["op"] == "remove":
+        result.pop(key, None)
+    else:
+        result[key] = operation["value"]
+    return result
@@ -8,8 +8,18 @@ from typing import Any
 from mashumaro.mixins.orjson import DataClassORJSONMixin
 
 from music_assistant.common.helpers.json import get_serializable_value
+from music_assistant.common.models.enums import EventType
 from music_assistant.common.models.event import MassEvent
 
+# the events of which the (player or queue) state can be sent as delta
+DELTA_EVENT_TYPES: dict[EventType, str] = {
+    EventType.PLAYER_ADDED: "players",
+    EventType.PLAYER_UPDATED: "players",
+    EventType.QUEUE_ADDED: "queues",
+    EventType.QUEUE_UPDATED: "queues",
+    EventType.QUEUE_ITEMS_UPDATED: "queues",
+}
+
 
 @dataclass
 class CommandMessage(DataClassORJSONMixin):
@@ -18,6 +28,11 @@ class CommandMessage(DataClassORJSONMixin):
     message_id: str | int
     command: str
     args: dict[str, Any] | None = None
+    # send a (large) list result in partial results of (at most) this many items
+    page_size: int | None = None
+    # flow control of the partial results: the number of (partial) pages that may be sent
+    # before the client acknowledges them (see the ack_result command), None for no limit
+    credits: int | None = None
 
 
 @dataclass
@@ -47,6 +62,24 @@ class ErrorResultMessage(ResultMessageBase):
 EventMessage = MassEvent
 
 
+@dataclass
+class EventDeltaMessage(DataClassORJSONMixin):
+    """
+    Message sent instead of a player/queue event to clients that opted in to delta updates.
+
+    Holds the (JSON-patch style) changes of the state of the player or queue, the sequence
+    number is incremented by one on every change of that state and starts at 0 with
+    a patch that replaces the whole state (e.g. when a player is added).
+    """
+
+    event: EventType
+    object_id: str
+    seq: int
+    patch: list[dict[str, Any]] = field(
+        default_factory=list, metadata={"serialize": lambda v: get_serializable_value(v)}
+    )
+
+
 @dataclass
 class ServerInfoMessage(DataClassORJSONMixin):
     """Message sent by the server with it's info when a client connects."""
@@ -61,12 +94,19 @@ class ServerInfoMessage(DataClassORJSONMixin):
 
 
 MessageType = (
-    CommandMessage | EventMessage | SuccessResultMessage | ErrorResultMessage | ServerInfoMessage
+    CommandMessage
+    | EventMessage
+    | EventDeltaMessage
+    | SuccessResultMessage
+    | ErrorResultMessage
+    | ServerInfoMessage
 )
 
 
 def parse_message(raw: dict[Any, Any]) -> MessageType:
     """Parse Message from raw dict object."""
+    if "patch" in raw:
+        return EventDeltaMessage.from_dict(raw)
     if "event" in raw:
         return EventMessage.from_dict(raw)
     if "error_code" in raw:
@@ -317,9 +317,11 @@ class EventType(StrEnum):
     MEDIA_ITEM_ADDED = "media_item_added"
     MEDIA_ITEM_UPDATED = "media_item_updated"
     MEDIA_ITEM_DELETED = "media_item_deleted"
+    MEDIA_ITEMS_UPDATED = "media_items_updated"
     PROVIDERS_UPDATED = "providers_updated"
     PLAYER_CONFIG_UPDATED = "player_config_updated"
     SYNC_TASKS_UPDATED = "sync_tasks_updated"
+    LOUDNESS_ANALYSIS_UPDATED = "loudness_analysis_updated"
     AUTH_SESSION = "auth_session"
     UNKNOWN = "unknown"
 
@@ -563,6 +563,15 @@ class SearchResults(DataClassDictMixin):
     radio: Sequence[Radio | ItemMapping] = field(default_factory=list)
 
 
+@dataclass(kw_only=True)
+class PagedItems(DataClassDictMixin):
+    """Model for a (cursor based) page of (library) items."""
+
+    items: Sequence[MediaItemType] = field(default_factory=list)
+    # opaque cursor to retrieve the next page, None if there are no more items
+    next_cursor: str | None = None
+
+
 def media_from_dict(media_item: dict[str, Any]) -> MediaItemType | ItemMapping:
     """Return MediaItem from dict."""
     if "provider_mappings" not in media_item:
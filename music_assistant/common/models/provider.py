@@ -88,3 +88,21 @@ class SyncTask:
             "provider_instance": self.provider_instance,
             "media_types": [x.value for x in self.media_types],
         }
+
+
+@dataclass
+class LoudnessAnalysisTask:
+    """Progress of the (background) bulk loudness analysis of the library tracks."""
+
+    total: int
+    task: asyncio.Task[None] | None
+    completed: int = 0
+    failed: int = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return LoudnessAnalysisTask as (serializable) dict."""
+        return {
+            "total": self.total,
+            "completed": self.completed,
+            "failed": self.failed,
+        }
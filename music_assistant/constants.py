@@ -3,7 +3,7 @@
 import pathlib
 from typing import Final
 
-API_SCHEMA_VERSION: Final[int] = 26
+API_SCHEMA_VERSION: Final[int] = 29
 MIN_SCHEMA_VERSION: Final[int] = 24
 
 
@@ -52,6 +52,9 @@ CONF_BIND_PORT: Final[str] = "bind_port"
 CONF_PUBLISH_IP: Final[str] = "publish_ip"
 CONF_AUTO_PLAY: Final[str] = "auto_play"
 CONF_CROSSFADE: Final[str] = "crossfade"
+CONF_CROSSFADE_CURVE: Final[str] = "crossfade_curve"
+CONF_AUDIO_CACHE_SIZE: Final[str] = "audio_cache_size"
+CONF_NEXT_ITEM_PREFETCH: Final[str] = "next_item_prefetch"
 CONF_GROUP_MEMBERS: Final[str] = "group_members"
 CONF_HIDE_PLAYER: Final[str] = "hide_player"
 CONF_ENFORCE_MP3: Final[str] = "enforce_mp3"
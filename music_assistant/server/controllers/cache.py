@@ -6,15 +6,25 @@ import asyncio
 import functools
 import logging
 import os
+import sys
 import time
 from collections import OrderedDict
-from collections.abc import Callable, Iterator, MutableMapping
-from typing import TYPE_CHECKING, Any, ParamSpec, TypeVar
-
-from music_assistant.common.helpers.json import json_dumps, json_loads
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Any, NamedTuple, ParamSpec, TypeVar
+
+import zstandard
+
+from music_assistant.common.helpers.json import (
+    JSON_ENCODE_EXCEPTIONS,
+    json_dumps,
+    json_dumps_bytes,
+    json_loads,
+)
 from music_assistant.common.models.config_entries import ConfigEntry, ConfigValueType
-from music_assistant.common.models.enums import ConfigEntryType
+from music_assistant.common.models.enums import CacheCategory, ConfigEntryType
 from music_assistant.constants import DB_TABLE_CACHE, DB_TABLE_SETTINGS, MASS_LOGGER_NAME
+from music_assistant.server.helpers.api import api_command
 from music_assistant.server.helpers.database import DatabaseConnection
 from music_assistant.server.models.core_controller import CoreController
 
@@ -23,7 +33,28 @@ if TYPE_CHECKING:
 
 LOGGER = logging.getLogger(f"{MASS_LOGGER_NAME}.cache")
 CONF_CLEAR_CACHE = "clear_cache"
+CONF_COMPRESS_CACHE = "compress_cache"
 DB_SCHEMA_VERSION = 5
+# max (estimated) size in bytes of all items in the memory cache
+MEMORY_CACHE_MAX_SIZE = 64 * 1024 * 1024
+# items with a shorter expiration are only stored in the memory cache
+DB_CACHE_MIN_EXPIRATION = 3600 * 12
+# pending (buffered) db writes are flushed after this delay or when this many are pending
+DB_WRITE_DELAY = 10
+DB_WRITE_MAX_PENDING = 250
+# the db file is shrunk in small (incremental) vacuum steps in the background
+AUTO_VACUUM_INCREMENTAL = 2
+VACUUM_STEP_PAGES = 1000
+VACUUM_STEP_INTERVAL = 1
+VACUUM_MAX_STEPS = 250
+# binary cache payloads start with a format marker byte, followed by the (compressed)
+# json bytes. Rows without a marker (stored as text) contain plain json.
+CACHE_FORMAT_JSON = b"j"
+CACHE_FORMAT_ZSTD = b"z"
+CACHE_COMPRESS_MIN_SIZE = 1024
+CACHE_COMPRESS_LEVEL = 3
+# max number of items of a collection that are sampled for the (memory cache) size estimate
+ESTIMATE_SIZE_SAMPLE = 50
 
 
 class CacheController(CoreController):
@@ -35,7 +66,14 @@ class CacheController(CoreController):
         """Initialize core controller."""
         super().__init__(*args, **kwargs)
         self.database: DatabaseConnection | None = None
-        self._mem_cache = MemoryCache(500)
+        self._mem_cache = MemoryCache(MEMORY_CACHE_MAX_SIZE)
+        self._stats: dict[int, CacheStats] = {}
+        # buffered db writes, keyed by (category, base_key, sub_key)
+        self._pending_writes: dict[tuple[int, str, str], dict[str, Any]] = {}
+        self._flush_lock = asyncio.Lock()
+        self._flush_timer: asyncio.TimerHandle | None = None
+        self._compress = True
+        self._in_flight: dict[str, asyncio.Task] = {}
         self.manifest.name = "Cache controller"
         self.manifest.description = (
             "Music Assistant's core controller for caching data throughout the application."
@@ -64,16 +102,27 @@ class CacheController(CoreController):
                 label="Clear cache",
                 description="Reset/clear all items in the cache. ",
             ),
+            ConfigEntry(
+                key=CONF_COMPRESS_CACHE,
+                type=ConfigEntryType.BOOLEAN,
+                default_value=True,
+                label="Compress cache",
+                description="Store (larger) items in the cache database in a compressed "
+                "binary format, which saves disk space and speeds up reading them back.",
+                category="advanced",
+            ),
         )
 
     async def setup(self, config: CoreConfig) -> None:
         """Async initialize of cache module."""
         self.logger.info("Initializing cache controller...")
+        self._compress = bool(config.get_value(CONF_COMPRESS_CACHE))
         await self._setup_database()
         self.__schedule_cleanup_task()
 
     async def close(self) -> None:
         """Cleanup on exit."""
+        await self.flush()
         await self.database.close()
 
     async def get(
@@ -92,25 +141,49 @@ class CacheController(CoreController):
         category: optional category to group cache objects
         base_key: optional base key to group cache objects
         """
+        if (entry := await self.get_entry(key, checksum, category, base_key)) is None:
+            return default
+        return entry[0]
+
+    async def get_entry(
+        self,
+        key: str,
+        checksum: str | None = None,
+        category: int = 0,
+        base_key: str = "",
+        allow_expired: bool = False,
+    ) -> tuple[Any, int] | None:
+        """
+        Get object and its expiration timestamp from cache (None if not found).
+
+        If allow_expired is set, expired (stale) objects that are still present are returned too.
+        """
         if not key:
             return None
         cur_time = int(time.time())
         if checksum is not None and not isinstance(checksum, str):
             checksum = str(checksum)
 
+        stats = self._stats.setdefault(category, CacheStats())
         # try memory cache first
         memory_key = f"{category}/{base_key}/{key}"
-        cache_data = self._mem_cache.get(memory_key)
-        if cache_data and (not checksum or cache_data[1] == checksum) and cache_data[2] >= cur_time:
-            return cache_data[0]
-        # fall back to db cache
-        if (
-            db_row := await self.database.get_row(
+        cache_data = self._mem_cache.get(memory_key, allow_expired=allow_expired)
+        if cache_data and (not checksum or cache_data[1] == checksum):
+            stats.memory_hits += 1
+            return cache_data[0], cache_data[2]
+        # fall back to db cache (including the writes that are not flushed yet)
+        db_row = self._pending_writes.get((category, base_key, key))
+        if db_row is None:
+            db_row = await self.database.get_row(
                 DB_TABLE_CACHE, {"category": category, "base_key": base_key, "sub_key": key}
             )
-        ) and (not checksum or db_row["checksum"] == checksum and db_row["expires"] >= cur_time):
+        if (
+            db_row
+            and (allow_expired or db_row["expires"] >= cur_time)
+            and (not checksum or db_row["checksum"] == checksum)
+        ):
             try:
-                data = await asyncio.to_thread(json_loads, db_row["data"])
+                data, size = await asyncio.to_thread(decode_cache_data, db_row["data"])
             except Exception as exc:
                 LOGGER.error(
                     "Error parsing cache data for %s: %s",
@@ -120,13 +193,16 @@ class CacheController(CoreController):
                 )
             else:
                 # also store in memory cache for faster access
-                self._mem_cache[memory_key] = (
-                    data,
-                    db_row["checksum"],
-                    db_row["expires"],
+                self._mem_cache.set(
+                    memory_key,
+                    (data, db_row["checksum"], db_row["expires"]),
+                    size=size,
+                    expires=db_row["expires"],
                 )
-                return data
-        return default
+                stats.db_hits += 1
+                return data, db_row["expires"]
+        stats.misses += 1
+        return None
 
     async def set(
         self, key, data, checksum="", expiration=(86400 * 7), category: int = 0, base_key: str = ""
@@ -138,22 +214,79 @@ class CacheController(CoreController):
             checksum = str(checksum)
         expires = int(time.time() + expiration)
         memory_key = f"{category}/{base_key}/{key}"
-        self._mem_cache[memory_key] = (data, checksum, expires)
-        if (expires - time.time()) < 3600 * 12:
-            # do not cache items in db with short expiration
+        raw_data: str | bytes | None = None
+        # do not cache items in db with short expiration
+        if expiration >= DB_CACHE_MIN_EXPIRATION:
+            try:
+                raw_data, size = await asyncio.to_thread(encode_cache_data, data, self._compress)
+            except JSON_ENCODE_EXCEPTIONS as err:
+                # data that can not be serialized can still be kept in the memory cache
+                LOGGER.debug("Unable to serialize cache data for %s: %s", memory_key, str(err))
+        if raw_data is None:
+            # memory only: a cheap size estimate is good enough
+            size = estimate_size(data)
+        self._mem_cache.set(memory_key, (data, checksum, expires), size=size, expires=expires)
+        if raw_data is None:
             return
-        data = await asyncio.to_thread(json_dumps, data)
-        await self.database.insert_or_replace(
-            DB_TABLE_CACHE,
-            {
-                "category": category,
-                "base_key": base_key,
-                "sub_key": key,
-                "expires": expires,
-                "checksum": checksum,
-                "data": data,
-            },
-        )
+        # db writes are buffered and flushed in batches
+        self._pending_writes[(category, base_key, key)] = {
+            "category": category,
+            "base_key": base_key,
+            "sub_key": key,
+            "expires": expires,
+            "checksum": checksum,
+            "data": raw_data,
+        }
+        if len(self._pending_writes) >= DB_WRITE_MAX_PENDING:
+            self.mass.create_task(self.flush())
+        elif self._flush_timer is None:
+            self._flush_timer = self.mass.loop.call_later(
+                DB_WRITE_DELAY, self.mass.create_task, self.flush
+            )
+
+    async def flush(self) -> None:
+        """Write all pending (buffered) cache items to the database."""
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        async with self._flush_lock:
+            if not self._pending_writes:
+                return
+            rows = list(self._pending_writes.values())
+            self._pending_writes = {}
+            await self.database.insert_many(DB_TABLE_CACHE, rows, allow_replace=True)
+
+    async def single_flight(self, key: str, func: Callable[[], Awaitable[RetType]]) -> RetType:
+        """
+        Run (coroutine) func, coalescing concurrent calls with the same key.
+
+        While a call for the key is in flight, other callers await the same result
+        instead of calling func again. The call itself runs in a separate task,
+        so a caller that gets cancelled does not cancel it for the other callers.
+        """
+        if (task := self._in_flight.get(key)) is None:
+            task = self.mass.create_task(func())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _task: self._in_flight.pop(key, None))
+        return await asyncio.shield(task)
+
+    @api_command("cache/stats")
+    def get_stats(self) -> dict[str, dict[str, int]]:
+        """Return the (hit/miss) statistics of the cache, per category."""
+        result = {
+            (
+                CacheCategory(category).name.lower()
+                if category in CacheCategory._value2member_map_
+                else str(category)
+            ): asdict(stats)
+            for category, stats in self._stats.items()
+        }
+        result["memory"] = {
+            "items": len(self._mem_cache),
+            "size": self._mem_cache.size,
+            "max_size": self._mem_cache.max_size,
+        }
+        return result
 
     async def delete(
         self, key: str | None, category: int | None = None, base_key: str | None = None
@@ -168,8 +301,10 @@ class CacheController(CoreController):
             match["base_key"] = base_key
         if key is not None and category is not None and base_key is not None:
             self._mem_cache.pop(f"{category}/{base_key}/{key}", None)
+            self._pending_writes.pop((category, base_key, key), None)
         else:
             self._mem_cache.clear()
+            await self.flush()
         await self.database.delete(DB_TABLE_CACHE, match)
 
     async def clear(
@@ -180,6 +315,7 @@ class CacheController(CoreController):
     ) -> None:
         """Clear all/partial items from cache."""
         self._mem_cache.clear()
+        await self.flush()
         self.logger.info("Clearing database...")
         query_parts: list[str] = []
         if category is not None:
@@ -195,23 +331,44 @@ class CacheController(CoreController):
     async def auto_cleanup(self) -> None:
         """Run scheduled auto cleanup task."""
         self.logger.debug("Running automatic cleanup...")
-        # simply reset the memory cache
-        self._mem_cache.clear()
-        cur_timestamp = int(time.time())
-        cleaned_records = 0
-        for db_row in await self.database.get_rows(DB_TABLE_CACHE):
-            # clean up db cache object only if expired
-            if db_row["expires"] < cur_timestamp:
-                await self.database.delete(DB_TABLE_CACHE, {"id": db_row["id"]})
-                cleaned_records += 1
-            await asyncio.sleep(0)  # yield to eventloop
+        # remove the expired items from the memory cache
+        self._mem_cache.expire()
+        # remove all expired items from the db in one go (using the expires index)
+        cursor = await self.database.execute(
+            f"DELETE FROM {DB_TABLE_CACHE} WHERE expires < :expires",
+            {"expires": int(time.time())},
+        )
+        cleaned_records = cursor.rowcount
+        await self.database.commit()
         self.logger.debug("Automatic cleanup finished (cleaned up %s records)", cleaned_records)
+        await self._compact_database()
+
+    async def _compact_database(self) -> None:
+        """Release the unused space of the database file, in small steps."""
+        cursor = await self.database.execute("PRAGMA auto_vacuum;")
+        if (await cursor.fetchone())[0] != AUTO_VACUUM_INCREMENTAL:
+            # switching an existing database to incremental auto vacuum requires a full vacuum
+            self.logger.debug("Compacting database...")
+            try:
+                await self.database.vacuum()
+            except Exception as err:
+                self.logger.warning("Database vacuum failed: %s", str(err))
+            else:
+                self.logger.debug("Compacting database done")
+            return
+        for _ in range(VACUUM_MAX_STEPS):
+            if not await self.database.incremental_vacuum(VACUUM_STEP_PAGES):
+                break
+            await asyncio.sleep(VACUUM_STEP_INTERVAL)
 
     async def _setup_database(self) -> None:
         """Initialize database."""
         db_path = os.path.join(self.mass.storage_path, "cache.db")
         self.database = DatabaseConnection(db_path)
         await self.database.setup()
+        # NOTE: for an existing database this only takes effect after the
+        # (one-time) full vacuum that is done by the (background) cleanup task
+        await self.database.execute(f"PRAGMA auto_vacuum={AUTO_VACUUM_INCREMENTAL};")
 
         # always create db tables if they don't exist to prevent errors trying to access them later
         await self.__create_database_tables()
@@ -243,14 +400,6 @@ class CacheController(CoreController):
             {"key": "version", "value": str(DB_SCHEMA_VERSION), "type": "str"},
         )
         await self.__create_database_indexes()
-        # compact db (vacuum) at startup
-        self.logger.debug("Compacting database...")
-        try:
-            await self.database.vacuum()
-        except Exception as err:
-            self.logger.warning("Database vacuum failed: %s", str(err))
-        else:
-            self.logger.debug("Compacting database done")
 
     async def __create_database_tables(self) -> None:
         """Create database table(s)."""
@@ -298,6 +447,10 @@ class CacheController(CoreController):
             f"CREATE INDEX IF NOT EXISTS {DB_TABLE_CACHE}_category_base_key_sub_key_idx "
             f"ON {DB_TABLE_CACHE}(category,base_key,sub_key);"
         )
+        await self.database.execute(
+            f"CREATE INDEX IF NOT EXISTS {DB_TABLE_CACHE}_expires_idx "
+            f"ON {DB_TABLE_CACHE}(expires);"
+        )
         await self.database.commit()
 
     def __schedule_cleanup_task(self) -> None:
@@ -307,6 +460,65 @@ class CacheController(CoreController):
         self.mass.loop.call_later(3600, self.__schedule_cleanup_task)
 
 
+def estimate_size(data: Any, depth: int = 3) -> int:
+    """
+    Return a cheap estimate of the (json) size in bytes of the data.
+
+    Used for the accounting of the memory cache, where serializing the data just to
+    determine its size would cost more than the cache saves. Large collections are sampled.
+    """
+    if isinstance(data, str | bytes | bytearray):
+        return len(data)
+    if depth <= 0 or data is None or isinstance(data, bool | int | float):
+        return sys.getsizeof(data)
+    if isinstance(data, dict):
+        values: list[Any] = [*data.keys(), *data.values()]
+    elif isinstance(data, list | tuple | set | frozenset):
+        values = list(data)
+    elif hasattr(data, "__dict__"):
+        values = list(vars(data).values())
+    else:
+        return sys.getsizeof(data)
+    if not values:
+        return sys.getsizeof(data)
+    sample = values[:ESTIMATE_SIZE_SAMPLE]
+    sample_size = sum(estimate_size(x, depth - 1) for x in sample)
+    return sample_size * len(values) // len(sample)
+
+
+def encode_cache_data(data: Any, compress: bool = True) -> tuple[str | bytes, int]:
+    """
+    Encode data for storage in the cache database.
+
+    Returns the payload and the (uncompressed) size of the json.
+    Without compression the data is stored as (legacy) json text.
+    """
+    if not compress:
+        raw_json = json_dumps(data)
+        return raw_json, len(raw_json)
+    raw_json = json_dumps_bytes(data)
+    if len(raw_json) < CACHE_COMPRESS_MIN_SIZE:
+        return CACHE_FORMAT_JSON + raw_json, len(raw_json)
+    return (
+        CACHE_FORMAT_ZSTD + zstandard.compress(raw_json, CACHE_COMPRESS_LEVEL),
+        len(raw_json),
+    )
+
+
+def decode_cache_data(payload: str | bytes) -> tuple[Any, int]:
+    """Decode data from the cache database, returns the data and the (uncompressed) size."""
+    if isinstance(payload, str):
+        # legacy json text
+        return json_loads(payload), len(payload)
+    marker, raw_data = payload[:1], payload[1:]
+    if marker == CACHE_FORMAT_ZSTD:
+        raw_data = zstandard.decompress(raw_data)
+    elif marker != CACHE_FORMAT_JSON:
+        msg = f"Unknown cache data format: {marker!r}"
+        raise ValueError(msg)
+    return json_loads(raw_data), len(raw_data)
+
+
 Param = ParamSpec("Param")
 RetType = TypeVar("RetType")
 
@@ -314,8 +526,15 @@ RetType = TypeVar("RetType")
 def use_cache(
     expiration: int = 86400 * 30,
     category: int = 0,
+    stale_while_revalidate: bool = False,
 ) -> Callable[[Callable[Param, RetType]], Callable[Param, RetType]]:
-    """Return decorator that can be used to cache a method's result."""
+    """
+    Return decorator that can be used to cache a method's result.
+
+    Concurrent calls with the same arguments share a single call of the method.
+    With stale_while_revalidate, an expired (but still present) result is returned
+    right away while it is refreshed in the background.
+    """
 
     def wrapper(func: Callable[Param, RetType]) -> Callable[Param, RetType]:
         @functools.wraps(func)
@@ -331,16 +550,12 @@ def use_cache(
             for key in sorted(kwargs.keys()):
                 cache_sub_key_parts.append(f"{key}{kwargs[key]}")
             cache_sub_key = ".".join(cache_sub_key_parts)
+            cache: CacheController = method_class.cache
 
-            cachedata = await method_class.cache.get(
-                cache_sub_key, checksum=cache_checksum, category=category, base_key=cache_base_key
-            )
-
-            if not skip_cache and cachedata is not None:
-                return cachedata
-            result = await func(*args, **kwargs)
-            asyncio.create_task(
-                method_class.cache.set(
+            async def _get_and_cache() -> RetType:
+                result = await func(*args, **kwargs)
+                # NOTE: the db write is buffered by the cache controller
+                await cache.set(
                     cache_sub_key,
                     result,
                     expiration=expiration,
@@ -348,55 +563,107 @@ def use_cache(
                     category=category,
                     base_key=cache_base_key,
                 )
-            )
-            return result
+                return result
+
+            flight_key = f"{category}/{cache_base_key}/{cache_sub_key}/{cache_checksum}"
+            entry = None
+            if not skip_cache:
+                entry = await cache.get_entry(
+                    cache_sub_key,
+                    checksum=cache_checksum,
+                    category=category,
+                    base_key=cache_base_key,
+                    allow_expired=stale_while_revalidate,
+                )
+            if entry is not None and entry[0] is not None:
+                cachedata, expires = entry
+                if expires < time.time():
+                    # stale data: refresh in the background (if not already in flight)
+                    cache.mass.create_task(cache.single_flight(flight_key, _get_and_cache))
+                return cachedata
+            return await cache.single_flight(flight_key, _get_and_cache)
 
         return wrapped
 
     return wrapper
 
 
-class MemoryCache(MutableMapping):
-    """Simple limited in-memory cache implementation."""
+@dataclass
+class CacheStats:
+    """Hit/miss statistics of a cache category."""
 
-    def __init__(self, maxlen: int) -> None:
-        """Initialize."""
-        self._maxlen = maxlen
-        self.d = OrderedDict()
+    memory_hits: int = 0
+    db_hits: int = 0
+    misses: int = 0
 
-    @property
-    def maxlen(self) -> int:
-        """Return max length."""
-        return self._maxlen
 
-    def get(self, key: str, default: Any = None) -> Any:
-        """Return item or default."""
-        return self.d.get(key, default)
+class MemoryCacheEntry(NamedTuple):
+    """Entry in the memory cache."""
 
-    def pop(self, key: str, default: Any = None) -> Any:
-        """Pop item from collection."""
-        return self.d.pop(key, default)
+    value: Any
+    size: int
+    expires: float
 
-    def __getitem__(self, key: str) -> Any:
-        """Get item."""
-        self.d.move_to_end(key)
-        return self.d[key]
 
-    def __setitem__(self, key: str, value: Any) -> None:
-        """Set item."""
-        if key in self.d:
-            self.d.move_to_end(key)
-        elif len(self.d) == self.maxlen:
-            self.d.popitem(last=False)
-        self.d[key] = value
+class MemoryCache:
+    """Size-bounded, expiration-aware in-memory (LRU) cache."""
+
+    def __init__(self, max_size: int) -> None:
+        """Initialize."""
+        self._max_size = max_size
+        self._size = 0
+        self.d: OrderedDict[str, MemoryCacheEntry] = OrderedDict()
 
-    def __delitem__(self, key) -> None:
-        """Delete item."""
-        del self.d[key]
+    @property
+    def max_size(self) -> int:
+        """Return max (estimated) size in bytes of all items."""
+        return self._max_size
 
-    def __iter__(self) -> Iterator:
-        """Iterate items."""
-        return self.d.__iter__()
+    @property
+    def size(self) -> int:
+        """Return (estimated) size in bytes of all items."""
+        return self._size
+
+    def get(self, key: str, default: Any = None, allow_expired: bool = False) -> Any:
+        """Return (unexpired) item or default."""
+        if (entry := self.d.get(key)) is None:
+            return default
+        if not allow_expired and entry.expires < time.time():
+            self.pop(key)
+            return default
+        self.d.move_to_end(key)
+        return entry.value
+
+    def set(self, key: str, value: Any, size: int, expires: float) -> None:
+        """Set item, evicting the least recently used items if needed."""
+        self.pop(key)
+        if size > self._max_size / 4:
+            # do not let a single (huge) item flush the whole cache
+            return
+        self.d[key] = MemoryCacheEntry(value, size, expires)
+        self._size += size
+        while self._size > self._max_size:
+            _, evicted = self.d.popitem(last=False)
+            self._size -= evicted.size
+
+    def pop(self, key: str, default: Any = None) -> Any:
+        """Pop item from collection."""
+        if (entry := self.d.pop(key, None)) is None:
+            return default
+        self._size -= entry.size
+        return entry.value
+
+    def expire(self) -> int:
+        """Remove all expired items, return the number of removed items."""
+        cur_time = time.time()
+        expired = [key for key, entry in self.d.items() if entry.expires < cur_time]
+        for key in expired:
+            self.pop(key)
+        return len(expired)
+
+    def __contains__(self, key: str) -> bool:
+        """Return if key is in the cache (regardless of expiration)."""
+        return key in self.d
 
     def __len__(self) -> int:
         """Return length."""
@@ -405,3 +672,4 @@ class MemoryCache(MutableMapping):
     def clear(self) -> None:
         """Clear cache."""
         self.d.clear()
+        self._size = 0
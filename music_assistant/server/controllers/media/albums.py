@@ -48,16 +48,6 @@ class AlbumsController(MediaControllerBase[Album]):
         self.base_query = """
         SELECT
             albums.*,
-            (SELECT JSON_GROUP_ARRAY(
-                json_object(
-                'item_id', provider_mappings.provider_item_id,
-                    'provider_domain', provider_mappings.provider_domain,
-                        'provider_instance', provider_mappings.provider_instance,
-                        'available', provider_mappings.available,
-                        'audio_format', json(provider_mappings.audio_format),
-                        'url', provider_mappings.url,
-                        'details', provider_mappings.details
-                )) FROM provider_mappings WHERE provider_mappings.item_id = albums.item_id AND media_type = 'album') AS provider_mappings,
             (SELECT JSON_GROUP_ARRAY(
                 json_object(
                 'item_id', artists.item_id,
@@ -112,13 +102,13 @@ class AlbumsController(MediaControllerBase[Album]):
         provider: str | None = None,
         extra_query: str | None = None,
         extra_query_params: dict[str, Any] | None = None,
+        cursor: str | None = None,
         album_types: list[AlbumType] | None = None,
     ) -> list[Artist]:
         """Get in-database albums."""
         extra_query_params: dict[str, Any] = extra_query_params or {}
         extra_query_parts: list[str] = [extra_query] if extra_query else []
         extra_join_parts: list[str] = []
-        artist_table_joined = False
         # optional album type filter
         if album_types:
             extra_query_parts.append("albums.album_type IN :album_types")
@@ -129,55 +119,18 @@ class AlbumsController(MediaControllerBase[Album]):
                 "JOIN album_artists ON album_artists.album_id = albums.item_id "
                 "JOIN artists ON artists.item_id = album_artists.artist_id "
             )
-            artist_table_joined = True
-        if search and " - " in search:
-            # handle combined artist + title search
-            artist_str, title_str = search.split(" - ", 1)
-            search = None
-            extra_query_parts.append("albums.name LIKE :search_title")
-            extra_query_params["search_title"] = f"%{title_str}%"
-            # use join with artists table to filter on artist name
-            extra_join_parts.append(
-                "JOIN album_artists ON album_artists.album_id = albums.item_id "
-                "JOIN artists ON artists.item_id = album_artists.artist_id "
-                "AND artists.name LIKE :search_artist"
-                if not artist_table_joined
-                else "AND artists.name LIKE :search_artist"
-            )
-            artist_table_joined = True
-            extra_query_params["search_artist"] = f"%{artist_str}%"
-        result = await self._get_library_items_by_query(
+        return await self._get_library_items_by_query(
             favorite=favorite,
             search=search,
             limit=limit,
             offset=offset,
+            cursor=cursor,
             order_by=order_by,
             provider=provider,
             extra_query_parts=extra_query_parts,
             extra_query_params=extra_query_params,
             extra_join_parts=extra_join_parts,
         )
-        if search and len(result) < 25 and not offset:
-            # append artist items to result
-            extra_join_parts.append(
-                "JOIN album_artists ON album_artists.album_id = albums.item_id "
-                "JOIN artists ON artists.item_id = album_artists.artist_id "
-                "AND artists.name LIKE :search_artist"
-                if not artist_table_joined
-                else "AND artists.name LIKE :search_artist"
-            )
-            extra_query_params["search_artist"] = f"%{search}%"
-            return result + await self._get_library_items_by_query(
-                favorite=favorite,
-                search=None,
-                limit=limit,
-                order_by=order_by,
-                provider=provider,
-                extra_query_parts=extra_query_parts,
-                extra_query_params=extra_query_params,
-                extra_join_parts=extra_join_parts,
-            )
-        return result
 
     async def library_count(
         self, favorite_only: bool = False, album_types: list[AlbumType] | None = None
@@ -289,33 +242,28 @@ class AlbumsController(MediaControllerBase[Album]):
             extra_query_parts=[f"WHERE album_tracks.album_id = {item_id}"],
         )
 
-    async def _add_library_item(self, item: Album) -> int:
-        """Add a new record to the database."""
+    def _get_library_item_db_row(self, item: Album) -> dict[str, Any]:
+        """Return the (validated) database row for a new library item."""
         if not isinstance(item, Album):
             msg = "Not a valid Album object (ItemMapping can not be added to db)"
             raise InvalidDataError(msg)
         if not item.artists:
             msg = "Album is missing artist(s)"
             raise InvalidDataError(msg)
-        db_id = await self.mass.music.database.insert(
-            self.db_table,
-            {
-                "name": item.name,
-                "sort_name": item.sort_name,
-                "version": item.version,
-                "favorite": item.favorite,
-                "album_type": item.album_type,
-                "year": item.year,
-                "metadata": serialize_to_json(item.metadata),
-                "external_ids": serialize_to_json(item.external_ids),
-            },
-        )
-        # update/set provider_mappings table
-        await self._set_provider_mappings(db_id, item.provider_mappings)
-        # set track artist(s)
+        return {
+            "name": item.name,
+            "sort_name": item.sort_name,
+            "version": item.version,
+            "favorite": item.favorite,
+            "album_type": item.album_type,
+            "year": item.year,
+            "metadata": serialize_to_json(item.metadata),
+            "external_ids": serialize_to_json(item.external_ids),
+        }
+
+    async def _set_library_item_relations(self, db_id: int, item: Album) -> None:
+        """Store the artists of a new library item."""
         await self._set_album_artists(db_id, item.artists)
-        self.logger.debug("added %s to database (id: %s)", item.name, db_id)
-        return db_id
 
     async def _update_library_item(
         self, item_id: str | int, update: Album, overwrite: bool = False
@@ -79,6 +79,7 @@ class ArtistsController(MediaControllerBase[Artist]):
         provider: str | None = None,
         extra_query: str | None = None,
         extra_query_params: dict[str, Any] | None = None,
+        cursor: str | None = None,
         album_artists_only: bool = False,
     ) -> list[Artist]:
         """Get in-database (album) artists."""
@@ -94,6 +95,7 @@ class ArtistsController(MediaControllerBase[Artist]):
             search=search,
             limit=limit,
             offset=offset,
+            cursor=cursor,
             order_by=order_by,
             provider=provider,
             extra_query_parts=extra_query_parts,
@@ -340,26 +342,31 @@ class ArtistsController(MediaControllerBase[Artist]):
         """Add a new item record to the database."""
         if isinstance(item, ItemMapping):
             item = self._artist_from_item_mapping(item)
+        return await super()._add_library_item(item)
+
+    async def add_items_to_library(
+        self, items: list[Artist | ItemMapping], overwrite_existing: bool = False
+    ) -> list[Artist]:
+        """Add multiple items to the library and return the new (or updated) database items."""
+        return await super().add_items_to_library(
+            [self._artist_from_item_mapping(x) if isinstance(x, ItemMapping) else x for x in items],
+            overwrite_existing=overwrite_existing,
+        )
+
+    def _get_library_item_db_row(self, item: Artist) -> dict[str, Any]:
+        """Return the database row for a new library item."""
         # enforce various artists name + id
         if compare_strings(item.name, VARIOUS_ARTISTS_NAME):
             item.mbid = VARIOUS_ARTISTS_MBID
         if item.mbid == VARIOUS_ARTISTS_MBID:
             item.name = VARIOUS_ARTISTS_NAME
-        # no existing item matched: insert item
-        db_id = await self.mass.music.database.insert(
-            self.db_table,
-            {
-                "name": item.name,
-                "sort_name": item.sort_name,
-                "favorite": item.favorite,
-                "external_ids": serialize_to_json(item.external_ids),
-                "metadata": serialize_to_json(item.metadata),
-            },
-        )
-        # update/set provider_mappings table
-        await self._set_provider_mappings(db_id, item.provider_mappings)
-        self.logger.debug("added %s to database (id: %s)", item.name, db_id)
-        return db_id
+        return {
+            "name": item.name,
+            "sort_name": item.sort_name,
+            "favorite": item.favorite,
+            "external_ids": serialize_to_json(item.external_ids),
+            "metadata": serialize_to_json(item.metadata),
+        }
 
     async def _update_library_item(
         self, item_id: str | int, update: Artist | ItemMapping, overwrite: bool = False
@@ -3,13 +3,16 @@
 from __future__ import annotations
 
 import asyncio
+import base64
 import logging
+import re
 from abc import ABCMeta, abstractmethod
 from collections.abc import Iterable
 from contextlib import suppress
+from functools import wraps
 from typing import TYPE_CHECKING, Any, Generic, TypeVar
 
-from music_assistant.common.helpers.json import json_loads, serialize_to_json
+from music_assistant.common.helpers.json import json_dumps, json_loads, serialize_to_json
 from music_assistant.common.models.enums import (
     CacheCategory,
     EventType,
@@ -17,11 +20,17 @@ from music_assistant.common.models.enums import (
     MediaType,
     ProviderFeature,
 )
-from music_assistant.common.models.errors import MediaNotFoundError, ProviderUnavailableError
+from music_assistant.common.models.errors import (
+    InvalidDataError,
+    MediaNotFoundError,
+    MusicAssistantError,
+    ProviderUnavailableError,
+)
 from music_assistant.common.models.media_items import (
     Album,
     ItemMapping,
     MediaItemType,
+    PagedItems,
     ProviderMapping,
     SearchResults,
     Track,
@@ -30,7 +39,7 @@ from music_assistant.constants import DB_TABLE_PLAYLOG, DB_TABLE_PROVIDER_MAPPIN
 from music_assistant.server.helpers.compare import compare_media_item
 
 if TYPE_CHECKING:
-    from collections.abc import AsyncGenerator, Mapping
+    from collections.abc import AsyncGenerator, Callable, Mapping
 
     from music_assistant.server import MusicAssistant
 
@@ -61,6 +70,57 @@ SORT_KEYS = {
     "random_play_count": "RANDOM(), play_count ASC",
 }
 
+# sort keys that support keyset (cursor) pagination: (column, collation, descending)
+# all other sort keys (except random) fall back to offset based cursors
+KEYSET_SORT_KEYS: dict[str, tuple[str, str, bool]] = {
+    "name": ("name", "COLLATE NOCASE", False),
+    "name_desc": ("name", "COLLATE NOCASE", True),
+    "sort_name": ("sort_name", "COLLATE NOCASE", False),
+    "sort_name_desc": ("sort_name", "COLLATE NOCASE", True),
+    "timestamp_added": ("timestamp_added", "", False),
+    "timestamp_added_desc": ("timestamp_added", "", True),
+    "last_played": ("last_played", "", False),
+    "last_played_desc": ("last_played", "", True),
+    "play_count": ("play_count", "", False),
+    "play_count_desc": ("play_count", "", True),
+}
+
+# sort key to order (full text) search results by relevance
+SEARCH_RELEVANCE_SORT_KEY = "relevance"
+
+# number of items that are fetched at once from the database for (large) API listings
+LIBRARY_ITEMS_DB_PAGE_SIZE = 500
+
+
+def create_search_match_query(search: str) -> str | None:
+    """
+    Create a (safe) full text search MATCH expression from the given (user) search string.
+
+    Every word is a prefix match on one of the indexed columns, all words must match.
+    """
+    if not (words := re.findall(r"\w+", search)):
+        return None
+    return " ".join(f'"{word}"*' for word in words)
+
+
+def encode_cursor(*values: Any) -> str:
+    """Encode the given values into an opaque (url safe) pagination cursor."""
+    return base64.urlsafe_b64encode(json_dumps(values).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> list[Any]:
+    """Decode the values from an opaque pagination cursor."""
+    try:
+        return json_loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except ValueError as err:
+        raise InvalidDataError(f"Invalid cursor: {cursor}") from err
+
+
+class LibraryItems(list[ItemCls]):
+    """List of library items, with the (opaque) cursor to retrieve the next page."""
+
+    next_cursor: str | None = None
+
 
 class MediaControllerBase(Generic[ItemCls], metaclass=ABCMeta):
     """Base model for controller managing a MediaType."""
@@ -72,26 +132,19 @@ class MediaControllerBase(Generic[ItemCls], metaclass=ABCMeta):
     def __init__(self, mass: MusicAssistant) -> None:
         """Initialize class."""
         self.mass = mass
-        self.base_query = f"""
-        SELECT
-            {self.db_table}.*,
-            (SELECT JSON_GROUP_ARRAY(
-                json_object(
-                'item_id', provider_mappings.provider_item_id,
-                    'provider_domain', provider_mappings.provider_domain,
-                        'provider_instance', provider_mappings.provider_instance,
-                        'available', provider_mappings.available,
-                        'audio_format', json(provider_mappings.audio_format),
-                        'url', provider_mappings.url,
-                        'details', provider_mappings.details
-                )) FROM provider_mappings WHERE provider_mappings.item_id = {self.db_table}.item_id
-                    AND provider_mappings.media_type = '{self.media_type.value}') AS provider_mappings
-            FROM {self.db_table} """  # noqa: E501
+        # NOTE: the provider_mappings column is maintained by triggers on the
+        # provider_mappings table, see MusicController.__create_database_triggers
+        self.base_query = f"SELECT {self.db_table}.* FROM {self.db_table} "
         self.logger = logging.getLogger(f"{MASS_LOGGER_NAME}.music.{self.media_type.value}")
         # register (base) api handlers
         self.api_base = api_base = f"{self.media_type}s"
         self.mass.register_api_command(f"music/{api_base}/count", self.library_count)
-        self.mass.register_api_command(f"music/{api_base}/library_items", self.library_items)
+        self.mass.register_api_command(
+            f"music/{api_base}/library_items", self._get_library_items_api_handler()
+        )
+        self.mass.register_api_command(
+            f"music/{api_base}/library_items_page", self.library_items_page
+        )
         self.mass.register_api_command(f"music/{api_base}/get", self.get)
         self.mass.register_api_command(f"music/{api_base}/get_{self.media_type}", self.get)
         self.mass.register_api_command(f"music/{api_base}/add", self.add_item_to_library)
@@ -106,17 +159,21 @@ class MediaControllerBase(Generic[ItemCls], metaclass=ABCMeta):
     ) -> ItemCls:
         """Add item to library and return the new (or updated) database item."""
         new_item = False
-        # check for existing item first
-        if library_id := await self._get_library_item_by_match(item):
-            # update existing item
-            await self._update_library_item(library_id, item, overwrite=overwrite_existing)
-        else:
-            # actually add a new item in the library db
-            async with self._db_add_lock:
-                library_id = await self._add_library_item(item)
-                new_item = True
-        # return final library_item
-        library_item = await self.get_library_item(library_id)
+        # all writes (item, mappings and relations) are committed together
+        async with self.mass.music.database.batch():
+            # check for existing item first
+            if library_id := await self._get_library_item_by_match(item):
+                # update existing item
+                await self._update_library_item(library_id, item, overwrite=overwrite_existing)
+            else:
+                # actually add a new item in the library db
+                async with self._db_add_lock:
+                    library_id = await self._add_library_item(item)
+                    new_item = True
+                # the relations may need to add other items, which is done outside the lock
+                await self._set_library_item_relations(library_id, item)
+            # return final library_item
+            library_item = await self.get_library_item(library_id)
         self.mass.signal_event(
             EventType.MEDIA_ITEM_ADDED if new_item else EventType.MEDIA_ITEM_UPDATED,
             library_item.uri,
@@ -124,6 +181,135 @@ class MediaControllerBase(Generic[ItemCls], metaclass=ABCMeta):
         )
         return library_item
 
+    async def add_items_to_library(
+        self,
+        items: list[ItemCls],
+        overwrite_existing: bool = False,
+    ) -> list[ItemCls]:
+        """
+        Add multiple items to the library and return the new (or updated) database items.
+
+        Bulk version of `add_item_to_library` (e.g. for a provider sync): existing items are
+        matched with a few set based queries and all new items are inserted at once.
+        A single (aggregated) MEDIA_ITEMS_UPDATED event is sent for the whole batch.
+        Items that can not be added (e.g. missing artists) are skipped.
+        """
+        new_items: list[ItemCls] = []
+        new_items_by_name: dict[str, list[ItemCls]] = {}
+        # map of library id --> (provider) item(s) to merge into the library item
+        updates: dict[int, list[ItemCls]] = {}
+        async with self.mass.music.database.batch():
+            library_ids = await self._get_library_item_ids_by_match(items)
+            for item, library_id in zip(items, library_ids, strict=True):
+                if library_id is not None:
+                    updates.setdefault(library_id, []).append(item)
+                    continue
+                # prevent duplicates within the batch itself
+                same_name = new_items_by_name.setdefault(item.sort_name, [])
+                if dupe := next((x for x in same_name if compare_media_item(x, item, True)), None):
+                    dupe.provider_mappings.update(item.provider_mappings)
+                    continue
+                new_items.append(item)
+                same_name.append(item)
+            async with self._db_add_lock:
+                added = await self._add_library_items(new_items)
+            # the relations may need to add other items, which is done outside the lock
+            added_ids: list[int] = []
+            for db_id, item in added:
+                try:
+                    await self._set_library_item_relations(db_id, item)
+                except MusicAssistantError as err:
+                    self.logger.warning("Skipping %s: %s", item.uri, str(err))
+                    # do not leave behind an item without its relations
+                    with suppress(MusicAssistantError, AssertionError):
+                        await self.remove_item_from_library(db_id)
+                    continue
+                added_ids.append(db_id)
+            for library_id, update_items in updates.items():
+                for item in update_items:
+                    await self._update_library_item(library_id, item, overwrite=overwrite_existing)
+            # return final library_items
+            library_items = await self._get_library_items_by_ids([*added_ids, *updates])
+        self.mass.signal_event(
+            EventType.MEDIA_ITEMS_UPDATED,
+            self.media_type.value,
+            {
+                "added": [library_items[x].uri for x in added_ids if x in library_items],
+                "updated": [library_items[x].uri for x in updates if x in library_items],
+            },
+        )
+        return list(library_items.values())
+
+    async def _get_library_item_ids_by_match(self, items: list[ItemCls]) -> list[int | None]:
+        """Bulk version of `_get_library_item_by_match` using set based queries."""
+        result: list[int | None] = [
+            int(item.item_id) if item.provider == "library" else None for item in items
+        ]
+        # match by provider mappings
+        for idx, library_item in enumerate(await self.get_library_items_by_prov_mappings(items)):
+            if library_item and result[idx] is None:
+                result[idx] = int(library_item.item_id)
+        # match by external ids
+        if external_ids := {
+            ext_id[1]
+            for item, library_id in zip(items, result, strict=True)
+            if library_id is None
+            for ext_id in getattr(item, "external_ids", ())
+        }:
+            query = (
+                f"SELECT {self.db_table}.item_id, json_extract(ext.value, '$[0]') AS ext_type, "
+                f"json_extract(ext.value, '$[1]') AS ext_id "
+                f"FROM {self.db_table}, json_each({self.db_table}.external_ids) AS ext "
+                "WHERE json_extract(ext.value, '$[1]') IN :external_ids"
+            )
+            matches: dict[tuple[str, str], set[int]] = {}
+            for row in await self.mass.music.database.get_rows_from_query(
+                query, {"external_ids": list(external_ids)}, limit=0
+            ):
+                matches.setdefault((row["ext_type"], row["ext_id"]), set()).add(row["item_id"])
+            candidates = await self._get_library_items_by_ids(
+                list({x for ids in matches.values() for x in ids})
+            )
+            for idx, item in enumerate(items):
+                if result[idx] is not None:
+                    continue
+                for ext_id in getattr(item, "external_ids", ()):
+                    # Double check external IDs - if MBID exists, regards that as overriding
+                    for db_id in matches.get(ext_id, ()):
+                        if db_id in candidates and compare_media_item(item, candidates[db_id]):
+                            result[idx] = db_id
+                            break
+                    if result[idx] is not None:
+                        break
+        # search by (exact) name match
+        unmatched = [item for item, x in zip(items, result, strict=True) if x is None]
+        if unmatched:
+            names = list({item.name for item in unmatched})
+            sort_names = list({item.sort_name for item in unmatched})
+            candidates_by_name: dict[str, list[ItemCls]] = {}
+            for db_item in await self._get_library_items_by_query(
+                limit=0,
+                extra_query_parts=[
+                    f"({self.db_table}.name IN :match_names "
+                    f"OR {self.db_table}.sort_name IN :match_sort_names)"
+                ],
+                extra_query_params={"match_names": names, "match_sort_names": sort_names},
+            ):
+                candidates_by_name.setdefault(db_item.name, []).append(db_item)
+                if db_item.sort_name != db_item.name:
+                    candidates_by_name.setdefault(db_item.sort_name, []).append(db_item)
+            for idx, item in enumerate(items):
+                if result[idx] is not None:
+                    continue
+                for db_item in [
+                    *candidates_by_name.get(item.name, []),
+                    *candidates_by_name.get(item.sort_name, []),
+                ]:
+                    if compare_media_item(db_item, item, True):
+                        result[idx] = int(db_item.item_id)
+                        break
+        return result
+
     async def _get_library_item_by_match(self, item: Track | ItemMapping) -> int | None:
         if item.provider == "library":
             return int(item.item_id)
@@ -217,6 +403,7 @@ class MediaControllerBase(Generic[ItemCls], metaclass=ABCMeta):
         provider: str | None = None,
         extra_query: str | None = None,
         extra_query_params: dict[str, Any] | None = None,
+        cursor: str | None = None,
     ) -> list[ItemCls]:
         """Get in-database items."""
         return await self._get_library_items_by_query(
@@ -228,8 +415,73 @@ class MediaControllerBase(Generic[ItemCls], metaclass=ABCMeta):
             provider=provider,
             extra_query_parts=[extra_query] if extra_query else None,
             extra_query_params=extra_query_params,
+            cursor=cursor,
         )
 
+    async def library_items_page(
+        self,
+        favorite: bool | None = None,
+        search: str | None = None,
+        limit: int = 500,
+        order_by: str = "sort_name",
+        provider: str | None = None,
+        cursor: str | None = None,
+    ) -> PagedItems:
+        """
+        Get a page of in-database items, using cursor based pagination.
+
+        Pass the returned next_cursor to retrieve the next page (None if this is the last page).
+        """
+        items = await self.library_items(
+            favorite=favorite,
+            search=search,
+            limit=limit,
+            order_by=order_by,
+            provider=provider,
+            cursor=cursor,
+        )
+        next_cursor = items.next_cursor if isinstance(items, LibraryItems) else None
+        return PagedItems(items=items, next_cursor=next_cursor)
+
+    def _get_library_items_api_handler(self) -> Callable[..., AsyncGenerator[ItemCls, None]]:
+        """Return the API handler for library_items, which yields the items page by page.
+
+        The handler has the same signature as (the overridden) library_items, so the API
+        arguments are unchanged while (large) results are sent in partial results.
+        """
+
+        @wraps(self.library_items)
+        async def handler(**kwargs: Any) -> AsyncGenerator[ItemCls, None]:
+            async for item in self._iter_library_items_pages(**kwargs):
+                yield item
+
+        return handler
+
+    async def _iter_library_items_pages(
+        self, limit: int = 500, cursor: str | None = None, **kwargs: Any
+    ) -> AsyncGenerator[ItemCls, None]:
+        """Yield the requested in-database items, fetched from the database in pages."""
+        order_by: str | None = kwargs.get("order_by")
+        # a limit of 0 means no limit
+        remaining = limit or None
+        while True:
+            if order_by and order_by.startswith("random"):
+                # random order can not be paginated
+                page_size = limit
+            elif remaining is None:
+                page_size = LIBRARY_ITEMS_DB_PAGE_SIZE
+            else:
+                page_size = min(remaining, LIBRARY_ITEMS_DB_PAGE_SIZE)
+            items = await self.library_items(limit=page_size, cursor=cursor, **kwargs)
+            for item in items:
+                yield item
+            if remaining is not None and (remaining := remaining - len(items)) <= 0:
+                break
+            if not page_size or len(items) < page_size:
+                break
+            if (cursor := getattr(items, "next_cursor", None)) is None:
+                break
+
     async def iter_library_items(
         self,
         favorite: bool | None = None,
@@ -241,23 +493,24 @@ class MediaControllerBase(Generic[ItemCls], metaclass=ABCMeta):
     ) -> AsyncGenerator[ItemCls, None]:
         """Iterate all in-database items."""
         limit: int = 500
-        offset: int = 0
+        cursor: str | None = None
         while True:
             next_items = await self.library_items(
                 favorite=favorite,
                 search=search,
                 limit=limit,
-                offset=offset,
                 order_by=order_by,
                 provider=provider,
                 extra_query=extra_query,
                 extra_query_params=extra_query_params,
+                cursor=cursor,
             )
             for item in next_items:
                 yield item
-            if len(next_items) < limit:
+            if len(next_items) < limit or not isinstance(next_items, LibraryItems):
+                break
+            if (cursor := next_items.next_cursor) is None:
                 break
-            offset += limit
 
     async def get(
         self,
@@ -290,7 +543,9 @@ class MediaControllerBase(Generic[ItemCls], metaclass=ABCMeta):
         # create safe search string
         search_query = search_query.replace("/", " ").replace("'", "")
         if provider_instance_id_or_domain == "library":
-            return await self.library_items(search=search_query, limit=limit)
+            return await self.library_items(
+                search=search_query, limit=limit, order_by=SEARCH_RELEVANCE_SORT_KEY
+            )
         prov = self.mass.get_provider(provider_instance_id_or_domain)
         if prov is None:
             return []
@@ -367,8 +622,11 @@ class MediaControllerBase(Generic[ItemCls], metaclass=ABCMeta):
     async def get_library_item(self, item_id: int | str) -> ItemCls:
         """Get single library item by id."""
         db_id = int(item_id)  # ensure integer
-        extra_query = f"WHERE {self.db_table}.item_id = {item_id}"
-        async for db_item in self.iter_library_items(extra_query=extra_query):
+        # use a query parameter so the (prepared) statement can be reused
+        extra_query = f"WHERE {self.db_table}.item_id = :item_id"
+        async for db_item in self.iter_library_items(
+            extra_query=extra_query, extra_query_params={"item_id": db_id}
+        ):
             return db_item
         msg = f"{self.media_type.value} not found in library: {db_id}"
         raise MediaNotFoundError(msg)
@@ -411,6 +669,78 @@ class MediaControllerBase(Generic[ItemCls], metaclass=ABCMeta):
                 return item
         return None
 
+    async def get_library_items_by_prov_mappings(
+        self,
+        items: list[ItemCls | ItemMapping],
+    ) -> list[ItemCls | None]:
+        """
+        Get the library items for the provider mappings of the given (provider) items.
+
+        Bulk version of `get_library_item_by_prov_mappings` using a single query,
+        returns a list with the (optional) library item for each of the given items.
+        """
+        prov_item_ids = {
+            mapping.item_id for item in items for mapping in getattr(item, "provider_mappings", ())
+        }
+        prov_item_ids.update(item.item_id for item in items if isinstance(item, ItemMapping))
+        if not prov_item_ids:
+            return [None] * len(items)
+        query = (
+            "SELECT item_id, provider_domain, provider_instance, provider_item_id "
+            "FROM provider_mappings WHERE media_type = :media_type "
+            "AND provider_item_id IN :prov_item_ids"
+        )
+        by_instance: dict[tuple[str, str], int] = {}
+        by_domain: dict[tuple[str, str], int] = {}
+        for row in await self.mass.music.database.get_rows_from_query(
+            query,
+            {"media_type": self.media_type.value, "prov_item_ids": list(prov_item_ids)},
+            limit=0,
+        ):
+            db_id = row["item_id"]
+            by_instance.setdefault((row["provider_instance"], row["provider_item_id"]), db_id)
+            by_domain.setdefault((row["provider_domain"], row["provider_item_id"]), db_id)
+        library_ids: list[int | None] = []
+        for item in items:
+            if isinstance(item, ItemMapping):
+                key = (item.provider, item.item_id)
+                library_ids.append(by_instance.get(key) or by_domain.get(key))
+                continue
+            # always prefer provider instance first
+            library_ids.append(
+                next(
+                    (
+                        by_instance[key]
+                        for x in item.provider_mappings
+                        if (key := (x.provider_instance, x.item_id)) in by_instance
+                    ),
+                    None,
+                )
+                or next(
+                    (
+                        by_domain[key]
+                        for x in item.provider_mappings
+                        if (key := (x.provider_domain, x.item_id)) in by_domain
+                    ),
+                    None,
+                )
+            )
+        library_items = await self._get_library_items_by_ids([x for x in library_ids if x])
+        return [library_items.get(x) if x else None for x in library_ids]
+
+    async def _get_library_items_by_ids(self, item_ids: list[int]) -> dict[int, ItemCls]:
+        """Get multiple library items by their (database) id."""
+        if not item_ids:
+            return {}
+        return {
+            int(item.item_id): item
+            for item in await self._get_library_items_by_query(
+                limit=0,
+                extra_query_parts=[f"{self.db_table}.item_id IN :item_ids"],
+                extra_query_params={"item_ids": list(set(item_ids))},
+            )
+        }
+
     async def get_library_item_by_external_id(
         self, external_id: str, external_id_type: ExternalID | None = None
     ) -> ItemCls | None:
@@ -443,6 +773,7 @@ class MediaControllerBase(Generic[ItemCls], metaclass=ABCMeta):
         provider_item_id: str | None = None,
         limit: int = 500,
         offset: int = 0,
+        cursor: str | None = None,
     ) -> list[ItemCls]:
         """Fetch all records from library for given provider."""
         assert provider_instance_id_or_domain != "library"
@@ -468,7 +799,11 @@ class MediaControllerBase(Generic[ItemCls], metaclass=ABCMeta):
         subquery = f"SELECT item_id FROM provider_mappings WHERE {' AND '.join(subquery_parts)}"
         query = f"WHERE {self.db_table}.item_id IN ({subquery})"
         return await self._get_library_items_by_query(
-            limit=limit, offset=offset, extra_query_parts=[query], extra_query_params=query_params
+            limit=limit,
+            offset=offset,
+            extra_query_parts=[query],
+            extra_query_params=query_params,
+            cursor=cursor,
         )
 
     async def iter_library_items_by_prov_id(
@@ -478,19 +813,20 @@ class MediaControllerBase(Generic[ItemCls], metaclass=ABCMeta):
     ) -> AsyncGenerator[ItemCls, None]:
         """Iterate all records from database for given provider."""
         limit: int = 500
-        offset: int = 0
+        cursor: str | None = None
         while True:
             next_items = await self.get_library_items_by_prov_id(
                 provider_instance_id_or_domain=provider_instance_id_or_domain,
                 provider_item_id=provider_item_id,
                 limit=limit,
-                offset=offset,
+                cursor=cursor,
             )
             for item in next_items:
                 yield item
-            if len(next_items) < limit:
+            if len(next_items) < limit or not isinstance(next_items, LibraryItems):
+                break
+            if (cursor := next_items.next_cursor) is None:
                 break
-            offset += limit
 
     async def set_favorite(self, item_id: str | int, favorite: bool) -> None:
         """Set the favorite bool on a database item."""
@@ -665,13 +1001,64 @@ class MediaControllerBase(Generic[ItemCls], metaclass=ABCMeta):
         # Fallback to the default implementation
         return await self._get_dynamic_tracks(ref_item)
 
+    async def _add_library_item(self, item: ItemCls) -> int:
+        """Add a new item record to the database and return the database id."""
+        db_id = await self.mass.music.database.insert(
+            self.db_table, self._get_library_item_db_row(item)
+        )
+        # update/set provider_mappings table
+        await self._set_provider_mappings(db_id, item.provider_mappings)
+        self.logger.debug("added %s to database (id: %s)", item.name, db_id)
+        return db_id
+
+    async def _add_library_items(self, items: list[ItemCls]) -> list[tuple[int, ItemCls]]:
+        """
+        Add multiple new item records to the database.
+
+        Returns the database id and item of all added items,
+        the relations (see `_set_library_item_relations`) are not set.
+        """
+        rows: list[dict[str, Any]] = []
+        valid_items: list[ItemCls] = []
+        for item in items:
+            try:
+                rows.append(self._get_library_item_db_row(item))
+            except InvalidDataError as err:
+                self.logger.warning("Skipping %s: %s", item.uri, str(err))
+                continue
+            valid_items.append(item)
+        if not rows:
+            return []
+        # allocate the item ids upfront so all rows can be inserted in a single statement,
+        # this is safe because all (library) inserts are guarded by the add lock
+        query = (
+            f"SELECT MAX(IFNULL((SELECT MAX(item_id) FROM {self.db_table}), 0), "
+            f"IFNULL((SELECT seq FROM sqlite_sequence WHERE name = '{self.db_table}'), 0))"
+        )
+        max_id = (await self.mass.music.database.get_rows_from_query(query, limit=0))[0][0]
+        db_ids = list(range(max_id + 1, max_id + 1 + len(rows)))
+        for db_id, row in zip(db_ids, rows, strict=True):
+            row["item_id"] = db_id
+        await self.mass.music.database.insert_many(self.db_table, rows)
+        # write all provider mappings in a single statement
+        await self.mass.music.database.insert_many(
+            DB_TABLE_PROVIDER_MAPPINGS,
+            [
+                mapping_row
+                for db_id, item in zip(db_ids, valid_items, strict=True)
+                for mapping_row in self._get_provider_mapping_rows(db_id, item.provider_mappings)
+            ],
+            allow_replace=True,
+        )
+        self.logger.debug("added %s items to database", len(db_ids))
+        return list(zip(db_ids, valid_items, strict=True))
+
     @abstractmethod
-    async def _add_library_item(
-        self,
-        item: ItemCls,
-        overwrite_existing: bool = False,
-    ) -> int:
-        """Add artist to library and return the database id."""
+    def _get_library_item_db_row(self, item: ItemCls) -> dict[str, Any]:
+        """Return the (validated) database row for a new library item."""
+
+    async def _set_library_item_relations(self, db_id: int, item: ItemCls) -> None:
+        """Store the relations (e.g. artists) of a new library item."""
 
     @abstractmethod
     async def _update_library_item(
@@ -698,7 +1085,7 @@ class MediaControllerBase(Generic[ItemCls], metaclass=ABCMeta):
     async def _get_dynamic_tracks(self, media_item: ItemCls, limit: int = 25) -> list[Track]:
         """Get dynamic list of tracks for given item, fallback/default implementation."""
 
-    async def _get_library_items_by_query(
+    async def _get_library_items_by_query(  # noqa: PLR0915
         self,
         favorite: bool | None = None,
         search: str | None = None,
@@ -709,12 +1096,44 @@ class MediaControllerBase(Generic[ItemCls], metaclass=ABCMeta):
         extra_query_parts: list[str] | None = None,
         extra_query_params: dict[str, Any] | None = None,
         extra_join_parts: list[str] | None = None,
-    ) -> list[ItemCls]:
-        """Fetch MediaItem records from database by building the query."""
+        cursor: str | None = None,
+    ) -> LibraryItems[ItemCls]:
+        """
+        Fetch MediaItem records from database by building the query.
+
+        If a cursor is given (see `_get_next_cursor`), the offset is ignored and the
+        page after the cursor is returned. For sort keys that support it, this uses
+        keyset pagination so that deep pages are as cheap as the first one.
+        The cursor of the next page is set on the result if the page is full.
+        """
         sql_query = self.base_query
         query_params = extra_query_params or {}
         query_parts: list[str] = extra_query_parts or []
         join_parts: list[str] = extra_join_parts or []
+        keyset_key = self._get_keyset_key(order_by)
+        if cursor:
+            cursor_values = decode_cursor(cursor)
+            if cursor_values[0] != (order_by or ""):
+                raise InvalidDataError("Cursor does not match the requested sort order")
+            if keyset_key and len(cursor_values) == 3:
+                # keyset pagination: seek to the row after the last row of the previous page
+                column, collation, desc = keyset_key
+                operator = "<" if desc else ">"
+                item_id_col = f"{self.db_table}.item_id"
+                if column:
+                    sort_col = f"{self.db_table}.{column} {collation}".strip()
+                    query_parts.append(
+                        f"({sort_col} {operator} :cursor_value OR ({sort_col} = :cursor_value "
+                        f"AND {item_id_col} {operator} :cursor_item_id))"
+                    )
+                    query_params["cursor_value"] = cursor_values[1]
+                else:
+                    query_parts.append(f"{item_id_col} {operator} :cursor_item_id")
+                query_params["cursor_item_id"] = cursor_values[2]
+                offset = 0
+            else:
+                # offset based cursor
+                offset = int(cursor_values[1])
         # create special performant random query
         if order_by and order_by.startswith("random"):
             query_parts.append(
@@ -722,7 +1141,16 @@ class MediaControllerBase(Generic[ItemCls], metaclass=ABCMeta):
                 f"(SELECT item_id FROM {self.db_table} ORDER BY RANDOM() LIMIT {limit})"
             )
         # handle search
-        if search:
+        search_match = create_search_match_query(search) if search else None
+        if search_match:
+            # use the full text search index (see MusicController.__create_database_triggers)
+            join_parts.append(
+                f"JOIN (SELECT rowid AS search_id, rank AS search_rank "
+                f"FROM {self.db_table}_fts WHERE {self.db_table}_fts MATCH :search) AS search "
+                f"ON search.search_id = {self.db_table}.item_id"
+            )
+            query_params["search"] = search_match
+        elif search:
             query_params["search"] = f"%{search}%"
             query_parts.append(f"{self.db_table}.name LIKE :search")
         # handle favorite filter
@@ -746,16 +1174,57 @@ class MediaControllerBase(Generic[ItemCls], metaclass=ABCMeta):
             sql_query += " WHERE " + " AND ".join(query_parts)
         # build final query
         sql_query += f" GROUP BY {self.db_table}.item_id"
-        if order_by:
+        if keyset_key:
+            # order by the sort column with the item_id as (unique) tie breaker
+            column, collation, desc = keyset_key
+            direction = "DESC" if desc else "ASC"
+            order_parts = [f"{self.db_table}.item_id {direction}"]
+            if column:
+                order_parts.insert(0, f"{self.db_table}.{column} {collation} {direction}")
+            sql_query += f" ORDER BY {', '.join(order_parts)}"
+        elif order_by == SEARCH_RELEVANCE_SORT_KEY:
+            sort_key = "search.search_rank ASC, " if search_match else ""
+            sql_query += f" ORDER BY {sort_key}{SORT_KEYS['sort_name']}"
+        elif order_by:
             if sort_key := SORT_KEYS.get(order_by):
                 sql_query += f" ORDER BY {sort_key}"
+        db_rows = await self.mass.music.database.get_rows_from_query(
+            sql_query, query_params, limit=limit, offset=offset
+        )
         # return dbresult parsed to media item model
-        return [
-            self.item_cls.from_dict(self._parse_db_row(db_row))
-            for db_row in await self.mass.music.database.get_rows_from_query(
-                sql_query, query_params, limit=limit, offset=offset
-            )
-        ]
+        result: LibraryItems[ItemCls] = LibraryItems(
+            self.item_cls.from_dict(self._parse_db_row(db_row)) for db_row in db_rows
+        )
+        if limit and len(db_rows) >= limit:
+            result.next_cursor = self._get_next_cursor(db_rows[-1], order_by, limit, offset)
+        return result
+
+    def _get_keyset_key(self, order_by: str | None) -> tuple[str, str, bool] | None:
+        """Return the keyset (column, collation, descending) for the given sort key (if any)."""
+        if not order_by:
+            # no explicit sort order: use the item_id (rowid) order
+            return ("", "", False)
+        return KEYSET_SORT_KEYS.get(order_by)
+
+    def _get_next_cursor(
+        self,
+        last_row: Mapping,
+        order_by: str | None,
+        limit: int,
+        offset: int = 0,
+    ) -> str | None:
+        """Return the (opaque) cursor to retrieve the page after the given (last) db row."""
+        order_by = order_by or ""
+        if order_by.startswith("random"):
+            # random order can not be paginated
+            return None
+        if keyset_key := self._get_keyset_key(order_by):
+            # keyset cursor: (sort value, item_id) of the last row of the page
+            column = keyset_key[0]
+            sort_value = last_row[column] if column else None
+            return encode_cursor(order_by, sort_value, last_row["item_id"])
+        # offset based cursor for sort orders that do not support keyset pagination
+        return encode_cursor(order_by, offset + limit)
 
     async def _set_provider_mappings(
         self,
@@ -765,31 +1234,41 @@ class MediaControllerBase(Generic[ItemCls], metaclass=ABCMeta):
     ) -> None:
         """Update the provider_items table for the media item."""
         db_id = int(item_id)  # ensure integer
-        if overwrite:
-            # on overwrite, clear the provider_mappings table first
-            # this is done for filesystem provider changing the path (and thus item_id)
-            await self.mass.music.database.delete(
+        async with self.mass.music.database.batch():
+            if overwrite:
+                # on overwrite, clear the provider_mappings table first
+                # this is done for filesystem provider changing the path (and thus item_id)
+                await self.mass.music.database.delete(
+                    DB_TABLE_PROVIDER_MAPPINGS,
+                    {"media_type": self.media_type.value, "item_id": db_id},
+                )
+            # write all mappings in a single statement
+            await self.mass.music.database.insert_many(
                 DB_TABLE_PROVIDER_MAPPINGS,
-                {"media_type": self.media_type.value, "item_id": db_id},
-            )
-        for provider_mapping in provider_mappings:
-            if not provider_mapping.provider_instance:
-                continue
-            await self.mass.music.database.insert_or_replace(
-                DB_TABLE_PROVIDER_MAPPINGS,
-                {
-                    "media_type": self.media_type.value,
-                    "item_id": db_id,
-                    "provider_domain": provider_mapping.provider_domain,
-                    "provider_instance": provider_mapping.provider_instance,
-                    "provider_item_id": provider_mapping.item_id,
-                    "available": provider_mapping.available,
-                    "url": provider_mapping.url,
-                    "audio_format": serialize_to_json(provider_mapping.audio_format),
-                    "details": provider_mapping.details,
-                },
+                self._get_provider_mapping_rows(db_id, provider_mappings),
+                allow_replace=True,
             )
 
+    def _get_provider_mapping_rows(
+        self, db_id: int, provider_mappings: Iterable[ProviderMapping]
+    ) -> list[dict[str, Any]]:
+        """Return the provider_mappings table rows for the media item."""
+        return [
+            {
+                "media_type": self.media_type.value,
+                "item_id": db_id,
+                "provider_domain": provider_mapping.provider_domain,
+                "provider_instance": provider_mapping.provider_instance,
+                "provider_item_id": provider_mapping.item_id,
+                "available": provider_mapping.available,
+                "url": provider_mapping.url,
+                "audio_format": serialize_to_json(provider_mapping.audio_format),
+                "details": provider_mapping.details,
+            }
+            for provider_mapping in provider_mappings
+            if provider_mapping.provider_instance
+        ]
+
     @staticmethod
     def _parse_db_row(db_row: Mapping) -> dict[str, Any]:
         """Parse raw db Mapping into a dict."""
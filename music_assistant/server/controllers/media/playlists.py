@@ -279,25 +279,18 @@ class PlaylistController(MediaControllerBase[Playlist]):
         playlist.cache_checksum = str(time.time())
         await self.update_item_in_library(db_playlist_id, playlist)
 
-    async def _add_library_item(self, item: Playlist) -> int:
-        """Add a new record to the database."""
-        db_id = await self.mass.music.database.insert(
-            self.db_table,
-            {
-                "name": item.name,
-                "sort_name": item.sort_name,
-                "owner": item.owner,
-                "is_editable": item.is_editable,
-                "favorite": item.favorite,
-                "metadata": serialize_to_json(item.metadata),
-                "external_ids": serialize_to_json(item.external_ids),
-                "cache_checksum": item.cache_checksum,
-            },
-        )
-        # update/set provider_mappings table
-        await self._set_provider_mappings(db_id, item.provider_mappings)
-        self.logger.debug("added %s to database (id: %s)", item.name, db_id)
-        return db_id
+    def _get_library_item_db_row(self, item: Playlist) -> dict[str, Any]:
+        """Return the database row for a new library item."""
+        return {
+            "name": item.name,
+            "sort_name": item.sort_name,
+            "owner": item.owner,
+            "is_editable": item.is_editable,
+            "favorite": item.favorite,
+            "metadata": serialize_to_json(item.metadata),
+            "external_ids": serialize_to_json(item.external_ids),
+            "cache_checksum": item.cache_checksum,
+        }
 
     async def _update_library_item(
         self, item_id: int, update: Playlist, overwrite: bool = False
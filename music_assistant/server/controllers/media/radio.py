@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import asyncio
+from typing import Any
 
 from music_assistant.common.helpers.json import serialize_to_json
 from music_assistant.common.models.enums import MediaType
@@ -53,22 +54,15 @@ class RadioController(MediaControllerBase[Radio]):
         # return the aggregated result
         return all_versions.values()
 
-    async def _add_library_item(self, item: Radio) -> int:
-        """Add a new item record to the database."""
-        db_id = await self.mass.music.database.insert(
-            self.db_table,
-            {
-                "name": item.name,
-                "sort_name": item.sort_name,
-                "favorite": item.favorite,
-                "metadata": serialize_to_json(item.metadata),
-                "external_ids": serialize_to_json(item.external_ids),
-            },
-        )
-        # update/set provider_mappings table
-        await self._set_provider_mappings(db_id, item.provider_mappings)
-        self.logger.debug("added %s to database (id: %s)", item.name, db_id)
-        return db_id
+    def _get_library_item_db_row(self, item: Radio) -> dict[str, Any]:
+        """Return the database row for a new library item."""
+        return {
+            "name": item.name,
+            "sort_name": item.sort_name,
+            "favorite": item.favorite,
+            "metadata": serialize_to_json(item.metadata),
+            "external_ids": serialize_to_json(item.external_ids),
+        }
 
     async def _update_library_item(
         self, item_id: str | int, update: Radio, overwrite: bool = False
@@ -53,17 +53,6 @@ class TracksController(MediaControllerBase[Track]):
         self.base_query = """
         SELECT
             tracks.*,
-            (SELECT JSON_GROUP_ARRAY(
-                json_object(
-                'item_id', provider_mappings.provider_item_id,
-                    'provider_domain', provider_mappings.provider_domain,
-                        'provider_instance', provider_mappings.provider_instance,
-                        'available', provider_mappings.available,
-                        'audio_format', json(provider_mappings.audio_format),
-                        'url', provider_mappings.url,
-                        'details', provider_mappings.details
-                )) FROM provider_mappings WHERE provider_mappings.item_id = tracks.item_id AND media_type = 'track') AS provider_mappings,
-
             (SELECT JSON_GROUP_ARRAY(
                 json_object(
                 'item_id', artists.item_id,
@@ -150,65 +139,6 @@ class TracksController(MediaControllerBase[Track]):
         track.artists = track_artists
         return track
 
-    async def library_items(
-        self,
-        favorite: bool | None = None,
-        search: str | None = None,
-        limit: int = 500,
-        offset: int = 0,
-        order_by: str = "sort_name",
-        provider: str | None = None,
-        extra_query: str | None = None,
-        extra_query_params: dict[str, Any] | None = None,
-    ) -> list[Track]:
-        """Get in-database tracks."""
-        extra_query_params: dict[str, Any] = extra_query_params or {}
-        extra_query_parts: list[str] = [extra_query] if extra_query else []
-        extra_join_parts: list[str] = []
-        if search and " - " in search:
-            # handle combined artist + title search
-            artist_str, title_str = search.split(" - ", 1)
-            search = None
-            extra_query_parts.append("tracks.name LIKE :search_title")
-            extra_query_params["search_title"] = f"%{title_str}%"
-            # use join with artists table to filter on artist name
-            extra_join_parts.append(
-                "JOIN track_artists ON track_artists.track_id = tracks.item_id "
-                "JOIN artists ON artists.item_id = track_artists.artist_id "
-                "AND artists.name LIKE :search_artist"
-            )
-            extra_query_params["search_artist"] = f"%{artist_str}%"
-        result = await self._get_library_items_by_query(
-            favorite=favorite,
-            search=search,
-            limit=limit,
-            offset=offset,
-            order_by=order_by,
-            provider=provider,
-            extra_query_parts=extra_query_parts,
-            extra_query_params=extra_query_params,
-            extra_join_parts=extra_join_parts,
-        )
-        if search and len(result) < 25 and not offset:
-            # append artist items to result
-            extra_join_parts.append(
-                "JOIN track_artists ON track_artists.track_id = tracks.item_id "
-                "JOIN artists ON artists.item_id = track_artists.artist_id "
-                "AND artists.name LIKE :search_artist"
-            )
-            extra_query_params["search_artist"] = f"%{search}%"
-            return result + await self._get_library_items_by_query(
-                favorite=favorite,
-                search=None,
-                limit=limit,
-                order_by=order_by,
-                provider=provider,
-                extra_query_parts=extra_query_parts,
-                extra_query_params=extra_query_params,
-                extra_join_parts=extra_join_parts,
-            )
-        return result
-
     async def versions(
         self,
         item_id: str,
@@ -413,28 +343,26 @@ class TracksController(MediaControllerBase[Track]):
         msg = "No Music Provider found that supports requesting similar tracks."
         raise UnsupportedFeaturedException(msg)
 
-    async def _add_library_item(self, item: Track) -> int:
-        """Add a new item record to the database."""
+    def _get_library_item_db_row(self, item: Track) -> dict[str, Any]:
+        """Return the (validated) database row for a new library item."""
         if not isinstance(item, Track):
             msg = "Not a valid Track object (ItemMapping can not be added to db)"
             raise InvalidDataError(msg)
         if not item.artists:
             msg = "Track is missing artist(s)"
             raise InvalidDataError(msg)
-        db_id = await self.mass.music.database.insert(
-            self.db_table,
-            {
-                "name": item.name,
-                "sort_name": item.sort_name,
-                "version": item.version,
-                "duration": item.duration,
-                "favorite": item.favorite,
-                "external_ids": serialize_to_json(item.external_ids),
-                "metadata": serialize_to_json(item.metadata),
-            },
-        )
-        # update/set provider_mappings table
-        await self._set_provider_mappings(db_id, item.provider_mappings)
+        return {
+            "name": item.name,
+            "sort_name": item.sort_name,
+            "version": item.version,
+            "duration": item.duration,
+            "favorite": item.favorite,
+            "external_ids": serialize_to_json(item.external_ids),
+            "metadata": serialize_to_json(item.metadata),
+        }
+
+    async def _set_library_item_relations(self, db_id: int, item: Track) -> None:
+        """Store the artists and album of a new library item."""
         # set track artist(s)
         await self._set_track_artists(db_id, item.artists)
         # handle track album
@@ -445,8 +373,6 @@ class TracksController(MediaControllerBase[Track]):
                 disc_number=getattr(item, "disc_number", 0),
                 track_number=getattr(item, "track_number", 0),
             )
-        self.logger.debug("added %s to database (id: %s)", item.name, db_id)
-        return db_id
 
     async def _update_library_item(
         self, item_id: str | int, update: Track, overwrite: bool = False
@@ -9,7 +9,7 @@ import shutil
 from contextlib import suppress
 from itertools import zip_longest
 from math import inf
-from typing import TYPE_CHECKING, Final, cast
+from typing import TYPE_CHECKING, Any, Final, cast
 
 from music_assistant.common.helpers.datetime import utc_timestamp
 from music_assistant.common.helpers.global_cache import get_global_cache_value
@@ -20,6 +20,7 @@ from music_assistant.common.models.enums import (
     ConfigEntryType,
     EventType,
     MediaType,
+    PlayerState,
     ProviderFeature,
     ProviderType,
 )
@@ -36,7 +37,11 @@ from music_assistant.common.models.media_items import (
     MediaItemType,
     SearchResults,
 )
-from music_assistant.common.models.provider import ProviderInstance, SyncTask
+from music_assistant.common.models.provider import (
+    LoudnessAnalysisTask,
+    ProviderInstance,
+    SyncTask,
+)
 from music_assistant.constants import (
     DB_TABLE_ALBUM_ARTISTS,
     DB_TABLE_ALBUM_TRACKS,
@@ -53,6 +58,7 @@ from music_assistant.constants import (
     PROVIDERS_WITH_SHAREABLE_URLS,
 )
 from music_assistant.server.helpers.api import api_command
+from music_assistant.server.helpers.audio import get_album_loudness, measure_loudness
 from music_assistant.server.helpers.database import DatabaseConnection
 from music_assistant.server.helpers.util import TaskManager
 from music_assistant.server.models.core_controller import CoreController
@@ -64,6 +70,8 @@ from .media.radio import RadioController
 from .media.tracks import TracksController
 
 if TYPE_CHECKING:
+    from collections.abc import Mapping
+
     from music_assistant.common.models.config_entries import CoreConfig
     from music_assistant.server.models.music_provider import MusicProvider
 
@@ -72,7 +80,61 @@ DEFAULT_SYNC_INTERVAL = 3 * 60  # default sync interval in minutes
 CONF_SYNC_INTERVAL = "sync_interval"
 CONF_DELETED_PROVIDERS = "deleted_providers"
 CONF_ADD_LIBRARY_ON_PLAY = "add_library_on_play"
-DB_SCHEMA_VERSION: Final[int] = 9
+CONF_LOUDNESS_ANALYSIS_WORKERS = "loudness_analysis_workers"
+CONF_LOUDNESS_ANALYSIS_SPEED = "loudness_analysis_speed"
+DEFAULT_LOUDNESS_ANALYSIS_WORKERS = 1
+DEFAULT_LOUDNESS_ANALYSIS_SPEED = 20  # max read speed (as multiple of realtime)
+# number of loudness measurements that are stored at once
+LOUDNESS_ANALYSIS_BATCH_SIZE = 50
+# interval (in seconds) to check if playback is (still) active
+LOUDNESS_ANALYSIS_IDLE_INTERVAL = 30
+DB_SCHEMA_VERSION: Final[int] = 11
+
+FTS_TABLES: Final[tuple[str, ...]] = (
+    DB_TABLE_ARTISTS,
+    DB_TABLE_ALBUMS,
+    DB_TABLE_TRACKS,
+    DB_TABLE_PLAYLISTS,
+    DB_TABLE_RADIOS,
+)
+# (sub)queries to get the denormalized artist/album names for the search index
+FTS_ARTISTS_QUERIES: Final[dict[str, str]] = {
+    DB_TABLE_TRACKS: (
+        f"(SELECT coalesce(group_concat({DB_TABLE_ARTISTS}.name, ' '), '') "
+        f"FROM {DB_TABLE_TRACK_ARTISTS} JOIN {DB_TABLE_ARTISTS} "
+        f"ON {DB_TABLE_ARTISTS}.item_id = {DB_TABLE_TRACK_ARTISTS}.artist_id "
+        f"WHERE {DB_TABLE_TRACK_ARTISTS}.track_id = {{item_id}})"
+    ),
+    DB_TABLE_ALBUMS: (
+        f"(SELECT coalesce(group_concat({DB_TABLE_ARTISTS}.name, ' '), '') "
+        f"FROM {DB_TABLE_ALBUM_ARTISTS} JOIN {DB_TABLE_ARTISTS} "
+        f"ON {DB_TABLE_ARTISTS}.item_id = {DB_TABLE_ALBUM_ARTISTS}.artist_id "
+        f"WHERE {DB_TABLE_ALBUM_ARTISTS}.album_id = {{item_id}})"
+    ),
+}
+FTS_ALBUM_QUERIES: Final[dict[str, str]] = {
+    DB_TABLE_TRACKS: (
+        f"(SELECT coalesce(group_concat({DB_TABLE_ALBUMS}.name, ' '), '') "
+        f"FROM {DB_TABLE_ALBUM_TRACKS} JOIN {DB_TABLE_ALBUMS} "
+        f"ON {DB_TABLE_ALBUMS}.item_id = {DB_TABLE_ALBUM_TRACKS}.album_id "
+        f"WHERE {DB_TABLE_ALBUM_TRACKS}.track_id = {{item_id}})"
+    ),
+}
+
+# (sub)query to build the (denormalized) provider_mappings json column of a media item
+PROVIDER_MAPPINGS_JSON_QUERY: Final[str] = (
+    "(SELECT JSON_GROUP_ARRAY(json_object("
+    f"'item_id', {DB_TABLE_PROVIDER_MAPPINGS}.provider_item_id, "
+    f"'provider_domain', {DB_TABLE_PROVIDER_MAPPINGS}.provider_domain, "
+    f"'provider_instance', {DB_TABLE_PROVIDER_MAPPINGS}.provider_instance, "
+    f"'available', {DB_TABLE_PROVIDER_MAPPINGS}.available, "
+    f"'audio_format', json({DB_TABLE_PROVIDER_MAPPINGS}.audio_format), "
+    f"'url', {DB_TABLE_PROVIDER_MAPPINGS}.url, "
+    f"'details', {DB_TABLE_PROVIDER_MAPPINGS}.details"
+    f")) FROM {DB_TABLE_PROVIDER_MAPPINGS} "
+    f"WHERE {DB_TABLE_PROVIDER_MAPPINGS}.item_id = {{item_id}} "
+    f"AND {DB_TABLE_PROVIDER_MAPPINGS}.media_type = '{{media_type}}')"
+)
 
 
 class MusicController(CoreController):
@@ -92,6 +154,7 @@ class MusicController(CoreController):
         self.radio = RadioController(self.mass)
         self.playlists = PlaylistController(self.mass)
         self.in_progress_syncs: list[SyncTask] = []
+        self.loudness_analysis: LoudnessAnalysisTask | None = None
         self._sync_lock = asyncio.Lock()
         self.manifest.name = "Music controller"
         self.manifest.description = (
@@ -124,6 +187,29 @@ class MusicController(CoreController):
                 description="Automatically add a track or radio station to "
                 "the library when played (if its not already in the library).",
             ),
+            ConfigEntry(
+                key=CONF_LOUDNESS_ANALYSIS_WORKERS,
+                type=ConfigEntryType.INTEGER,
+                range=(0, 8),
+                default_value=DEFAULT_LOUDNESS_ANALYSIS_WORKERS,
+                label="Background loudness analysis workers",
+                description="After a sync, the loudness (used for volume normalization) of "
+                "the library tracks of local music providers is measured in the background, "
+                "only while nothing is playing. This is the number of tracks analyzed at the "
+                "same time (one cpu core each), set to 0 to disable the background analysis.",
+                category="advanced",
+            ),
+            ConfigEntry(
+                key=CONF_LOUDNESS_ANALYSIS_SPEED,
+                type=ConfigEntryType.INTEGER,
+                range=(0, 100),
+                default_value=DEFAULT_LOUDNESS_ANALYSIS_SPEED,
+                label="Background loudness analysis speed limit",
+                description="Max speed (as multiple of realtime) at which each worker of the "
+                "background loudness analysis reads the audio, to limit the disk and network "
+                "usage. Set to 0 for no limit.",
+                category="advanced",
+            ),
             ConfigEntry(
                 key=CONF_RESET_DB,
                 type=ConfigEntryType.ACTION,
@@ -166,6 +252,8 @@ class MusicController(CoreController):
         """Cleanup on exit."""
         if self._sync_task and not self._sync_task.done():
             self._sync_task.cancel()
+        if self.loudness_analysis and self.loudness_analysis.task:
+            self.loudness_analysis.task.cancel()
         await self.database.close()
 
     @property
@@ -199,6 +287,43 @@ class MusicController(CoreController):
         """Return list with providers that are currently (scheduled for) syncing."""
         return self.in_progress_syncs
 
+    @api_command("music/analyze_loudness")
+    def start_loudness_analysis(self) -> None:
+        """Start the (background) loudness analysis of library tracks without measurement."""
+        if self.loudness_analysis:
+            self.logger.debug("Skip loudness analysis because it is already in progress")
+            return
+        if not self.mass.config.get_raw_core_config_value(
+            self.domain, CONF_LOUDNESS_ANALYSIS_WORKERS, DEFAULT_LOUDNESS_ANALYSIS_WORKERS
+        ):
+            return
+        self.loudness_analysis = analysis = LoudnessAnalysisTask(total=0, task=None)
+        analysis.task = self.mass.create_task(self._run_loudness_analysis(analysis))
+
+        def on_analysis_task_done(task: asyncio.Task) -> None:
+            self.loudness_analysis = None
+            self.mass.signal_event(EventType.LOUDNESS_ANALYSIS_UPDATED, data=None)
+            if task.cancelled():
+                return
+            if task_err := task.exception():
+                self.logger.warning(
+                    "Loudness analysis completed with errors",
+                    exc_info=task_err if self.logger.isEnabledFor(10) else None,
+                )
+            elif analysis.total:
+                self.logger.info(
+                    "Loudness analysis completed: %s tracks analyzed, %s failed",
+                    analysis.completed,
+                    analysis.failed,
+                )
+
+        analysis.task.add_done_callback(on_analysis_task_done)
+
+    @api_command("music/loudness_analysis")
+    def get_loudness_analysis_task(self) -> LoudnessAnalysisTask | None:
+        """Return the progress of the (background) loudness analysis, if running."""
+        return self.loudness_analysis
+
     @api_command("music/search")
     async def search(
         self,
@@ -857,9 +982,10 @@ class MusicController(CoreController):
             else:
                 self.logger.info("Sync task for %s completed", provider.name)
             self.mass.signal_event(EventType.SYNC_TASKS_UPDATED, data=self.in_progress_syncs)
-            # schedule db cleanup after sync
+            # schedule db cleanup and the loudness analysis of new tracks after sync
             if not self.in_progress_syncs:
                 self.mass.create_task(self._cleanup_database())
+                self.start_loudness_analysis()
 
         task.add_done_callback(on_sync_task_done)
 
@@ -910,7 +1036,7 @@ class MusicController(CoreController):
                 f"WHERE media_type = '{ctrl.media_type}' "
                 f"AND provider_instance = '{provider_instance}'"
             )
-            for db_row in await self.database.get_rows_from_query(query, limit=100000):
+            async for db_row in self.database.iter_rows_from_query(query):
                 try:
                     await ctrl.remove_provider_mappings(db_row["item_id"], provider_instance)
                 except Exception as err:
@@ -952,6 +1078,158 @@ class MusicController(CoreController):
                 "Provider %s was not not fully removed from library", provider_instance
             )
 
+    async def _run_loudness_analysis(self, analysis: LoudnessAnalysisTask) -> None:
+        """Analyze the loudness of the library tracks (of local providers) without measurement."""
+        pending: asyncio.Queue[tuple[MusicProvider, Mapping]] = asyncio.Queue()
+        for provider in self.providers:
+            if provider.is_streaming_provider:
+                # (bulk) analyzing the tracks of a streaming provider is too expensive,
+                # those are measured when played
+                continue
+            query = (
+                f"SELECT {DB_TABLE_PROVIDER_MAPPINGS}.item_id, provider_item_id "
+                f"FROM {DB_TABLE_PROVIDER_MAPPINGS} "
+                f"LEFT JOIN {DB_TABLE_LOUDNESS_MEASUREMENTS} "
+                f"ON {DB_TABLE_LOUDNESS_MEASUREMENTS}.media_type = 'track' "
+                f"AND {DB_TABLE_LOUDNESS_MEASUREMENTS}.item_id = provider_item_id "
+                f"AND {DB_TABLE_LOUDNESS_MEASUREMENTS}.provider = :provider "
+                f"WHERE {DB_TABLE_PROVIDER_MAPPINGS}.media_type = 'track' "
+                "AND provider_instance = :provider_instance AND available = 1 "
+                f"AND {DB_TABLE_LOUDNESS_MEASUREMENTS}.id IS NULL"
+            )
+            params = {"provider": provider.lookup_key, "provider_instance": provider.instance_id}
+            for db_row in await self.database.get_rows_from_query(query, params, limit=0):
+                pending.put_nowait((provider, db_row))
+        analysis.total = pending.qsize()
+        if not analysis.total:
+            return
+        self.logger.info("Start analyzing the loudness of %s tracks", analysis.total)
+        self.mass.signal_event(EventType.LOUDNESS_ANALYSIS_UPDATED, data=analysis)
+        measurements: list[dict[str, Any]] = []
+        track_ids: set[int] = set()
+        workers = self.mass.config.get_raw_core_config_value(
+            self.domain, CONF_LOUDNESS_ANALYSIS_WORKERS, DEFAULT_LOUDNESS_ANALYSIS_WORKERS
+        )
+        # a bounded pool of workers that process the pending tracks one by one
+        await asyncio.gather(
+            *(
+                self._loudness_analysis_worker(analysis, pending, measurements, track_ids)
+                for _ in range(max(1, workers))
+            )
+        )
+        await self._store_loudness_measurements(analysis, measurements)
+        await self._update_album_loudness(track_ids)
+
+    async def _loudness_analysis_worker(
+        self,
+        analysis: LoudnessAnalysisTask,
+        pending: asyncio.Queue[tuple[MusicProvider, Mapping]],
+        measurements: list[dict[str, Any]],
+        track_ids: set[int],
+    ) -> None:
+        """Measure the loudness of the pending tracks (while no playback is active)."""
+        # limit each worker to a single (decoder) thread and the configured read speed
+        extra_input_args = ["-threads", "1"]
+        if speed := self.mass.config.get_raw_core_config_value(
+            self.domain, CONF_LOUDNESS_ANALYSIS_SPEED, DEFAULT_LOUDNESS_ANALYSIS_SPEED
+        ):
+            extra_input_args += ["-readrate", str(speed)]
+        while not pending.empty():
+            # the analysis only runs in idle time so it does not compete with playback
+            if any(player.state == PlayerState.PLAYING for player in self.mass.players):
+                await asyncio.sleep(LOUDNESS_ANALYSIS_IDLE_INTERVAL)
+                continue
+            try:
+                provider, db_row = pending.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            try:
+                streamdetails = await provider.get_stream_details(db_row["provider_item_id"])
+                loudness = await measure_loudness(self.mass, streamdetails, extra_input_args)
+            except MusicAssistantError as err:
+                self.logger.debug(
+                    "Unable to analyze the loudness of %s: %s", db_row["provider_item_id"], err
+                )
+                loudness = None
+            if loudness is None:
+                # a failed measurement is stored as -inf so it is not retried on each run,
+                # the track is still measured when it is played
+                analysis.failed += 1
+            else:
+                analysis.completed += 1
+                track_ids.add(db_row["item_id"])
+            measurements.append(
+                {
+                    "item_id": db_row["provider_item_id"],
+                    "media_type": MediaType.TRACK.value,
+                    "provider": provider.lookup_key,
+                    "loudness": -inf if loudness is None else loudness,
+                }
+            )
+            if len(measurements) >= LOUDNESS_ANALYSIS_BATCH_SIZE:
+                await self._store_loudness_measurements(analysis, measurements)
+
+    async def _store_loudness_measurements(
+        self, analysis: LoudnessAnalysisTask, measurements: list[dict[str, Any]]
+    ) -> None:
+        """Store (and clear) the collected loudness measurements in the db."""
+        values = measurements.copy()
+        measurements.clear()
+        await self.database.insert_many(DB_TABLE_LOUDNESS_MEASUREMENTS, values, allow_replace=True)
+        self.mass.signal_event(EventType.LOUDNESS_ANALYSIS_UPDATED, data=analysis)
+
+    async def _update_album_loudness(self, track_ids: set[int]) -> None:
+        """Calculate and store the album loudness of the albums of the given library tracks."""
+        track_ids_list = list(track_ids)
+        album_measurements: dict[int, tuple[int, list[Mapping]]] = {}
+        for index in range(0, len(track_ids_list), 500):
+            query = (
+                f"SELECT {DB_TABLE_ALBUM_TRACKS}.album_id, {DB_TABLE_ALBUM_TRACKS}.track_id, "
+                f"{DB_TABLE_TRACKS}.duration, {DB_TABLE_LOUDNESS_MEASUREMENTS}.id, "
+                f"{DB_TABLE_LOUDNESS_MEASUREMENTS}.loudness, "
+                f"(SELECT count(*) FROM {DB_TABLE_ALBUM_TRACKS} AS album_tracks2 "
+                f"WHERE album_tracks2.album_id = {DB_TABLE_ALBUM_TRACKS}.album_id) "
+                "AS track_count "
+                f"FROM {DB_TABLE_ALBUM_TRACKS} "
+                f"JOIN {DB_TABLE_TRACKS} "
+                f"ON {DB_TABLE_TRACKS}.item_id = {DB_TABLE_ALBUM_TRACKS}.track_id "
+                f"JOIN {DB_TABLE_PROVIDER_MAPPINGS} "
+                f"ON {DB_TABLE_PROVIDER_MAPPINGS}.media_type = 'track' "
+                f"AND {DB_TABLE_PROVIDER_MAPPINGS}.item_id = {DB_TABLE_ALBUM_TRACKS}.track_id "
+                f"JOIN {DB_TABLE_LOUDNESS_MEASUREMENTS} "
+                f"ON {DB_TABLE_LOUDNESS_MEASUREMENTS}.media_type = 'track' "
+                f"AND {DB_TABLE_LOUDNESS_MEASUREMENTS}.item_id = provider_item_id "
+                f"AND {DB_TABLE_LOUDNESS_MEASUREMENTS}.provider "
+                "IN (provider_instance, provider_domain) "
+                f"WHERE {DB_TABLE_ALBUM_TRACKS}.album_id IN (SELECT album_id "
+                f"FROM {DB_TABLE_ALBUM_TRACKS} WHERE track_id in :track_ids)"
+            )
+            params = {"track_ids": track_ids_list[index : index + 500]}
+            for db_row in await self.database.get_rows_from_query(query, params, limit=0):
+                album_measurements.setdefault(db_row["album_id"], (db_row["track_count"], []))[
+                    1
+                ].append(db_row)
+        async with self.database.batch():
+            for track_count, db_rows in album_measurements.values():
+                # use a single measurement per track (a track can have multiple mappings)
+                tracks = {
+                    x["track_id"]: (x["loudness"], x["duration"])
+                    for x in db_rows
+                    if x["loudness"] not in (inf, -inf)
+                }
+                if len(tracks) < track_count:
+                    # the album loudness is only known when all its tracks are measured
+                    continue
+                if (album_loudness := get_album_loudness(tracks.values())) is None:
+                    continue
+                measurement_ids = ",".join(str(int(x["id"])) for x in db_rows)
+                await self.database.execute(
+                    f"UPDATE {DB_TABLE_LOUDNESS_MEASUREMENTS} SET loudness_album = "
+                    f":loudness_album WHERE id IN ({measurement_ids})",
+                    {"loudness_album": album_loudness},
+                )
+                await self.database.commit()
+
     def _schedule_sync(self) -> None:
         """Schedule the periodic sync."""
         self.start_sync()
@@ -980,7 +1258,9 @@ class MusicController(CoreController):
                 f"item_id not in (SELECT item_id from {DB_TABLE_PROVIDER_MAPPINGS} "
                 f"WHERE media_type = '{ctrl.media_type}')"
             )
-            await self.database.delete_where_query(ctrl.db_table, query)
+            # new items are inserted (under the add lock) before their provider mappings
+            async with ctrl._db_add_lock:
+                await self.database.delete_where_query(ctrl.db_table, query)
             # Cleanup removed db items from the playlog
             where_clause = (
                 f"media_type = '{ctrl.media_type}' AND provider = 'library' "
@@ -1008,6 +1288,8 @@ class MusicController(CoreController):
         if prev_version not in (0, DB_SCHEMA_VERSION):
             # db version mismatch - we need to do a migration
             # make a backup of db file
+            # (checkpoint first so the main db file holds all (WAL) changes)
+            await self.database.execute("PRAGMA wal_checkpoint(TRUNCATE);")
             db_path_backup = db_path + ".backup"
             await asyncio.to_thread(shutil.copyfile, db_path, db_path_backup)
 
@@ -1122,6 +1404,46 @@ class MusicController(CoreController):
                 )
             await self.database.execute("DROP TABLE IF EXISTS track_loudness")
 
+        if prev_version <= 9:
+            # add the (trigger maintained) provider_mappings column to the media tables
+            for db_table, media_type in (
+                (DB_TABLE_ARTISTS, MediaType.ARTIST),
+                (DB_TABLE_ALBUMS, MediaType.ALBUM),
+                (DB_TABLE_TRACKS, MediaType.TRACK),
+                (DB_TABLE_PLAYLISTS, MediaType.PLAYLIST),
+                (DB_TABLE_RADIOS, MediaType.RADIO),
+            ):
+                try:
+                    await self.database.execute(
+                        f"ALTER TABLE {db_table} ADD COLUMN provider_mappings json DEFAULT '[]'"
+                    )
+                except Exception as err:
+                    if "duplicate column" not in str(err):
+                        raise
+                value_query = PROVIDER_MAPPINGS_JSON_QUERY.format(
+                    item_id=f"{db_table}.item_id", media_type=media_type.value
+                )
+                # the timestamp trigger would mark all items as modified by this backfill,
+                # it is recreated (without the provider_mappings column) after the migration
+                await self.database.execute(f"DROP TRIGGER IF EXISTS update_{db_table}_timestamp")
+                await self.database.execute(
+                    f"UPDATE {db_table} SET provider_mappings={value_query}"
+                )
+
+        if prev_version <= 10:
+            # recreate the triggers that were changed (after the migration)
+            for db_table in (
+                DB_TABLE_ARTISTS,
+                DB_TABLE_ALBUMS,
+                DB_TABLE_TRACKS,
+                DB_TABLE_PLAYLISTS,
+                DB_TABLE_RADIOS,
+            ):
+                await self.database.execute(f"DROP TRIGGER IF EXISTS update_{db_table}_timestamp")
+                await self.database.execute(
+                    f"DROP TRIGGER IF EXISTS {db_table}_provider_mappings_update"
+                )
+
         # save changes
         await self.database.commit()
 
@@ -1167,7 +1489,8 @@ class MusicController(CoreController):
                     [play_count] INTEGER DEFAULT 0,
                     [last_played] INTEGER DEFAULT 0,
                     [timestamp_added] INTEGER DEFAULT (cast(strftime('%s','now') as int)),
-                    [timestamp_modified] INTEGER
+                    [timestamp_modified] INTEGER,
+                    [provider_mappings] json DEFAULT '[]'
                 );"""
         )
         await self.database.execute(
@@ -1182,7 +1505,8 @@ class MusicController(CoreController):
             [play_count] INTEGER DEFAULT 0,
             [last_played] INTEGER DEFAULT 0,
             [timestamp_added] INTEGER DEFAULT (cast(strftime('%s','now') as int)),
-            [timestamp_modified] INTEGER
+            [timestamp_modified] INTEGER,
+            [provider_mappings] json DEFAULT '[]'
             );"""
         )
         await self.database.execute(
@@ -1199,7 +1523,8 @@ class MusicController(CoreController):
             [play_count] INTEGER DEFAULT 0,
             [last_played] INTEGER DEFAULT 0,
             [timestamp_added] INTEGER DEFAULT (cast(strftime('%s','now') as int)),
-            [timestamp_modified] INTEGER
+            [timestamp_modified] INTEGER,
+            [provider_mappings] json DEFAULT '[]'
             );"""
         )
         await self.database.execute(
@@ -1217,7 +1542,8 @@ class MusicController(CoreController):
             [play_count] INTEGER DEFAULT 0,
             [last_played] INTEGER DEFAULT 0,
             [timestamp_added] INTEGER DEFAULT (cast(strftime('%s','now') as int)),
-            [timestamp_modified] INTEGER
+            [timestamp_modified] INTEGER,
+            [provider_mappings] json DEFAULT '[]'
             );"""
         )
         await self.database.execute(
@@ -1232,7 +1558,8 @@ class MusicController(CoreController):
             [play_count] INTEGER DEFAULT 0,
             [last_played] INTEGER DEFAULT 0,
             [timestamp_added] INTEGER DEFAULT (cast(strftime('%s','now') as int)),
-            [timestamp_modified] INTEGER
+            [timestamp_modified] INTEGER,
+            [provider_mappings] json DEFAULT '[]'
             );"""
         )
         await self.database.execute(
@@ -1292,6 +1619,19 @@ class MusicController(CoreController):
                     [loudness_album] REAL,
                     UNIQUE(media_type,item_id,provider));"""
         )
+        # full text search index (one per media table, rowid is the item_id of the media table)
+        # the unicode61 tokenizer folds case and diacritics so "beyonce" matches "Beyoncé"
+        for db_table in FTS_TABLES:
+            await self.database.execute(
+                f"""CREATE VIRTUAL TABLE IF NOT EXISTS {db_table}_fts USING fts5(
+                    name, sort_name, artists, album,
+                    tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3');"""
+            )
+            # rank matches on the name higher than matches on the artist/album names
+            await self.database.execute(
+                f"INSERT INTO {db_table}_fts({db_table}_fts, rank) "
+                "VALUES('rank', 'bm25(10.0, 5.0, 2.0, 1.0)')"
+            )
 
         await self.database.commit()
 
@@ -1400,10 +1740,18 @@ class MusicController(CoreController):
         """Create database triggers."""
         # triggers to auto update timestamps
         for db_table in ("artists", "albums", "tracks", "playlists", "radios"):
+            # the (trigger maintained) provider_mappings column is not a modification of the item
+            columns = ", ".join(
+                row["name"]
+                for row in await self.database.get_rows_from_query(
+                    f"SELECT name FROM pragma_table_info('{db_table}')", limit=0
+                )
+                if row["name"] != "provider_mappings"
+            )
             await self.database.execute(
                 f"""
                 CREATE TRIGGER IF NOT EXISTS update_{db_table}_timestamp
-                AFTER UPDATE ON {db_table} FOR EACH ROW
+                AFTER UPDATE OF {columns} ON {db_table} FOR EACH ROW
                 WHEN NEW.timestamp_modified <= OLD.timestamp_modified
                 BEGIN
                     UPDATE {db_table} set timestamp_modified=cast(strftime('%s','now') as int)
@@ -1411,4 +1759,185 @@ class MusicController(CoreController):
                 END;
                 """
             )
+        # triggers to keep the (denormalized) provider_mappings column of the media tables
+        # in sync with the provider_mappings table, so listings do not need a subquery per row
+        for db_table, media_type in (
+            (DB_TABLE_ARTISTS, MediaType.ARTIST),
+            (DB_TABLE_ALBUMS, MediaType.ALBUM),
+            (DB_TABLE_TRACKS, MediaType.TRACK),
+            (DB_TABLE_PLAYLISTS, MediaType.PLAYLIST),
+            (DB_TABLE_RADIOS, MediaType.RADIO),
+        ):
+            for action, row in (("INSERT", "NEW"), ("UPDATE", "NEW"), ("DELETE", "OLD")):
+                value_query = PROVIDER_MAPPINGS_JSON_QUERY.format(
+                    item_id=f"{row}.item_id", media_type=media_type.value
+                )
+                statements = (
+                    f"UPDATE {db_table} SET provider_mappings={value_query} "
+                    f"WHERE item_id={row}.item_id;"
+                )
+                if action == "UPDATE":
+                    # the mapping may have been moved to another item
+                    old_value_query = PROVIDER_MAPPINGS_JSON_QUERY.format(
+                        item_id="OLD.item_id", media_type=media_type.value
+                    )
+                    statements += (
+                        f"UPDATE {db_table} SET provider_mappings={old_value_query} "
+                        "WHERE item_id=OLD.item_id AND OLD.item_id != NEW.item_id;"
+                    )
+                await self.database.execute(
+                    f"""
+                    CREATE TRIGGER IF NOT EXISTS {db_table}_provider_mappings_{action.lower()}
+                    AFTER {action} ON {DB_TABLE_PROVIDER_MAPPINGS} FOR EACH ROW
+                    WHEN {row}.media_type = '{media_type.value}'
+                    BEGIN
+                        {statements}
+                    END;
+                    """
+                )
+            # the rows deleted by an INSERT OR REPLACE do not fire the delete trigger,
+            # so refresh the previous owner of a (replaced) mapping before the insert,
+            # without the mapping that is about to be moved to the new item
+            value_query = PROVIDER_MAPPINGS_JSON_QUERY.format(
+                item_id=f"{db_table}.item_id", media_type=media_type.value
+            )
+            value_query = (
+                f"{value_query[:-1]} AND NOT ("
+                f"{DB_TABLE_PROVIDER_MAPPINGS}.provider_instance = NEW.provider_instance "
+                f"AND {DB_TABLE_PROVIDER_MAPPINGS}.provider_item_id = NEW.provider_item_id))"
+            )
+            await self.database.execute(
+                f"""
+                CREATE TRIGGER IF NOT EXISTS {db_table}_provider_mappings_replace
+                BEFORE INSERT ON {DB_TABLE_PROVIDER_MAPPINGS} FOR EACH ROW
+                WHEN NEW.media_type = '{media_type.value}'
+                BEGIN
+                    UPDATE {db_table} SET provider_mappings={value_query}
+                    WHERE item_id IN (
+                        SELECT item_id FROM {DB_TABLE_PROVIDER_MAPPINGS}
+                        WHERE media_type = NEW.media_type
+                        AND provider_instance = NEW.provider_instance
+                        AND provider_item_id = NEW.provider_item_id
+                        AND item_id != NEW.item_id
+                    );
+                END;
+                """
+            )
+        # triggers to keep the full text search index in sync with the media tables
+        for db_table in FTS_TABLES:
+            artists_query = FTS_ARTISTS_QUERIES.get(db_table, "''").format(item_id="NEW.item_id")
+            album_query = FTS_ALBUM_QUERIES.get(db_table, "''").format(item_id="NEW.item_id")
+            await self.database.execute(
+                f"""
+                CREATE TRIGGER IF NOT EXISTS {db_table}_fts_insert
+                AFTER INSERT ON {db_table} FOR EACH ROW
+                BEGIN
+                    INSERT INTO {db_table}_fts(rowid, name, sort_name, artists, album)
+                    VALUES (NEW.item_id, NEW.name, NEW.sort_name, {artists_query}, {album_query});
+                END;
+                """
+            )
+            await self.database.execute(
+                f"""
+                CREATE TRIGGER IF NOT EXISTS {db_table}_fts_update
+                AFTER UPDATE OF name, sort_name ON {db_table} FOR EACH ROW
+                BEGIN
+                    UPDATE {db_table}_fts SET name=NEW.name, sort_name=NEW.sort_name
+                    WHERE rowid=NEW.item_id;
+                END;
+                """
+            )
+            await self.database.execute(
+                f"""
+                CREATE TRIGGER IF NOT EXISTS {db_table}_fts_delete
+                AFTER DELETE ON {db_table} FOR EACH ROW
+                BEGIN
+                    DELETE FROM {db_table}_fts WHERE rowid=OLD.item_id;
+                END;
+                """
+            )
+        # refresh the (denormalized) artist/album names on changes of the relations
+        for db_table, column, link_table, link_column in (
+            (DB_TABLE_TRACKS, "artists", DB_TABLE_TRACK_ARTISTS, "track_id"),
+            (DB_TABLE_ALBUMS, "artists", DB_TABLE_ALBUM_ARTISTS, "album_id"),
+            (DB_TABLE_TRACKS, "album", DB_TABLE_ALBUM_TRACKS, "track_id"),
+        ):
+            queries = FTS_ARTISTS_QUERIES if column == "artists" else FTS_ALBUM_QUERIES
+            for action, row in (("INSERT", "NEW"), ("DELETE", "OLD")):
+                value_query = queries[db_table].format(item_id=f"{row}.{link_column}")
+                await self.database.execute(
+                    f"""
+                    CREATE TRIGGER IF NOT EXISTS {link_table}_fts_{action.lower()}
+                    AFTER {action} ON {link_table} FOR EACH ROW
+                    BEGIN
+                        UPDATE {db_table}_fts SET {column}={value_query}
+                        WHERE rowid={row}.{link_column};
+                    END;
+                    """
+                )
+        # refresh the denormalized names on rename of an artist or album
+        for source_table, db_table, column, link_table, link_column, source_column in (
+            (
+                DB_TABLE_ARTISTS,
+                DB_TABLE_TRACKS,
+                "artists",
+                DB_TABLE_TRACK_ARTISTS,
+                "track_id",
+                "artist_id",
+            ),
+            (
+                DB_TABLE_ARTISTS,
+                DB_TABLE_ALBUMS,
+                "artists",
+                DB_TABLE_ALBUM_ARTISTS,
+                "album_id",
+                "artist_id",
+            ),
+            (
+                DB_TABLE_ALBUMS,
+                DB_TABLE_TRACKS,
+                "album",
+                DB_TABLE_ALBUM_TRACKS,
+                "track_id",
+                "album_id",
+            ),
+        ):
+            queries = FTS_ARTISTS_QUERIES if column == "artists" else FTS_ALBUM_QUERIES
+            value_query = queries[db_table].format(item_id=f"{db_table}_fts.rowid")
+            await self.database.execute(
+                f"""
+                CREATE TRIGGER IF NOT EXISTS {source_table}_{db_table}_fts_rename
+                AFTER UPDATE OF name ON {source_table} FOR EACH ROW
+                BEGIN
+                    UPDATE {db_table}_fts SET {column}={value_query}
+                    WHERE rowid IN (
+                        SELECT {link_column} FROM {link_table}
+                        WHERE {source_column}=NEW.item_id
+                    );
+                END;
+                """
+            )
         await self.database.commit()
+        await self.__rebuild_search_index()
+
+    async def __rebuild_search_index(self) -> None:
+        """(Re)build the full text search index if it is out of sync with the media tables."""
+        for db_table in FTS_TABLES:
+            count = await self.database.get_count(db_table)
+            fts_count = await self.database.get_count(f"{db_table}_fts")
+            if count == fts_count:
+                continue
+            self.logger.debug("Building search index for %s...", db_table)
+            artists_query = FTS_ARTISTS_QUERIES.get(db_table, "''").format(
+                item_id=f"{db_table}.item_id"
+            )
+            album_query = FTS_ALBUM_QUERIES.get(db_table, "''").format(
+                item_id=f"{db_table}.item_id"
+            )
+            await self.database.execute(f"DELETE FROM {db_table}_fts")
+            await self.database.execute(
+                f"INSERT INTO {db_table}_fts(rowid, name, sort_name, artists, album) "
+                f"SELECT item_id, name, sort_name, {artists_query}, {album_query} "
+                f"FROM {db_table}"
+            )
+            await self.database.commit()
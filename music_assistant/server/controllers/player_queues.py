@@ -77,6 +77,8 @@ CONF_DEFAULT_ENQUEUE_OPTION_TRACK = "default_enqueue_option_track"
 CONF_DEFAULT_ENQUEUE_OPTION_RADIO = "default_enqueue_option_radio"
 CONF_DEFAULT_ENQUEUE_OPTION_PLAYLIST = "default_enqueue_option_playlist"
 RADIO_TRACK_MAX_DURATION_SECS = 20 * 60  # 20 minutes
+# the (persistent) state of the queues is saved (at most) once per this many seconds
+QUEUE_STATE_SAVE_DELAY = 5
 
 
 class CompareState(TypedDict):
@@ -104,6 +106,9 @@ class PlayerQueuesController(CoreController):
         self._queues: dict[str, PlayerQueue] = {}
         self._queue_items: dict[str, list[QueueItem]] = {}
         self._prev_states: dict[str, CompareState] = {}
+        # queue_id --> items changed, for the queues with a pending state save
+        self._pending_saves: dict[str, bool] = {}
+        self._save_timer: asyncio.TimerHandle | None = None
         self.manifest.name = "Player Queues controller"
         self.manifest.description = (
             "Music Assistant's core controller which manages the queues for all players."
@@ -117,6 +122,7 @@ class PlayerQueuesController(CoreController):
             if queue.state not in (PlayerState.PLAYING, PlayerState.PAUSED):
                 continue
             await self.stop(queue.queue_id)
+        await self._save_queue_states()
 
     async def get_config_entries(
         self,
@@ -1063,6 +1069,7 @@ class PlayerQueuesController(CoreController):
         self.mass.create_task(self.mass.cache.delete(f"queue.items.{player_id}"))
         self._queues.pop(player_id, None)
         self._queue_items.pop(player_id, None)
+        self._pending_saves.pop(player_id, None)
 
     async def load_next_item(
         self,
@@ -1203,6 +1210,8 @@ class PlayerQueuesController(CoreController):
         self._queues[queue_id].items = len(self._queue_items[queue_id])
         self.signal_update(queue_id, True)
         self._queues[queue_id].next_track_enqueued = None
+        # the (prefetched) next item may no longer be the next item
+        self.mass.streams.invalidate_next_item(queue_id)
 
     # Helper methods
 
@@ -1222,26 +1231,38 @@ class PlayerQueuesController(CoreController):
         queue = self._queues[queue_id]
         if items_changed:
             self.mass.signal_event(EventType.QUEUE_ITEMS_UPDATED, object_id=queue_id, data=queue)
-            # save items in cache
-            self.mass.create_task(
-                self.mass.cache.set(
+        # always send the base event
+        self.mass.signal_event(EventType.QUEUE_UPDATED, object_id=queue_id, data=queue)
+        # save state (and items) in cache, debounced as the queue may change in rapid succession
+        self._pending_saves[queue_id] = self._pending_saves.get(queue_id, False) or items_changed
+        if self._save_timer is None:
+            self._save_timer = self.mass.loop.call_later(
+                QUEUE_STATE_SAVE_DELAY, self.mass.create_task, self._save_queue_states
+            )
+
+    async def _save_queue_states(self) -> None:
+        """Save the state (and items) of all queues with pending changes in the cache."""
+        if self._save_timer is not None:
+            self._save_timer.cancel()
+            self._save_timer = None
+        pending_saves = self._pending_saves
+        self._pending_saves = {}
+        for queue_id, items_changed in pending_saves.items():
+            if not (queue := self._queues.get(queue_id)):
+                continue
+            if items_changed:
+                await self.mass.cache.set(
                     "items",
                     [x.to_cache() for x in self._queue_items[queue_id]],
                     category=CacheCategory.PLAYER_QUEUE_STATE,
                     base_key=queue_id,
                 )
-            )
-        # always send the base event
-        self.mass.signal_event(EventType.QUEUE_UPDATED, object_id=queue_id, data=queue)
-        # save state
-        self.mass.create_task(
-            self.mass.cache.set(
+            await self.mass.cache.set(
                 "state",
                 queue.to_cache(),
                 category=CacheCategory.PLAYER_QUEUE_STATE,
                 base_key=queue_id,
             )
-        )
 
     def index_by_id(self, queue_id: str, queue_item_id: str) -> int | None:
         """Get index by queue_item_id."""
@@ -1415,6 +1436,13 @@ class PlayerQueuesController(CoreController):
                 player_id=queue.queue_id,
                 media=self.player_media_from_queue_item(next_item, False),
             )
+            # start buffering the next item before the current one ends
+            if (current_item := queue.current_item) and current_item.duration:
+                self.mass.streams.prefetch_queue_item(
+                    queue.queue_id,
+                    next_item,
+                    remaining_time=current_item.duration - queue.corrected_elapsed_time,
+                )
 
         self.mass.create_task(_enqueue_next())
 
@@ -10,6 +10,7 @@ from __future__ import annotations
 
 import asyncio
 import functools
+import random
 import time
 from contextlib import suppress
 from typing import TYPE_CHECKING, Any, Concatenate, ParamSpec, TypeVar, cast
@@ -57,8 +58,14 @@ from music_assistant.server.providers.player_group import PlayerGroupProvider
 if TYPE_CHECKING:
     from collections.abc import Awaitable, Callable, Coroutine, Iterator
 
-    from music_assistant.common.models.config_entries import CoreConfig
 
+# interval (in seconds) to update the (queue) progress of a playing player
+PROGRESS_UPDATE_INTERVAL = 1
+# max deviation of the poll interval, to spread the polls of players
+POLL_INTERVAL_JITTER = 0.1
+# bounds (in seconds) of the deadline of a single poll
+POLL_TIMEOUT_MIN = 5
+POLL_TIMEOUT_MAX = 30
 
 _PlayerControllerT = TypeVar("_PlayerControllerT", bound="PlayerController")
 _R = TypeVar("_R")
@@ -111,17 +118,21 @@ class PlayerController(CoreController):
             "Music Assistant's core controller which manages all players from all providers."
         )
         self.manifest.icon = "speaker-multiple"
-        self._poll_task: asyncio.Task | None = None
         self._player_throttlers: dict[str, Throttler] = {}
-
-    async def setup(self, config: CoreConfig) -> None:
-        """Async initialize of module."""
-        self._poll_task = self.mass.create_task(self._poll_players())
+        # player_id --> timer of the next poll / running poll
+        self._poll_timers: dict[str, asyncio.TimerHandle] = {}
+        self._poll_tasks: dict[str, asyncio.Task] = {}
+        # player_id --> timer of the next (queue) progress update
+        self._progress_timers: dict[str, asyncio.TimerHandle] = {}
 
     async def close(self) -> None:
         """Cleanup on exit."""
-        if self._poll_task and not self._poll_task.done():
-            self._poll_task.cancel()
+        for timer in (*self._poll_timers.values(), *self._progress_timers.values()):
+            timer.cancel()
+        self._poll_timers = {}
+        self._progress_timers = {}
+        for task in self._poll_tasks.values():
+            task.cancel()
 
     @property
     def providers(self) -> list[PlayerProvider]:
@@ -839,6 +850,10 @@ class PlayerController(CoreController):
         if cleanup_config:
             self.mass.config.remove(f"players/{player_id}")
         self._prev_states.pop(player_id, None)
+        if timer := self._poll_timers.pop(player_id, None):
+            timer.cancel()
+        if timer := self._progress_timers.pop(player_id, None):
+            timer.cancel()
         self.mass.signal_event(EventType.PLAYER_REMOVED, player_id)
 
     def update(
@@ -900,6 +915,8 @@ class PlayerController(CoreController):
             ],
         )
         self._prev_states[player_id] = new_state
+        self._schedule_poll(player)
+        self._schedule_progress_update(player)
 
         if not player.enabled and not force_update:
             # ignore updates for disabled players
@@ -1278,37 +1295,93 @@ class PlayerController(CoreController):
             self.logger.warning("Can not resume %s on %s", prev_item_id, player.display_name)
             # TODO !!
 
-    async def _poll_players(self) -> None:
-        """Background task that polls players for updates."""
-        while True:
-            for player in list(self._players.values()):
-                player_id = player.player_id
-                # if the player is playing, update elapsed time every tick
-                # to ensure the queue has accurate details
-                player_playing = player.state == PlayerState.PLAYING
-                if player_playing:
-                    self.mass.loop.call_soon(self.update, player_id)
-                # Poll player;
-                if not player.needs_poll:
-                    continue
-                if (self.mass.loop.time() - player.last_poll) < player.poll_interval:
-                    continue
-                player.last_poll = self.mass.loop.time()
-                if player_prov := self.get_player_provider(player_id):
-                    try:
-                        await player_prov.poll_player(player_id)
-                    except PlayerUnavailableError:
-                        player.available = False
-                        player.state = PlayerState.IDLE
-                        player.powered = False
-                    except Exception as err:
-                        self.logger.warning(
-                            "Error while requesting latest state from player %s: %s",
-                            player.display_name,
-                            str(err),
-                            exc_info=err if self.logger.isEnabledFor(10) else None,
-                        )
-                    finally:
-                        # always update player state
-                        self.mass.loop.call_soon(self.update, player_id)
-            await asyncio.sleep(1)
+    def _schedule_poll(self, player: Player, delay: float | None = None) -> None:
+        """
+        Schedule the next poll of a player (if it needs polling).
+
+        Every player is polled on its own (jittered) timer, so a slow poll of one player
+        does not delay the others and the polls of many players are spread out.
+        Players of providers that push their state should not set needs_poll at all.
+        """
+        player_id = player.player_id
+        if not player.needs_poll:
+            if timer := self._poll_timers.pop(player_id, None):
+                timer.cancel()
+            return
+        if player_id in self._poll_tasks:
+            # the next poll is scheduled when the running poll is done
+            return
+        now = self.mass.loop.time()
+        if delay is None:
+            delay = max(0, player.last_poll + player.poll_interval - now)
+        timer = self._poll_timers.get(player_id)
+        if timer and timer.when() <= now + delay * (1 + POLL_INTERVAL_JITTER):
+            # keep the scheduled poll, unless the poll interval decreased
+            return
+        if timer:
+            timer.cancel()
+        delay *= random.uniform(1 - POLL_INTERVAL_JITTER, 1 + POLL_INTERVAL_JITTER)
+        self._poll_timers[player_id] = self.mass.loop.call_later(delay, self._start_poll, player_id)
+
+    def _start_poll(self, player_id: str) -> None:
+        """Start the (scheduled) poll of a player."""
+        self._poll_timers.pop(player_id, None)
+        if player_id not in self._players or player_id in self._poll_tasks:
+            return
+        task = self.mass.create_task(self._poll_player(player_id))
+        self._poll_tasks[player_id] = task
+        task.add_done_callback(lambda _: self._poll_tasks.pop(player_id, None))
+
+    async def _poll_player(self, player_id: str) -> None:
+        """Poll a player for updates (within its deadline) and schedule the next poll."""
+        player = self._players[player_id]
+        timeout = min(max(player.poll_interval, POLL_TIMEOUT_MIN), POLL_TIMEOUT_MAX)
+        try:
+            async with asyncio.timeout(timeout):
+                await self.get_player_provider(player_id).poll_player(player_id)
+        except PlayerUnavailableError:
+            player.available = False
+            player.state = PlayerState.IDLE
+            player.powered = False
+        except TimeoutError:
+            self.logger.debug(
+                "Timeout while requesting latest state from player %s", player.display_name
+            )
+        except Exception as err:
+            self.logger.warning(
+                "Error while requesting latest state from player %s: %s",
+                player.display_name,
+                str(err),
+                exc_info=err if self.logger.isEnabledFor(10) else None,
+            )
+        finally:
+            # the next poll is (at least) a poll interval after this one finished
+            player.last_poll = self.mass.loop.time()
+            self._poll_tasks.pop(player_id, None)
+            if player_id in self._players:
+                # always update player state (which also schedules the next poll)
+                self.mass.loop.call_soon(self.update, player_id)
+
+    def _schedule_progress_update(self, player: Player) -> None:
+        """Schedule the next (queue) progress update of a playing player.
+
+        The elapsed time of a player is derived from elapsed_time_last_updated when needed,
+        but an active queue needs to be updated regularly while it is playing
+        (e.g. to detect the next track in flow mode and to enqueue the next item).
+        """
+        player_id = player.player_id
+        if player_id in self._progress_timers:
+            return
+        if player.state != PlayerState.PLAYING or player.active_source != player_id:
+            return
+        self._progress_timers[player_id] = self.mass.loop.call_later(
+            PROGRESS_UPDATE_INTERVAL, self._update_progress, player_id
+        )
+
+    def _update_progress(self, player_id: str) -> None:
+        """Update the progress of the (active queue of a) playing player."""
+        self._progress_timers.pop(player_id, None)
+        if (player := self._players.get(player_id)) is None or not player.enabled:
+            return
+        self.mass.player_queues.on_player_update(player, {})
+        self._schedule_progress_update(player)
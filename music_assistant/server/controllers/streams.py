@@ -8,10 +8,12 @@ the upnp callbacks and json rpc api for slimproto clients.
 
 from __future__ import annotations
 
+import asyncio
 import os
 import time
 import urllib.parse
 from collections.abc import AsyncGenerator
+from dataclasses import dataclass, replace
 from typing import TYPE_CHECKING
 
 from aiofiles.os import wrap
@@ -37,11 +39,14 @@ from music_assistant.common.models.player_queue import PlayLogEntry
 from music_assistant.common.models.streamdetails import StreamDetails
 from music_assistant.constants import (
     ANNOUNCE_ALERT_FILE,
+    CONF_AUDIO_CACHE_SIZE,
     CONF_BIND_IP,
     CONF_BIND_PORT,
     CONF_CROSSFADE,
+    CONF_CROSSFADE_CURVE,
     CONF_CROSSFADE_DURATION,
     CONF_HTTP_PROFILE,
+    CONF_NEXT_ITEM_PREFETCH,
     CONF_OUTPUT_CHANNELS,
     CONF_PUBLISH_IP,
     CONF_SAMPLE_RATES,
@@ -60,14 +65,20 @@ from music_assistant.server.helpers.audio import (
     crossfade_pcm_parts,
     get_chunksize,
     get_hls_substream,
+    get_http_stream,
     get_icy_radio_stream,
     get_media_stream,
     get_player_filter_params,
     get_silence,
     get_stream_details,
 )
+from music_assistant.server.helpers.audio_cache import AudioCache, get_cache_key
+from music_assistant.server.helpers.buffer import ByteBuffer
 from music_assistant.server.helpers.ffmpeg import LOGGER as FFMPEG_LOGGER
 from music_assistant.server.helpers.ffmpeg import get_ffmpeg_stream
+from music_assistant.server.helpers.pcm import CROSSFADE_CURVE_EQUAL_POWER, CROSSFADE_CURVE_LINEAR
+from music_assistant.server.helpers.prefetch import PrefetchedStream
+from music_assistant.server.helpers.shared_stream import SharedStream
 from music_assistant.server.helpers.util import get_ips
 from music_assistant.server.helpers.webserver import Webserver
 from music_assistant.server.models.core_controller import CoreController
@@ -94,11 +105,39 @@ ICY_HEADERS = {
 }
 FLOW_DEFAULT_SAMPLE_RATE = 48000
 FLOW_DEFAULT_BIT_DEPTH = 24
+# (container) formats that ffmpeg can decode from a pipe,
+# so their http streams can be fetched by us and written to the audio cache
+PIPEABLE_CONTENT_TYPES = (
+    ContentType.AAC,
+    ContentType.AIFF,
+    ContentType.FLAC,
+    ContentType.MP3,
+    ContentType.MPEG,
+    ContentType.OGG,
+    ContentType.OPUS,
+    ContentType.WAV,
+)
+
+# number of seconds before the end of the current item to start (decoding) the next item
+DEFAULT_NEXT_ITEM_PREFETCH = 15
+# a prefetched stream that is not picked up within this number of seconds is discarded
+PREFETCH_MAX_AGE = 600
 
 
 isfile = wrap(os.path.isfile)
 
 
+@dataclass
+class QueuePrefetch:
+    """(Pending) prefetch of the next item of a queue."""
+
+    queue_item_id: str
+    # the shared stream key of the prefetched stream (see _get_shared_stream_key)
+    key: tuple | None = None
+    stream: PrefetchedStream | None = None
+    timer: asyncio.TimerHandle | None = None
+
+
 def parse_pcm_info(content_type: str) -> tuple[int, int, int]:
     """Parse PCM info from a codec/content_type string."""
     params = (
@@ -128,6 +167,15 @@ class StreamsController(CoreController):
         )
         self.manifest.icon = "cast-audio"
         self.announcements: dict[str, str] = {}
+        # decoders (of queue items) shared by concurrent players, keyed by stream key,
+        # along with the (copy of the) streamdetails the decoder works on
+        self._shared_streams: dict[tuple, tuple[SharedStream, StreamDetails]] = {}
+        # prefetch of the next item, keyed by queue id
+        self._prefetches: dict[str, QueuePrefetch] = {}
+        # the (pending) loading of the next item of a flow stream, keyed by queue id
+        self._next_item_tasks: dict[str, asyncio.Task[QueueItem]] = {}
+        # the audio cache is disabled until setup
+        self.audio_cache = AudioCache(os.path.join(self.mass.storage_path, "audio_cache"), 0)
 
     @property
     def base_url(self) -> str:
@@ -191,6 +239,44 @@ class StreamsController(CoreController):
                 label="Fixed/fallback gain adjustment for tracks",
                 category="audio",
             ),
+            ConfigEntry(
+                key=CONF_CROSSFADE_CURVE,
+                type=ConfigEntryType.STRING,
+                default_value=CROSSFADE_CURVE_LINEAR,
+                label="Crossfade curve",
+                description="The shape of the fade between tracks (if crossfade is enabled). "
+                "Equal power keeps the perceived loudness constant during the crossfade.",
+                options=(
+                    ConfigValueOption("Linear", CROSSFADE_CURVE_LINEAR),
+                    ConfigValueOption("Equal power", CROSSFADE_CURVE_EQUAL_POWER),
+                ),
+                category="audio",
+            ),
+            ConfigEntry(
+                key=CONF_AUDIO_CACHE_SIZE,
+                type=ConfigEntryType.INTEGER,
+                range=(0, 100),
+                default_value=2,
+                label="Audio cache size (GB)",
+                description="The audio of (remote) tracks is cached on disk while it is "
+                "being streamed, so repeated plays, seeks and the loudness analysis "
+                "do not need to download the track again. \n"
+                "The least recently played tracks are removed from the cache "
+                "when it exceeds this size. Set to 0 to disable the audio cache.",
+                category="advanced",
+            ),
+            ConfigEntry(
+                key=CONF_NEXT_ITEM_PREFETCH,
+                type=ConfigEntryType.INTEGER,
+                range=(0, 60),
+                default_value=DEFAULT_NEXT_ITEM_PREFETCH,
+                label="Prefetch the next track (seconds)",
+                description="Start the stream of the next track in the queue this number of "
+                "seconds before the current track ends, so slow providers do not cause gaps "
+                "between the tracks. The prefetched audio is buffered in memory. \n"
+                "Set to 0 to disable the prefetch.",
+                category="advanced",
+            ),
             ConfigEntry(
                 key=CONF_PUBLISH_IP,
                 type=ConfigEntryType.STRING,
@@ -239,6 +325,9 @@ class StreamsController(CoreController):
         # copy log level to audio/ffmpeg loggers
         AUDIO_LOGGER.setLevel(self.logger.level)
         FFMPEG_LOGGER.setLevel(self.logger.level)
+        # setup the (on-disk) audio cache
+        self.audio_cache.max_size = config.get_value(CONF_AUDIO_CACHE_SIZE) * 1024**3
+        await self.audio_cache.setup()
         # start the webserver
         self.publish_port = config.get_value(CONF_BIND_PORT)
         self.publish_ip = config.get_value(CONF_PUBLISH_IP)
@@ -272,6 +361,10 @@ class StreamsController(CoreController):
 
     async def close(self) -> None:
         """Cleanup on exit."""
+        for shared_stream, _ in list(self._shared_streams.values()):
+            await shared_stream.stop()
+        for queue_id in list(self._prefetches):
+            self.cancel_prefetch(queue_id)
         await self._server.close()
 
     def resolve_stream_url(
@@ -360,37 +453,83 @@ class StreamsController(CoreController):
         )
         self.mass.player_queues.track_loaded_in_buffer(queue_id, queue_item_id)
 
-        # pick pcm format based on the streamdetails and player capabilities
-        if self.mass.config.get_raw_player_config_value(queue_id, CONF_VOLUME_NORMALIZATION, True):
-            # prefer f32 when volume normalization is enabled
-            bit_depth = 32
-            floating_point = True
+        streamdetails = queue_item.streamdetails
+        pcm_format = self._get_pcm_format(queue_id, streamdetails)
+        # we don't allow the player to buffer too much ahead so we use readrate limiting
+        readrate_input_args = ["-readrate", "1.1", "-readrate_initial_burst", "10"]
+        shareable = streamdetails.media_type != MediaType.RADIO and streamdetails.duration
+        needs_processing = streamdetails.strip_silence_begin or streamdetails.strip_silence_end
+        shared_stream_key = self._get_shared_stream_key(streamdetails, pcm_format)
+        if prefetched_stream := self._pop_prefetched_stream(
+            queue_id, queue_item_id, shared_stream_key
+        ):
+            # the (next) item was prefetched before the player requested it
+            audio_stream = get_ffmpeg_stream(
+                audio_input=prefetched_stream,
+                input_format=pcm_format,
+                output_format=output_format,
+                filter_params=get_player_filter_params(self.mass, queue_player.player_id),
+                extra_input_args=readrate_input_args,
+            )
+        elif shareable and (
+            needs_processing
+            or shared_stream_key in self._shared_streams
+            or queue_player.group_childs
+            or queue_player.synced_to
+        ):
+            # (possibly) concurrent players of the same item share a single decoder,
+            # each player only gets its own encoding stage
+            audio_stream = get_ffmpeg_stream(
+                audio_input=self._get_shared_media_stream(
+                    streamdetails, pcm_format, shared_stream_key
+                ),
+                input_format=pcm_format,
+                output_format=output_format,
+                filter_params=get_player_filter_params(self.mass, queue_player.player_id),
+                extra_input_args=readrate_input_args,
+            )
+        elif shareable:
+            # no python-side processing of the pcm audio is needed (e.g. silence stripping),
+            # so decode, filter and encode in a single ffmpeg process
+            # instead of piping the pcm audio through a second (encoding) ffmpeg process.
+            # The (encoded) stream is still registered as shared stream, so other
+            # (independent) players with the exact same output can join it.
+            output_filter_params = get_player_filter_params(self.mass, queue_player.player_id)
+            audio_stream = self._get_shared_media_stream(
+                streamdetails,
+                pcm_format,
+                (
+                    *shared_stream_key,
+                    output_format.output_format_str,
+                    output_format.sample_rate,
+                    output_format.bit_depth,
+                    output_format.channels,
+                    *output_filter_params,
+                ),
+                output_format=output_format,
+                output_filter_params=output_filter_params,
+                extra_input_args=readrate_input_args,
+            )
         else:
-            bit_depth = queue_item.streamdetails.audio_format.bit_depth
-            floating_point = False
-        pcm_format = AudioFormat(
-            content_type=ContentType.from_bit_depth(bit_depth, floating_point),
-            sample_rate=queue_item.streamdetails.audio_format.sample_rate,
-            bit_depth=bit_depth,
-            channels=2,
-        )
+            audio_stream = get_ffmpeg_stream(
+                audio_input=self.get_media_stream(
+                    streamdetails=streamdetails,
+                    pcm_format=pcm_format,
+                ),
+                input_format=pcm_format,
+                output_format=output_format,
+                filter_params=get_player_filter_params(self.mass, queue_player.player_id),
+                extra_input_args=readrate_input_args,
+            )
         chunk_num = 0
-        async for chunk in get_ffmpeg_stream(
-            audio_input=self.get_media_stream(
-                streamdetails=queue_item.streamdetails,
-                pcm_format=pcm_format,
-            ),
-            input_format=pcm_format,
-            output_format=output_format,
-            filter_params=get_player_filter_params(self.mass, queue_player.player_id),
-            # we don't allow the player to buffer too much ahead so we use readrate limiting
-            extra_input_args=["-readrate", "1.1", "-readrate_initial_burst", "10"],
-        ):
+        async for chunk in audio_stream:
             try:
                 await resp.write(chunk)
                 chunk_num += 1
             except (BrokenPipeError, ConnectionResetError, ConnectionError):
                 break
+        # make sure the ffmpeg process(es) are cleaned up when the player disconnected
+        await audio_stream.aclose()
         if queue_item.streamdetails.stream_error:
             self.logger.error(
                 "Error streaming QueueItem %s (%s) to %s",
@@ -611,6 +750,71 @@ class StreamsController(CoreController):
         # like https hosts and it also offers the pre-announce 'bell'
         return f"{self.base_url}/announcement/{player_id}.{content_type.value}?pre_announce={use_pre_announce}"  # noqa: E501
 
+    def prefetch_queue_item(
+        self,
+        queue_id: str,
+        queue_item: QueueItem,
+        pcm_format: AudioFormat | None = None,
+        remaining_time: float = 0,
+    ) -> None:
+        """
+        Start the (pcm) stream of the (next) queue item into a bounded buffer.
+
+        The prefetch starts the configured number of seconds before the current item ends
+        (remaining_time seconds from now), the buffered stream is picked up
+        when the item is streamed to the player (flow or single item stream).
+        Replaces any existing prefetch of the queue.
+        """
+        self.cancel_prefetch(queue_id)
+        streamdetails = queue_item.streamdetails
+        if (
+            not streamdetails
+            or streamdetails.media_type == MediaType.RADIO
+            or not streamdetails.duration
+        ):
+            return
+        prefetch_seconds = self.mass.config.get_raw_core_config_value(
+            self.domain, CONF_NEXT_ITEM_PREFETCH, DEFAULT_NEXT_ITEM_PREFETCH
+        )
+        if not prefetch_seconds:
+            return
+        prefetch = QueuePrefetch(queue_item.queue_item_id)
+        self._prefetches[queue_id] = prefetch
+        if (delay := remaining_time - prefetch_seconds) > 0:
+            prefetch.timer = self.mass.loop.call_later(
+                delay, self.prefetch_queue_item, queue_id, queue_item, pcm_format
+            )
+            return
+        pcm_format = pcm_format or self._get_pcm_format(queue_id, streamdetails)
+        prefetch.key = self._get_shared_stream_key(streamdetails, pcm_format)
+        # the chunks of the pcm media stream are (about) one second of audio
+        prefetch.stream = PrefetchedStream(
+            self.get_media_stream(streamdetails, pcm_format=pcm_format),
+            max_chunks=prefetch_seconds,
+        )
+        # a prefetch that is not picked up (e.g. the item got skipped) is discarded
+        prefetch.timer = self.mass.loop.call_later(PREFETCH_MAX_AGE, self.cancel_prefetch, queue_id)
+        self.logger.debug("Prefetching %s (%s)", queue_item.name, streamdetails.uri)
+
+    def cancel_prefetch(self, queue_id: str) -> None:
+        """Cancel the (pending) prefetch of the queue (if any)."""
+        if not (prefetch := self._prefetches.pop(queue_id, None)):
+            return
+        if prefetch.timer:
+            prefetch.timer.cancel()
+        if prefetch.stream:
+            self.mass.create_task(prefetch.stream.stop())
+
+    def invalidate_next_item(self, queue_id: str) -> None:
+        """
+        Invalidate the (pre)loaded next item of the queue, e.g. when the queue items changed.
+
+        A flow stream loads the (then) next item again.
+        """
+        if task := self._next_item_tasks.pop(queue_id, None):
+            task.cancel()
+        self.cancel_prefetch(queue_id)
+
     async def get_flow_stream(
         self,
         queue: PlayerQueue,
@@ -641,134 +845,186 @@ class StreamsController(CoreController):
         )
         total_bytes_sent = 0
 
-        while True:
-            # get (next) queue item to stream
-            if queue_track is None:
-                queue_track = start_queue_item
-            else:
-                try:
-                    queue_track = await self.mass.player_queues.load_next_item(queue.queue_id)
-                except QueueEmpty:
-                    break
-
-            if queue_track.streamdetails is None:
-                raise RuntimeError(
-                    "No Streamdetails known for queue item %s", queue_track.queue_item_id
-                )
-
-            self.logger.debug(
-                "Start Streaming queue track: %s (%s) for queue %s",
-                queue_track.streamdetails.uri,
-                queue_track.name,
-                queue.display_name,
-            )
-            self.mass.player_queues.track_loaded_in_buffer(
-                queue.queue_id, queue_track.queue_item_id
-            )
-            # append to play log so the queue controller can work out which track is playing
-            play_log_entry = PlayLogEntry(queue_track.queue_item_id)
-            queue.flow_mode_stream_log.append(play_log_entry)
-
-            # set some basic vars
-            pcm_sample_size = int(pcm_format.sample_rate * (pcm_format.bit_depth / 8) * 2)
-            crossfade_duration = self.mass.config.get_raw_player_config_value(
-                queue.queue_id, CONF_CROSSFADE_DURATION, 10
-            )
-            crossfade_size = int(pcm_sample_size * crossfade_duration)
-            bytes_written = 0
-            buffer = b""
-            # handle incoming audio chunks
-            async for chunk in self.get_media_stream(
-                queue_track.streamdetails,
-                pcm_format=pcm_format,
-            ):
-                # buffer size needs to be big enough to include the crossfade part
-                req_buffer_size = pcm_sample_size * 2 if not use_crossfade else crossfade_size
-
-                # ALWAYS APPEND CHUNK TO BUFFER
-                buffer += chunk
-                del chunk
-                if len(buffer) < req_buffer_size:
-                    # buffer is not full enough, move on
-                    continue
-
-                ####  HANDLE CROSSFADE OF PREVIOUS TRACK AND NEW TRACK
-                if last_fadeout_part:
-                    # perform crossfade
-                    fadein_part = buffer[:crossfade_size]
-                    remaining_bytes = buffer[crossfade_size:]
-                    crossfade_part = await crossfade_pcm_parts(
-                        fadein_part,
-                        last_fadeout_part,
-                        pcm_format=pcm_format,
+        next_item_task: asyncio.Task[QueueItem] | None = None
+        prefetch_seconds = self.mass.config.get_raw_core_config_value(
+            self.domain, CONF_NEXT_ITEM_PREFETCH, DEFAULT_NEXT_ITEM_PREFETCH
+        )
+        try:
+            while True:
+                # get (next) queue item to stream
+                if queue_track is None:
+                    queue_track = start_queue_item
+                else:
+                    try:
+                        if next_item_task and not self._is_next_item_invalidated(
+                            queue.queue_id, next_item_task
+                        ):
+                            # the next item is already loaded (and its stream prefetched)
+                            queue_track = await next_item_task
+                        else:
+                            queue_track = await self.mass.player_queues.load_next_item(
+                                queue.queue_id
+                            )
+                    except QueueEmpty:
+                        break
+                    finally:
+                        self._next_item_tasks.pop(queue.queue_id, None)
+                    next_item_task = None
+
+                if queue_track.streamdetails is None:
+                    raise RuntimeError(
+                        "No Streamdetails known for queue item %s", queue_track.queue_item_id
                     )
-                    # send crossfade_part (as one big chunk)
-                    bytes_written += len(crossfade_part)
-                    yield crossfade_part
 
-                    # also write the leftover bytes from the crossfade action
+                self.logger.debug(
+                    "Start Streaming queue track: %s (%s) for queue %s",
+                    queue_track.streamdetails.uri,
+                    queue_track.name,
+                    queue.display_name,
+                )
+                self.mass.player_queues.track_loaded_in_buffer(
+                    queue.queue_id, queue_track.queue_item_id
+                )
+                # append to play log so the queue controller can work out which track is playing
+                play_log_entry = PlayLogEntry(queue_track.queue_item_id)
+                queue.flow_mode_stream_log.append(play_log_entry)
+
+                # set some basic vars
+                pcm_sample_size = int(pcm_format.sample_rate * (pcm_format.bit_depth / 8) * 2)
+                crossfade_duration = self.mass.config.get_raw_player_config_value(
+                    queue.queue_id, CONF_CROSSFADE_DURATION, 10
+                )
+                crossfade_size = int(pcm_sample_size * crossfade_duration)
+                bytes_written = 0
+                buffer = ByteBuffer()
+                streamdetails = queue_track.streamdetails
+                audio_stream = self._pop_prefetched_stream(
+                    queue.queue_id,
+                    queue_track.queue_item_id,
+                    self._get_shared_stream_key(streamdetails, pcm_format),
+                ) or self.get_media_stream(streamdetails, pcm_format=pcm_format)
+                # handle incoming audio chunks
+                async for chunk in audio_stream:
+                    if next_item_task and self._is_next_item_invalidated(
+                        queue.queue_id, next_item_task
+                    ):
+                        # the queue items changed, the next item needs to be loaded again
+                        next_item_task = None
+                    # start (loading and) streaming the next item before the current one ends
+                    if (
+                        next_item_task is None
+                        and prefetch_seconds
+                        and streamdetails.duration
+                        and streamdetails.seek_position + bytes_written / pcm_sample_size
+                        >= streamdetails.duration - prefetch_seconds
+                    ):
+                        next_item_task = asyncio.create_task(
+                            self._prefetch_next_item(queue.queue_id, queue_track, pcm_format)
+                        )
+                        self._next_item_tasks[queue.queue_id] = next_item_task
+
+                    # buffer size needs to be big enough to include the crossfade part
+                    req_buffer_size = pcm_sample_size * 2 if not use_crossfade else crossfade_size
+
+                    # ALWAYS APPEND CHUNK TO BUFFER
+                    buffer.append(chunk)
+                    del chunk
+                    if len(buffer) < req_buffer_size:
+                        # buffer is not full enough, move on
+                        continue
+
+                    ####  HANDLE CROSSFADE OF PREVIOUS TRACK AND NEW TRACK
+                    if last_fadeout_part:
+                        # perform crossfade
+                        fadein_part = buffer.read(crossfade_size)
+                        remaining_bytes = buffer.read_all()
+                        crossfade_part = await crossfade_pcm_parts(
+                            fadein_part,
+                            last_fadeout_part,
+                            pcm_format=pcm_format,
+                            curve=self.mass.config.get_raw_core_config_value(
+                                self.domain, CONF_CROSSFADE_CURVE, CROSSFADE_CURVE_LINEAR
+                            ),
+                        )
+                        # send crossfade_part (as one big chunk)
+                        bytes_written += len(crossfade_part)
+                        yield crossfade_part
+
+                        # also write the leftover bytes from the crossfade action
+                        if remaining_bytes:
+                            yield remaining_bytes
+                            bytes_written += len(remaining_bytes)
+                            del remaining_bytes
+                        # clear vars
+                        last_fadeout_part = b""
+
+                    #### OTHER: enough data in buffer, feed to output
+                    while len(buffer) > req_buffer_size:
+                        yield buffer.read(pcm_sample_size)
+                        bytes_written += pcm_sample_size
+
+                #### HANDLE END OF TRACK
+                if last_fadeout_part:
+                    # edge case: we did not get enough data to make the crossfade
+                    yield last_fadeout_part
+                    bytes_written += len(last_fadeout_part)
+                    last_fadeout_part = b""
+                if use_crossfade:
+                    # if crossfade is enabled, save fadeout part to pickup for next track
+                    remaining_bytes = buffer.read(len(buffer) - crossfade_size)
+                    last_fadeout_part = buffer.read_all()
                     if remaining_bytes:
                         yield remaining_bytes
                         bytes_written += len(remaining_bytes)
-                        del remaining_bytes
-                    # clear vars
-                    last_fadeout_part = b""
-                    buffer = b""
-
-                #### OTHER: enough data in buffer, feed to output
-                while len(buffer) > req_buffer_size:
-                    yield buffer[:pcm_sample_size]
-                    bytes_written += pcm_sample_size
-                    buffer = buffer[pcm_sample_size:]
-
-            #### HANDLE END OF TRACK
+                    del remaining_bytes
+                elif buffer:
+                    # no crossfade enabled, just yield the buffer last part
+                    bytes_written += len(buffer)
+                    yield buffer.read_all()
+                # make sure the buffer gets cleaned up
+                del buffer
+
+                # update duration details based on the actual pcm data we sent
+                # this also accounts for crossfade and silence stripping
+                seconds_streamed = bytes_written / pcm_sample_size
+                queue_track.streamdetails.seconds_streamed = seconds_streamed
+                queue_track.streamdetails.duration = (
+                    queue_track.streamdetails.seek_position + seconds_streamed
+                )
+                play_log_entry.seconds_streamed = seconds_streamed
+                play_log_entry.duration = queue_track.streamdetails.duration
+                total_bytes_sent += bytes_written
+                self.logger.debug(
+                    "Finished Streaming queue track: %s (%s) on queue %s",
+                    queue_track.streamdetails.uri,
+                    queue_track.name,
+                    queue.display_name,
+                )
+            #### HANDLE END OF QUEUE FLOW STREAM
+            # end of queue flow: make sure we yield the last_fadeout_part
             if last_fadeout_part:
-                # edge case: we did not get enough data to make the crossfade
                 yield last_fadeout_part
-                bytes_written += len(last_fadeout_part)
-                last_fadeout_part = b""
-            if use_crossfade:
-                # if crossfade is enabled, save fadeout part to pickup for next track
-                last_fadeout_part = buffer[-crossfade_size:]
-                remaining_bytes = buffer[:-crossfade_size]
-                if remaining_bytes:
-                    yield remaining_bytes
-                    bytes_written += len(remaining_bytes)
-                del remaining_bytes
-            elif buffer:
-                # no crossfade enabled, just yield the buffer last part
-                bytes_written += len(buffer)
-                yield buffer
-            # make sure the buffer gets cleaned up
-            del buffer
-
-            # update duration details based on the actual pcm data we sent
-            # this also accounts for crossfade and silence stripping
-            seconds_streamed = bytes_written / pcm_sample_size
-            queue_track.streamdetails.seconds_streamed = seconds_streamed
-            queue_track.streamdetails.duration = (
-                queue_track.streamdetails.seek_position + seconds_streamed
-            )
-            play_log_entry.seconds_streamed = seconds_streamed
-            play_log_entry.duration = queue_track.streamdetails.duration
+                # correct seconds streamed/duration
+                last_part_seconds = len(last_fadeout_part) / pcm_sample_size
+                queue_track.streamdetails.seconds_streamed += last_part_seconds
+                queue_track.streamdetails.duration += last_part_seconds
+                del last_fadeout_part
             total_bytes_sent += bytes_written
-            self.logger.debug(
-                "Finished Streaming queue track: %s (%s) on queue %s",
-                queue_track.streamdetails.uri,
-                queue_track.name,
-                queue.display_name,
-            )
-        #### HANDLE END OF QUEUE FLOW STREAM
-        # end of queue flow: make sure we yield the last_fadeout_part
-        if last_fadeout_part:
-            yield last_fadeout_part
-            # correct seconds streamed/duration
-            last_part_seconds = len(last_fadeout_part) / pcm_sample_size
-            queue_track.streamdetails.seconds_streamed += last_part_seconds
-            queue_track.streamdetails.duration += last_part_seconds
-            del last_fadeout_part
-        total_bytes_sent += bytes_written
-        self.logger.info("Finished Queue Flow stream for Queue %s", queue.display_name)
+            self.logger.info("Finished Queue Flow stream for Queue %s", queue.display_name)
+        finally:
+            # cleanup the prefetch of the next item if the flow stream is aborted
+            if next_item_task and self._next_item_tasks.get(queue.queue_id) is next_item_task:
+                self._next_item_tasks.pop(queue.queue_id)
+            if next_item_task and not next_item_task.done():
+                next_item_task.cancel()
+            elif (
+                next_item_task
+                and not next_item_task.cancelled()
+                and not next_item_task.exception()
+                and (prefetch := self._prefetches.get(queue.queue_id))
+                and prefetch.queue_item_id == next_item_task.result().queue_item_id
+            ):
+                self.cancel_prefetch(queue.queue_id)
 
     async def get_announcement_stream(
         self, announcement_url: str, output_format: AudioFormat, use_pre_announce: bool = False
@@ -800,14 +1056,22 @@ class StreamsController(CoreController):
         self,
         streamdetails: StreamDetails,
         pcm_format: AudioFormat,
+        output_format: AudioFormat | None = None,
+        output_filter_params: list[str] | None = None,
+        extra_input_args: list[str] | None = None,
     ) -> AsyncGenerator[tuple[bool, bytes], None]:
-        """Get the audio stream for the given streamdetails as raw pcm chunks."""
+        """
+        Get the audio stream for the given streamdetails as raw pcm chunks.
+
+        If an output_format is given, the audio is encoded to that format by the same
+        ffmpeg process that decodes it (see helpers.audio.get_media_stream).
+        """
         is_radio = streamdetails.media_type == MediaType.RADIO or not streamdetails.duration
         if is_radio:
             streamdetails.seek_position = 0
         # collect all arguments for ffmpeg
         filter_params = []
-        extra_input_args = []
+        extra_input_args = list(extra_input_args or [])
         # handle volume normalization
         enable_volume_normalization = (
             streamdetails.target_loudness is not None
@@ -844,11 +1108,29 @@ class StreamsController(CoreController):
             filter_params.append(f"volume={gain_correct}dB")
 
         # work out audio source for these streamdetails
-        if streamdetails.stream_type == StreamType.CUSTOM:
+        cache_key = get_cache_key(streamdetails)
+        cached_path = None if is_radio else await self.audio_cache.get(cache_key)
+        # the complete audio is written to the audio cache while streaming (if possible)
+        cache_audio = self.audio_cache.enabled and not is_radio and not streamdetails.seek_position
+        if cached_path:
+            self.logger.debug("Using cached audio for %s", streamdetails.uri)
+            audio_source = cached_path
+        elif streamdetails.stream_type == StreamType.CUSTOM:
             audio_source = self.mass.get_provider(streamdetails.provider).get_audio_stream(
                 streamdetails,
                 seek_position=streamdetails.seek_position,
             )
+            if cache_audio:
+                audio_source = self.audio_cache.tee(cache_key, audio_source)
+        elif (
+            cache_audio
+            and streamdetails.stream_type == StreamType.HTTP
+            and streamdetails.path.startswith("http")
+            and streamdetails.audio_format.content_type in PIPEABLE_CONTENT_TYPES
+        ):
+            audio_source = self.audio_cache.tee(
+                cache_key, get_http_stream(self.mass, streamdetails.path, streamdetails)
+            )
         elif streamdetails.stream_type == StreamType.ICY:
             audio_source = get_icy_radio_stream(self.mass, streamdetails.path, streamdetails)
         elif streamdetails.stream_type == StreamType.HLS:
@@ -866,11 +1148,11 @@ class StreamsController(CoreController):
         if streamdetails.decryption_key:
             extra_input_args += ["-decryption_key", streamdetails.decryption_key]
 
-        # handle seek support
+        # handle seek support (a cached file is seeked locally by ffmpeg)
         if (
             streamdetails.seek_position
             and streamdetails.media_type != MediaType.RADIO
-            and streamdetails.stream_type != StreamType.CUSTOM
+            and (streamdetails.stream_type != StreamType.CUSTOM or cached_path)
         ):
             extra_input_args += ["-ss", str(int(streamdetails.seek_position))]
 
@@ -889,9 +1171,144 @@ class StreamsController(CoreController):
             audio_source=audio_source,
             filter_params=filter_params,
             extra_input_args=extra_input_args,
+            output_format=output_format,
+            output_filter_params=output_filter_params,
         ):
             yield chunk
 
+    async def _prefetch_next_item(
+        self, queue_id: str, current_item: QueueItem, pcm_format: AudioFormat
+    ) -> QueueItem:
+        """Load the next item of the (flow mode) queue and prefetch its stream."""
+        next_item = await self.mass.player_queues.load_next_item(
+            queue_id, current_item.queue_item_id
+        )
+        self.prefetch_queue_item(queue_id, next_item, pcm_format)
+        return next_item
+
+    def _is_next_item_invalidated(self, queue_id: str, next_item_task: asyncio.Task) -> bool:
+        """Return if the (pre)loaded next item of a flow stream got invalidated."""
+        return self._next_item_tasks.get(queue_id) is not next_item_task
+
+    def _pop_prefetched_stream(
+        self, queue_id: str, queue_item_id: str, key: tuple
+    ) -> AsyncGenerator[bytes, None] | None:
+        """Return the prefetched pcm stream of the queue item with the given stream key."""
+        if not (prefetch := self._prefetches.get(queue_id)):
+            return None
+        if prefetch.queue_item_id != queue_item_id:
+            # the stream of another item is requested (e.g. the current item again)
+            return None
+        self._prefetches.pop(queue_id)
+        if prefetch.timer:
+            prefetch.timer.cancel()
+        if not prefetch.stream:
+            # the item is requested before its (delayed) prefetch started
+            return None
+        if prefetch.key != key:
+            # the item is requested in another format or from another position
+            self.mass.create_task(prefetch.stream.stop())
+            return None
+        self.logger.debug(
+            "Using prefetched stream (%s chunks buffered)", prefetch.stream.buffered_chunks
+        )
+        return prefetch.stream.read()
+
+    def _get_pcm_format(self, queue_id: str, streamdetails: StreamDetails) -> AudioFormat:
+        """Return the pcm format to decode the (single item) stream of the queue to."""
+        # pick pcm format based on the streamdetails and player capabilities
+        if self.mass.config.get_raw_player_config_value(queue_id, CONF_VOLUME_NORMALIZATION, True):
+            # prefer f32 when volume normalization is enabled
+            bit_depth = 32
+            floating_point = True
+        else:
+            bit_depth = streamdetails.audio_format.bit_depth
+            floating_point = False
+        return AudioFormat(
+            content_type=ContentType.from_bit_depth(bit_depth, floating_point),
+            sample_rate=streamdetails.audio_format.sample_rate,
+            bit_depth=bit_depth,
+            channels=2,
+        )
+
+    def _get_shared_stream_key(
+        self, streamdetails: StreamDetails, pcm_format: AudioFormat
+    ) -> tuple:
+        """Return the key of the (shareable) decoded stream of the given streamdetails."""
+        return (
+            streamdetails.uri,
+            streamdetails.seek_position,
+            streamdetails.fade_in,
+            streamdetails.strip_silence_begin,
+            streamdetails.strip_silence_end,
+            streamdetails.volume_normalization_mode,
+            streamdetails.target_loudness,
+            streamdetails.loudness,
+            pcm_format.content_type,
+            pcm_format.sample_rate,
+            pcm_format.bit_depth,
+            pcm_format.channels,
+        )
+
+    async def _get_shared_media_stream(
+        self,
+        streamdetails: StreamDetails,
+        pcm_format: AudioFormat,
+        key: tuple,
+        output_format: AudioFormat | None = None,
+        output_filter_params: list[str] | None = None,
+        extra_input_args: list[str] | None = None,
+    ) -> AsyncGenerator[bytes, None]:
+        """
+        Get the audio stream for the given streamdetails from a shared decoder.
+
+        Without output_format this is the pcm audio, otherwise the (fused) encoded audio
+        (see `get_media_stream`), the key must reflect all of these arguments.
+        """
+        shared_stream, decoder_streamdetails = self._shared_streams.get(key, (None, None))
+        if shared_stream and shared_stream.joinable:
+            self.logger.debug("Joining shared stream of %s", streamdetails.uri)
+        else:
+            # the decoder works on a copy of the streamdetails as it may outlive this player,
+            # the stream results are copied back to each player's own streamdetails
+            decoder_streamdetails = replace(streamdetails)
+            shared_stream = SharedStream(
+                self.get_media_stream(
+                    decoder_streamdetails,
+                    pcm_format=pcm_format,
+                    extra_input_args=extra_input_args,
+                    output_format=output_format,
+                    output_filter_params=output_filter_params,
+                )
+            )
+            self._shared_streams[key] = (shared_stream, decoder_streamdetails)
+
+            def on_done(_task: asyncio.Task, shared_stream: SharedStream = shared_stream) -> None:
+                if self._shared_streams.get(key, (None,))[0] is shared_stream:
+                    self._shared_streams.pop(key)
+
+            shared_stream.task.add_done_callback(on_done)
+        bytes_received = 0
+        finished = False
+        try:
+            async for chunk in shared_stream.subscribe():
+                bytes_received += len(chunk)
+                yield chunk
+            finished = True
+        finally:
+            if finished and decoder_streamdetails.seconds_streamed:
+                # the decoder (source) is exhausted, so it has the exact number of seconds
+                seconds_streamed = decoder_streamdetails.seconds_streamed
+            elif output_format:
+                # (estimate) for an encoded stream that is aborted midway
+                seconds_streamed = bytes_received / get_chunksize(output_format, 1)
+            else:
+                seconds_streamed = bytes_received / pcm_format.pcm_sample_size
+            streamdetails.seconds_streamed = seconds_streamed
+            streamdetails.stream_error = bytes_received == 0
+            if finished and not streamdetails.seek_position and seconds_streamed:
+                streamdetails.duration = seconds_streamed
+
     def _log_request(self, request: web.Request) -> None:
         """Log request."""
         if not self.logger.isEnabledFor(VERBOSE_LOG_LEVEL):
@@ -11,8 +11,10 @@ import asyncio
 import logging
 import os
 import urllib.parse
+from collections.abc import AsyncIterator, Iterable
 from concurrent import futures
 from contextlib import suppress
+from dataclasses import dataclass, field
 from functools import partial
 from typing import TYPE_CHECKING, Any, Final
 
@@ -21,31 +23,38 @@ from music_assistant_frontend import where as locate_frontend
 
 from music_assistant.common.helpers.util import get_ip
 from music_assistant.common.models.api import (
+    DELTA_EVENT_TYPES,
     CommandMessage,
     ErrorResultMessage,
     MessageType,
     SuccessResultMessage,
 )
 from music_assistant.common.models.config_entries import ConfigEntry, ConfigValueOption
-from music_assistant.common.models.enums import ConfigEntryType
+from music_assistant.common.models.enums import ConfigEntryType, EventType
 from music_assistant.common.models.errors import InvalidCommand
+from music_assistant.common.models.event import MassEvent
 from music_assistant.constants import CONF_BIND_IP, CONF_BIND_PORT, VERBOSE_LOG_LEVEL
 from music_assistant.server.helpers.api import APICommandHandler, parse_arguments
 from music_assistant.server.helpers.audio import get_preview_stream
+from music_assistant.server.helpers.event_coalescer import EventCoalescer
+from music_assistant.server.helpers.state_delta import StateDeltaTracker
 from music_assistant.server.helpers.util import get_ips
 from music_assistant.server.helpers.webserver import Webserver
 from music_assistant.server.models.core_controller import CoreController
 
 if TYPE_CHECKING:
-    from collections.abc import Awaitable
+    from collections.abc import Awaitable, Callable
 
     from music_assistant.common.models.config_entries import ConfigValueType, CoreConfig
-    from music_assistant.common.models.event import MassEvent
 
 DEFAULT_SERVER_PORT = 8095
 CONF_BASE_URL = "base_url"
 CONF_EXPOSE_SERVER = "expose_server"
+CONF_EVENT_COALESCE_WINDOW = "event_coalesce_window"
+DEFAULT_EVENT_COALESCE_WINDOW = 250  # milliseconds
 MAX_PENDING_MSG = 512
+# default number of items per partial result of (large) listings
+DEFAULT_PAGE_SIZE = 500
 CANCELLATION_ERRORS: Final = (asyncio.CancelledError, futures.CancelledError)
 
 
@@ -59,6 +68,9 @@ class WebserverController(CoreController):
         super().__init__(*args, **kwargs)
         self._server = Webserver(self.logger, enable_dynamic_routes=False)
         self.clients: set[WebsocketClientHandler] = set()
+        self._unsub_events: Callable | None = None
+        self._event_coalescer: EventCoalescer | None = None
+        self._state_deltas = StateDeltaTracker()
         self.manifest.name = "Web Server (frontend and api)"
         self.manifest.description = (
             "The built-in webserver that hosts the Music Assistant Websockets API and frontend"
@@ -77,6 +89,17 @@ class WebserverController(CoreController):
     ) -> tuple[ConfigEntry, ...]:
         """Return all Config Entries for this core module (if any)."""
         default_publish_ip = await get_ip()
+        conf_event_coalesce_window = ConfigEntry(
+            key=CONF_EVENT_COALESCE_WINDOW,
+            type=ConfigEntryType.INTEGER,
+            range=(0, 2000),
+            default_value=DEFAULT_EVENT_COALESCE_WINDOW,
+            label="Event coalescing window (ms)",
+            description="Repeated state update events (e.g. of players and queues) within "
+            "this time window are combined and only the latest one is sent to the API clients, "
+            "to reduce the websocket traffic. Set to 0 to send every event right away.",
+            category="advanced",
+        )
         if self.mass.running_as_hass_addon:
             return (
                 ConfigEntry(
@@ -95,6 +118,7 @@ class WebserverController(CoreController):
                     "Use this option on your own risk and never expose this port "
                     "directly to the internet.",
                 ),
+                conf_event_coalesce_window,
             )
 
         # HA supervisor not present: user is responsible for securing the webserver
@@ -132,6 +156,7 @@ class WebserverController(CoreController):
                 "not be adjusted in regular setups.",
                 category="advanced",
             ),
+            conf_event_coalesce_window,
         )
 
     async def setup(self, config: CoreConfig) -> None:
@@ -191,9 +216,17 @@ class WebserverController(CoreController):
             # add assets subdir as static_content
             static_content=("/assets", os.path.join(frontend_dir, "assets"), "assets"),
         )
+        # forward all events to the (subscribed) websocket clients
+        coalesce_window = config.get_value(CONF_EVENT_COALESCE_WINDOW)
+        self._event_coalescer = EventCoalescer(self._send_events, coalesce_window / 1000)
+        self._unsub_events = self.mass.subscribe(self._event_coalescer.add)
 
     async def close(self) -> None:
         """Cleanup on exit."""
+        if self._unsub_events:
+            self._unsub_events()
+        if self._event_coalescer:
+            self._event_coalescer.flush()
         for client in set(self.clients):
             await client.disconnect()
         await self._server.close()
@@ -227,12 +260,66 @@ class WebserverController(CoreController):
         log_data = await self.mass.get_application_log()
         return web.Response(text=log_data, content_type="text/text")
 
+    def resync_state(self) -> dict[str, dict[str, dict[str, Any]]]:
+        """Return the state (and sequence number) of all players and queues for delta clients.
+
+        Any change that was not yet sent is sent to the delta clients first,
+        so the returned state is the (current) base for the next deltas.
+        """
+        if self._event_coalescer:
+            self._event_coalescer.flush()
+        events = [
+            MassEvent(EventType.PLAYER_UPDATED, player.player_id, player)
+            for player in self.mass.players.all(True, True)
+        ]
+        events += [
+            MassEvent(EventType.QUEUE_UPDATED, queue.queue_id, queue)
+            for queue in self.mass.player_queues.all()
+        ]
+        self._send_events(events, delta_only=True)
+        return self._state_deltas.get_state()
+
+    def _send_events(self, events: list[MassEvent], delta_only: bool = False) -> None:
+        """Forward (a batch of) events to all websocket clients that are subscribed to them."""
+        if not (use_deltas := any(x.delta_updates for x in self.clients)):
+            self._state_deltas.clear()
+        for event in events:
+            # the (delta) event is serialized only once, all clients share the same message
+            message: str | None = None
+            delta_message: str | None = None
+            delta = self._state_deltas.get_delta(event) if use_deltas else None
+            for client in self.clients:
+                if not client.is_subscribed(event):
+                    continue
+                if client.delta_updates and event.event in DELTA_EVENT_TYPES:
+                    if delta is None:
+                        # the state did not change since the last (delta) event
+                        continue
+                    if delta_message is None:
+                        delta_message = delta.to_json()
+                    client.send_raw_message(delta_message)
+                    continue
+                if delta_only:
+                    continue
+                if message is None:
+                    message = event.to_json()
+                client.send_raw_message(message)
+
+
+@dataclass
+class ResultFlowControl:
+    """Flow control (credits) of the partial results of a single command."""
+
+    credits: int
+    event: asyncio.Event = field(default_factory=asyncio.Event)
+
 
 class WebsocketClientHandler:
     """Handle an active websocket client connection."""
 
     def __init__(self, webserver: WebserverController, request: web.Request) -> None:
         """Initialize an active connection."""
+        self.webserver = webserver
         self.mass = webserver.mass
         self.request = request
         self.wsock = web.WebSocketResponse(heartbeat=55)
@@ -240,6 +327,16 @@ class WebsocketClientHandler:
         self._handle_task: asyncio.Task | None = None
         self._writer_task: asyncio.Task | None = None
         self._logger = webserver.logger
+        # events are forwarded (by the webserver) once the client is connected,
+        # optionally filtered by event type and object id (see subscribe_events)
+        self._subscribed = False
+        self._event_filter: set[EventType] | None = None
+        self._id_filter: set[str] | None = None
+        # send the player and queue updates as deltas (see delta_updates)
+        self.delta_updates = False
+        # message_id --> task of the commands that are being handled
+        self._command_tasks: dict[str | int, asyncio.Task] = {}
+        self._result_flows: dict[str | int, ResultFlowControl] = {}
 
     async def disconnect(self) -> None:
         """Disconnect client."""
@@ -267,10 +364,7 @@ class WebsocketClientHandler:
         self._send_message(self.mass.get_server_info())
 
         # forward all events to clients
-        def handle_event(event: MassEvent) -> None:
-            self._send_message(event)
-
-        unsub_callback = self.mass.subscribe(handle_event)
+        self._subscribed = True
 
         disconnect_warn = None
 
@@ -303,7 +397,9 @@ class WebsocketClientHandler:
 
         finally:
             # Handle connection shutting down.
-            unsub_callback()
+            self._subscribed = False
+            for task in self._command_tasks.values():
+                task.cancel()
             self._logger.log(VERBOSE_LOG_LEVEL, "Unsubscribed from events")
 
             try:
@@ -326,6 +422,20 @@ class WebsocketClientHandler:
         """Handle an incoming command from the client."""
         self._logger.debug("Handling command %s", msg.command)
 
+        # the event subscription is specific for (and handled by) this connection
+        if msg.command == "subscribe_events":
+            self._handle_subscribe_events(msg)
+            return
+        if msg.command == "delta_updates":
+            self._handle_delta_updates(msg)
+            return
+        if msg.command == "resync_state":
+            self._send_message(SuccessResultMessage(msg.message_id, self.webserver.resync_state()))
+            return
+        if msg.command in ("ack_result", "cancel_result"):
+            self._handle_result_flow(msg)
+            return
+
         # work out handler for the given path/command
         handler = self.mass.command_handlers.get(msg.command)
 
@@ -341,25 +451,89 @@ class WebsocketClientHandler:
             return
 
         # schedule task to handle the command
-        asyncio.create_task(self._run_handler(handler, msg))
+        task = asyncio.create_task(self._run_handler(handler, msg))
+        self._command_tasks[msg.message_id] = task
+        task.add_done_callback(lambda _: self._command_tasks.pop(msg.message_id, None))
+
+    def _handle_subscribe_events(self, msg: CommandMessage) -> None:
+        """Handle the command to (only) receive events of the given types and/or object ids."""
+        args = msg.args or {}
+        event_types = args.get("event_types")
+        object_ids = args.get("object_ids")
+        try:
+            self._event_filter = (
+                None if event_types is None else {EventType(x) for x in event_types}
+            )
+            self._id_filter = None if object_ids is None else {str(x) for x in object_ids}
+        except (TypeError, ValueError) as err:
+            self._send_message(
+                ErrorResultMessage(msg.message_id, InvalidCommand.error_code, str(err))
+            )
+            return
+        self._send_message(SuccessResultMessage(msg.message_id, None))
+
+    def _handle_delta_updates(self, msg: CommandMessage) -> None:
+        """Handle the command to receive the player and queue updates as deltas (or not).
+
+        When enabled, the result holds the state of all players and queues
+        that the deltas should be applied on (see resync_state).
+        """
+        self.delta_updates = bool((msg.args or {}).get("enabled", True))
+        result = self.webserver.resync_state() if self.delta_updates else None
+        self._send_message(SuccessResultMessage(msg.message_id, result))
+
+    def _handle_result_flow(self, msg: CommandMessage) -> None:
+        """Handle the command to acknowledge (or cancel) the partial results of a command.
+
+        No result is sent for these commands.
+        """
+        args = msg.args or {}
+        message_id = args.get("message_id")
+        if msg.command == "cancel_result":
+            if task := self._command_tasks.get(message_id):
+                task.cancel()
+            return
+        if flow := self._result_flows.get(message_id):
+            flow.credits += int(args.get("credits", 1))
+            flow.event.set()
+
+    def is_subscribed(self, event: MassEvent) -> bool:
+        """Return if the given event should be sent to the client."""
+        if not self._subscribed:
+            return False
+        if self._event_filter is not None and event.event not in self._event_filter:
+            return False
+        # events that are not related to a specific object are not filtered by id
+        return (
+            self._id_filter is None or event.object_id is None or event.object_id in self._id_filter
+        )
+
+    def send_raw_message(self, message: str) -> None:
+        """Send an (already serialized) message to the client."""
+        self._send_message(message)
 
     async def _run_handler(self, handler: APICommandHandler, msg: CommandMessage) -> None:
         try:
             args = parse_arguments(handler.signature, handler.type_hints, msg.args)
             result = handler.target(**args)
+            # results are only sent in pages if the client requested so
+            paged = msg.page_size is not None or msg.credits is not None
             if hasattr(result, "__anext__"):
                 # handle async generator (for really large listings)
-                iterator = result
-                result: list[Any] = []
-                async for item in iterator:
-                    result.append(item)
-                    if len(result) >= 500:
-                        self._send_message(
-                            SuccessResultMessage(msg.message_id, result, partial=True)
-                        )
-                        result = []
+                if paged:
+                    await self._send_result_pages(msg, result)
+                    return
+                # (older) clients without paging expect the full result at once
+                result = [item async for item in result]
             elif asyncio.iscoroutine(result):
                 result = await result
+            if (
+                paged
+                and isinstance(result, list | tuple)
+                and len(result) > (msg.page_size or DEFAULT_PAGE_SIZE)
+            ):
+                await self._send_result_pages(msg, result)
+                return
             self._send_message(SuccessResultMessage(msg.message_id, result))
         except Exception as err:
             if self._logger.isEnabledFor(logging.DEBUG):
@@ -370,6 +544,50 @@ class WebsocketClientHandler:
                 ErrorResultMessage(msg.message_id, getattr(err, "error_code", 999), str(err))
             )
 
+    async def _send_result_pages(
+        self, msg: CommandMessage, items: AsyncIterator[Any] | Iterable[Any]
+    ) -> None:
+        """Send the result of a command in partial results (pages), with flow control."""
+        page_size = msg.page_size or DEFAULT_PAGE_SIZE
+        flow: ResultFlowControl | None = None
+        if msg.credits is not None:
+            flow = self._result_flows[msg.message_id] = ResultFlowControl(msg.credits)
+        page: list[Any] = []
+        try:
+            if isinstance(items, AsyncIterator):
+                async for item in items:
+                    page.append(item)
+                    if len(page) >= page_size:
+                        await self._send_result_page(msg, page, flow)
+                        page = []
+            else:
+                for item in items:
+                    page.append(item)
+                    if len(page) >= page_size:
+                        await self._send_result_page(msg, page, flow)
+                        page = []
+            self._send_message(SuccessResultMessage(msg.message_id, page))
+        finally:
+            self._result_flows.pop(msg.message_id, None)
+            if hasattr(items, "aclose"):
+                await items.aclose()
+
+    async def _send_result_page(
+        self, msg: CommandMessage, page: list[Any], flow: ResultFlowControl | None
+    ) -> None:
+        """Send a single partial result, wait until the client (or writer) is ready for it."""
+        if flow is None:
+            # no flow control by the client: prevent that the pending messages
+            # (and the memory they use) pile up if the client is not reading fast enough
+            while self._to_write.qsize() > MAX_PENDING_MSG // 4:
+                await asyncio.sleep(0.05)
+        else:
+            while flow.credits <= 0:
+                flow.event.clear()
+                await flow.event.wait()
+            flow.credits -= 1
+        self._send_message(SuccessResultMessage(msg.message_id, page, partial=True))
+
     async def _writer(self) -> None:
         """Write outgoing messages."""
         # Exceptions if Socket disconnected or cancelled by connection handler
@@ -385,14 +603,14 @@ class WebsocketClientHandler:
                 self._logger.log(VERBOSE_LOG_LEVEL, "Writing: %s", message)
                 await self.wsock.send_str(message)
 
-    def _send_message(self, message: MessageType) -> None:
+    def _send_message(self, message: MessageType | str) -> None:
         """Send a message to the client.
 
         Closes connection if the client is not reading the messages.
 
         Async friendly.
         """
-        _message = message.to_json()
+        _message = message if isinstance(message, str) else message.to_json()
 
         try:
             self._to_write.put_nowait(_message)
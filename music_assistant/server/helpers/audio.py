@@ -4,11 +4,12 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import math
 import os
 import re
 import struct
 import time
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, Iterable
 from io import BytesIO
 from typing import TYPE_CHECKING
 
@@ -41,7 +42,17 @@ from music_assistant.constants import (
     VERBOSE_LOG_LEVEL,
 )
 
+from .audio_cache import get_cache_key
+from .buffer import ByteBuffer
 from .ffmpeg import FFMpeg, get_ffmpeg_stream
+from .pcm import (
+    CROSSFADE_CURVE_EQUAL_POWER,
+    CROSSFADE_CURVE_LINEAR,
+    LoudnessMeter,
+    crossfade_pcm,
+    is_supported_pcm_format,
+    strip_silence_pcm,
+)
 from .playlists import IsHLSPlaylist, PlaylistItem, fetch_playlist, parse_m3u
 from .process import AsyncProcess, check_output, communicate
 from .throttle_retry import BYPASS_THROTTLER
@@ -57,14 +68,22 @@ LOGGER = logging.getLogger(f"{MASS_LOGGER_NAME}.audio")
 
 HTTP_HEADERS = {"User-Agent": "Lavf/60.16.100.MusicAssistant"}
 HTTP_HEADERS_ICY = {**HTTP_HEADERS, "Icy-MetaData": "1"}
+FFMPEG_TIME_REGEX = re.compile(r"size=.*\btime=(\d+):(\d{2}):(\d{2}(?:\.\d+)?)")
+VOLUME_FILTER_REGEX = re.compile(r"^volume=(-?\d+(?:\.\d+)?)dB$")
 
 
 async def crossfade_pcm_parts(
     fade_in_part: bytes,
     fade_out_part: bytes,
     pcm_format: AudioFormat,
+    curve: str = CROSSFADE_CURVE_LINEAR,
 ) -> bytes:
-    """Crossfade two chunks of pcm/raw audio using ffmpeg."""
+    """Crossfade two chunks of pcm/raw audio (in-process if possible, ffmpeg otherwise)."""
+    if is_supported_pcm_format(pcm_format):
+        # the common (flow stream) formats are crossfaded in-process, in a worker thread
+        return await asyncio.to_thread(
+            crossfade_pcm, fade_in_part, fade_out_part, pcm_format, curve
+        )
     sample_size = pcm_format.pcm_sample_size
     # calculate the fade_length from the smallest chunk
     fade_length = min(len(fade_in_part), len(fade_out_part)) / sample_size
@@ -101,7 +120,8 @@ async def crossfade_pcm_parts(
         "-",
         # filter args
         "-filter_complex",
-        f"[0][1]acrossfade=d={fade_length}",
+        f"[0][1]acrossfade=d={fade_length}"
+        + (":c1=qsin:c2=qsin" if curve == CROSSFADE_CURVE_EQUAL_POWER else ""),
         # output args
         "-f",
         pcm_format.content_type.value,
@@ -132,6 +152,34 @@ async def strip_silence(
     audio_data: bytes,
     pcm_format: AudioFormat,
     reverse: bool = False,
+) -> bytes:
+    """Strip silence from begin or end of pcm audio (in-process if possible, ffmpeg otherwise)."""
+    if is_supported_pcm_format(pcm_format):
+        stripped_data = await asyncio.to_thread(
+            strip_silence_pcm, audio_data, pcm_format, reverse=reverse
+        )
+    else:
+        stripped_data = await _strip_silence_ffmpeg(audio_data, pcm_format, reverse=reverse)
+
+    # return stripped audio
+    bytes_stripped = len(audio_data) - len(stripped_data)
+    if LOGGER.isEnabledFor(VERBOSE_LOG_LEVEL):
+        seconds_stripped = round(bytes_stripped / pcm_format.pcm_sample_size, 2)
+        location = "end" if reverse else "begin"
+        LOGGER.log(
+            VERBOSE_LOG_LEVEL,
+            "stripped %s seconds of silence from %s of pcm audio. bytes stripped: %s",
+            seconds_stripped,
+            location,
+            bytes_stripped,
+        )
+    return stripped_data
+
+
+async def _strip_silence_ffmpeg(
+    audio_data: bytes,
+    pcm_format: AudioFormat,
+    reverse: bool = False,
 ) -> bytes:
     """Strip silence from begin or end of pcm audio using ffmpeg."""
     args = ["ffmpeg", "-hide_banner", "-loglevel", "quiet"]
@@ -161,19 +209,6 @@ async def strip_silence(
     # output args
     args += ["-f", pcm_format.content_type.value, "-"]
     _returncode, stripped_data, _stderr = await communicate(args, audio_data)
-
-    # return stripped audio
-    bytes_stripped = len(audio_data) - len(stripped_data)
-    if LOGGER.isEnabledFor(VERBOSE_LOG_LEVEL):
-        seconds_stripped = round(bytes_stripped / pcm_format.pcm_sample_size, 2)
-        location = "end" if reverse else "begin"
-        LOGGER.log(
-            VERBOSE_LOG_LEVEL,
-            "stripped %s seconds of silence from %s of pcm audio. bytes stripped: %s",
-            seconds_stripped,
-            location,
-            bytes_stripped,
-        )
     return stripped_data
 
 
@@ -279,40 +314,77 @@ async def get_media_stream(
     audio_source: AsyncGenerator[bytes, None] | str,
     filter_params: list[str] | None = None,
     extra_input_args: list[str] | None = None,
+    output_format: AudioFormat | None = None,
+    output_filter_params: list[str] | None = None,
 ) -> AsyncGenerator[bytes, None]:
-    """Get PCM audio stream for given media details."""
+    """
+    Get PCM audio stream for given media details.
+
+    If an output_format is given, the audio is decoded, filtered and encoded to that format
+    in a single ffmpeg process (with the output_filter_params appended to the filters),
+    which skips all python-side processing of the (PCM) audio such as silence stripping.
+    """
     logger = LOGGER.getChild("media_stream")
     logger.debug("start media stream for: %s", streamdetails.uri)
-    strip_silence_begin = streamdetails.strip_silence_begin
-    strip_silence_end = streamdetails.strip_silence_end
+    filter_params = filter_params or []
+    fused = output_format is not None
+    strip_silence_begin = streamdetails.strip_silence_begin and not fused
+    strip_silence_end = streamdetails.strip_silence_end and not fused
     if streamdetails.fade_in:
         filter_params.append("afade=type=in:start_time=0:duration=3")
         strip_silence_begin = False
+    if fused:
+        # the (player specific) output filters expect the channel layout of the pcm format
+        channel_layout = "mono" if pcm_format.channels == 1 else "stereo"
+        filter_params.append(f"aformat=channel_layouts={channel_layout}")
+        filter_params += output_filter_params or []
     bytes_sent = 0
     chunk_number = 0
-    buffer: bytes = b""
+    buffer = ByteBuffer()
     finished = False
+    # measure the loudness (in-process) on the pcm audio that is streamed anyway
+    loudness_meter: LoudnessMeter | None = None
+    gain_correct = 0.0
+    if (
+        streamdetails.loudness is None
+        and streamdetails.volume_normalization_mode != VolumeNormalizationMode.DISABLED
+        and streamdetails.media_type != MediaType.RADIO
+        and not streamdetails.seek_position
+        and not fused
+        and is_supported_pcm_format(pcm_format)
+        and not any(x.startswith("loudnorm") for x in filter_params)
+    ):
+        loudness_meter = LoudnessMeter(pcm_format)
+        # a fixed gain correction is subtracted from the measurement
+        for filter_param in filter_params:
+            if match := VOLUME_FILTER_REGEX.match(filter_param):
+                gain_correct += float(match.group(1))
 
     ffmpeg_proc = FFMpeg(
         audio_input=audio_source,
         input_format=streamdetails.audio_format,
-        output_format=pcm_format,
+        output_format=output_format or pcm_format,
         filter_params=filter_params,
         extra_input_args=extra_input_args,
         collect_log_history=True,
     )
     try:
         await ffmpeg_proc.start()
-        async for chunk in TimedAsyncGenerator(
-            ffmpeg_proc.iter_chunked(pcm_format.pcm_sample_size), 300
-        ):
-            # for radio streams we just yield all chunks directly
-            if streamdetails.media_type == MediaType.RADIO:
+        iterator = (
+            ffmpeg_proc.iter_any()
+            if fused
+            else ffmpeg_proc.iter_chunked(pcm_format.pcm_sample_size)
+        )
+        async for chunk in TimedAsyncGenerator(iterator, 300):
+            # for radio and (fused) encoded streams we just yield all chunks directly
+            if streamdetails.media_type == MediaType.RADIO or fused:
                 yield chunk
                 bytes_sent += len(chunk)
                 continue
 
             chunk_number += 1
+            if loudness_meter:
+                await asyncio.to_thread(loudness_meter.process, chunk)
             # determine buffer size dynamically
             if chunk_number < 5 and strip_silence_begin:
                 req_buffer_size = int(pcm_format.pcm_sample_size * 4)
@@ -322,7 +394,7 @@ async def get_media_stream(
                 req_buffer_size = int(pcm_format.pcm_sample_size * 2)
 
             # always append to buffer
-            buffer += chunk
+            buffer.append(chunk)
             del chunk
 
             if len(buffer) < req_buffer_size:
@@ -332,32 +404,32 @@ async def get_media_stream(
             if chunk_number == 5 and strip_silence_begin:
                 # strip silence from begin of audio
                 chunk = await strip_silence(  # noqa: PLW2901
-                    mass, buffer, pcm_format=pcm_format
+                    mass, buffer.read_all(), pcm_format=pcm_format
                 )
                 bytes_sent += len(chunk)
                 yield chunk
-                buffer = b""
                 continue
 
             #### OTHER: enough data in buffer, feed to output
             while len(buffer) > req_buffer_size:
-                yield buffer[: pcm_format.pcm_sample_size]
+                yield buffer.read(pcm_format.pcm_sample_size)
                 bytes_sent += pcm_format.pcm_sample_size
-                buffer = buffer[pcm_format.pcm_sample_size :]
 
         # end of audio/track reached
-        if strip_silence_end and buffer:
+        remaining_bytes = buffer.read_all()
+        if strip_silence_end and remaining_bytes:
             # strip silence from end of audio
-            buffer = await strip_silence(
+            remaining_bytes = await strip_silence(
                 mass,
-                buffer,
+                remaining_bytes,
                 pcm_format=pcm_format,
                 reverse=True,
             )
         # send remaining bytes in buffer
-        bytes_sent += len(buffer)
-        yield buffer
-        del buffer
+        if remaining_bytes or not fused:
+            bytes_sent += len(remaining_bytes)
+            yield remaining_bytes
+        del remaining_bytes
         finished = True
 
     finally:
@@ -370,7 +442,12 @@ async def get_media_stream(
             logger.warning("Stream error on %s", streamdetails.uri)
         else:
             # try to determine how many seconds we've streamed
-            seconds_streamed = bytes_sent / pcm_format.pcm_sample_size if bytes_sent else 0
+            if fused:
+                # the size of the encoded audio says nothing about its duration,
+                # so we use the output time reported by ffmpeg when it exits
+                seconds_streamed = parse_ffmpeg_time(ffmpeg_proc.log_history) or 0
+            else:
+                seconds_streamed = bytes_sent / pcm_format.pcm_sample_size
             logger.debug(
                 "stream %s (with code %s) for %s - seconds streamed: %s",
                 "finished" if finished else "aborted",
@@ -392,8 +469,13 @@ async def get_media_stream(
         ):
             # if dynamic volume normalization is enabled and the entire track is streamed
             # the loudnorm filter will output the measuremeet in the log,
+            # otherwise it is measured in-process on the streamed (pcm) audio,
             # so we can use those directly instead of analyzing the audio
-            if loudness_details := parse_loudnorm(" ".join(ffmpeg_proc.log_history)):
+            loudness_details = parse_loudnorm(" ".join(ffmpeg_proc.log_history))
+            if loudness_details is None and loudness_meter:
+                loudness = loudness_meter.get_integrated_loudness()
+                loudness_details = None if loudness is None else loudness - gain_correct
+            if loudness_details is not None:
                 logger.debug(
                     "Loudness measurement for %s: %s dB",
                     streamdetails.uri,
@@ -862,6 +944,15 @@ def get_player_filter_params(
     return filter_params
 
 
+def parse_ffmpeg_time(log_lines: Iterable[str]) -> float | None:
+    """Parse the (output) time in seconds from the (last) stats line in the ffmpeg log."""
+    for line in reversed(list(log_lines)):
+        if match := FFMPEG_TIME_REGEX.search(line):
+            hours, minutes, seconds = match.groups()
+            return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+    return None
+
+
 def parse_loudnorm(raw_stderr: bytes | str) -> float | None:
     """Parse Loudness measurement from ffmpeg stderr output."""
     stderr_data = raw_stderr.decode() if isinstance(raw_stderr, bytes) else raw_stderr
@@ -893,13 +984,38 @@ async def analyze_loudness(
 
     logger = LOGGER.getChild("analyze_loudness")
     logger.debug("Start analyzing audio for %s", streamdetails.uri)
+    if (loudness := await measure_loudness(mass, streamdetails)) is None:
+        return
+    streamdetails.loudness = loudness
+    await mass.music.set_loudness(
+        streamdetails.item_id,
+        streamdetails.provider,
+        loudness,
+        media_type=streamdetails.media_type,
+    )
+    logger.debug(
+        "Integrated loudness of %s is: %s",
+        streamdetails.uri,
+        loudness,
+    )
+
 
+async def measure_loudness(
+    mass: MusicAssistant,
+    streamdetails: StreamDetails,
+    extra_input_args: list[str] | None = None,
+) -> float | None:
+    """Measure the EBU R128 integrated loudness of the media item's audio with ffmpeg."""
     extra_input_args = [
+        *(extra_input_args or []),
         # limit to 10 minutes to reading too much in memory
         "-t",
         "600",
     ]
-    if streamdetails.stream_type == StreamType.CUSTOM:
+    if cached_path := await mass.streams.audio_cache.get(get_cache_key(streamdetails)):
+        # the audio was cached while streaming, no need to download it again
+        audio_source = cached_path
+    elif streamdetails.stream_type == StreamType.CUSTOM:
         audio_source = mass.get_provider(streamdetails.provider).get_audio_stream(
             streamdetails,
         )
@@ -929,26 +1045,32 @@ async def analyze_loudness(
             loudness_str = (
                 log_lines_str.split("Integrated loudness")[1].split("I:")[1].split("LUFS")[0]
             )
-            loudness = float(loudness_str.strip())
+            return float(loudness_str.strip())
         except (IndexError, ValueError, AttributeError):
             LOGGER.warning(
                 "Could not determine integrated loudness of %s - %s",
                 streamdetails.uri,
                 log_lines_str or "received empty value",
             )
-        else:
-            streamdetails.loudness = loudness
-            await mass.music.set_loudness(
-                streamdetails.item_id,
-                streamdetails.provider,
-                loudness,
-                media_type=streamdetails.media_type,
-            )
-            logger.debug(
-                "Integrated loudness of %s is: %s",
-                streamdetails.uri,
-                loudness,
-            )
+            return None
+
+
+def get_album_loudness(track_measurements: Iterable[tuple[float, float]]) -> float | None:
+    """
+    Calculate the album loudness from the (loudness, duration) of its tracks.
+
+    The album loudness is the duration weighted mean of the (mean square) power of
+    the tracks, which approximates the integrated loudness of the album as a whole.
+    """
+    total_duration = 0.0
+    total_power = 0.0
+    for loudness, duration in track_measurements:
+        duration = max(duration or 0, 1)  # noqa: PLW2901
+        total_duration += duration
+        total_power += duration * 10 ** (loudness / 10)
+    if not total_duration:
+        return None
+    return round(10 * math.log10(total_power / total_duration), 2)
 
 
 def _get_normalization_mode(
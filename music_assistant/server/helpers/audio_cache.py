@@ -0,0 +1,158 @@
+"""Size-bounded on-disk cache of (remote) audio files."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import os
+from collections import OrderedDict
+from collections.abc import AsyncGenerator
+from contextlib import suppress
+from typing import TYPE_CHECKING
+from uuid import uuid4
+
+import aiofiles
+
+from music_assistant.constants import MASS_LOGGER_NAME
+
+if TYPE_CHECKING:
+    from music_assistant.common.models.streamdetails import StreamDetails
+
+LOGGER = logging.getLogger(f"{MASS_LOGGER_NAME}.audio_cache")
+
+# the (tee'd) audio is written to disk in blocks of this size
+WRITE_BLOCK_SIZE = 512 * 1024
+TEMP_FILE_SUFFIX = ".part"
+
+
+def get_cache_key(streamdetails: StreamDetails) -> str:
+    """Return the audio cache key for the (source) audio of the given streamdetails."""
+    # a provider may deliver the same item in another format (e.g. another quality)
+    fmt = streamdetails.audio_format
+    return (
+        f"{streamdetails.uri}|{fmt.content_type.value}|{fmt.sample_rate}"
+        f"|{fmt.bit_depth}|{fmt.channels}"
+    )
+
+
+def _scan_cache_dir(cache_dir: str) -> list[tuple[str, int, float]]:
+    """Return the (filename, size, mtime) of all cached files, cleanup leftover temp files."""
+    os.makedirs(cache_dir, exist_ok=True)
+    result = []
+    with os.scandir(cache_dir) as entries:
+        for entry in entries:
+            if not entry.is_file():
+                continue
+            if entry.name.endswith(TEMP_FILE_SUFFIX):
+                # leftover of an interrupted download
+                os.remove(entry.path)
+                continue
+            stat = entry.stat()
+            result.append((entry.name, stat.st_size, stat.st_mtime))
+    return result
+
+
+class AudioCache:
+    """
+    Size-bounded, least recently used (LRU) evicted, on-disk cache of audio files.
+
+    The audio of (remote) streams is written to disk while it is streamed (see `tee`),
+    once the stream has been fully consumed the file is added to the cache so later plays,
+    seeks and the loudness analysis can read the (complete) file from local disk.
+    """
+
+    def __init__(self, cache_dir: str, max_size: int) -> None:
+        """Initialize AudioCache."""
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        # filename --> size in bytes, in order of last access
+        self._entries: OrderedDict[str, int] = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        """Return if the cache is enabled."""
+        return self.max_size > 0
+
+    @property
+    def size(self) -> int:
+        """Return the total size in bytes of all cached files."""
+        return sum(self._entries.values())
+
+    async def setup(self) -> None:
+        """Load the existing cache entries from disk."""
+        if not self.enabled:
+            return
+        entries = await asyncio.to_thread(_scan_cache_dir, self.cache_dir)
+        for filename, size, _ in sorted(entries, key=lambda x: x[2]):
+            self._entries[filename] = size
+        # the max size may have been lowered since the last run
+        await self._evict()
+        LOGGER.debug(
+            "Loaded %s cached audio files (%s MB)", len(self._entries), self.size // 1024**2
+        )
+
+    def get_filename(self, key: str) -> str:
+        """Return the (hashed) cache filename for the given key."""
+        return hashlib.sha256(key.encode()).hexdigest()
+
+    async def get(self, key: str) -> str | None:
+        """Return the path of the cached file for the given key (if any)."""
+        filename = self.get_filename(key)
+        if filename not in self._entries:
+            return None
+        path = os.path.join(self.cache_dir, filename)
+        try:
+            # the modification time is used to restore the LRU order at startup
+            await asyncio.to_thread(os.utime, path)
+        except FileNotFoundError:
+            self._entries.pop(filename, None)
+            return None
+        self._entries.move_to_end(filename)
+        return path
+
+    async def tee(
+        self, key: str, audio_source: AsyncGenerator[bytes, None]
+    ) -> AsyncGenerator[bytes, None]:
+        """Yield the chunks of the audio source while writing them to the cache."""
+        filename = self.get_filename(key)
+        temp_path = os.path.join(self.cache_dir, f"{filename}.{uuid4().hex}{TEMP_FILE_SUFFIX}")
+        completed = False
+        file_size = 0
+        buffer = bytearray()
+        try:
+            async with aiofiles.open(temp_path, "wb") as _file:
+                async for chunk in audio_source:
+                    yield chunk
+                    if file_size > self.max_size:
+                        # too large to cache, just pass the audio
+                        continue
+                    buffer += chunk
+                    file_size += len(chunk)
+                    if len(buffer) >= WRITE_BLOCK_SIZE:
+                        await _file.write(buffer)
+                        buffer.clear()
+                await _file.write(buffer)
+            completed = file_size <= self.max_size
+        finally:
+            if completed and file_size:
+                await asyncio.to_thread(
+                    os.replace, temp_path, os.path.join(self.cache_dir, filename)
+                )
+                self._entries[filename] = file_size
+                self._entries.move_to_end(filename)
+                LOGGER.debug("Added %s to the audio cache (%s bytes)", key, file_size)
+                await self._evict()
+            else:
+                with suppress(FileNotFoundError):
+                    await asyncio.to_thread(os.remove, temp_path)
+
+    async def _evict(self) -> None:
+        """Remove the least recently used files until the cache fits its max size."""
+        total_size = self.size
+        while total_size > self.max_size and self._entries:
+            filename, size = self._entries.popitem(last=False)
+            total_size -= size
+            with suppress(FileNotFoundError):
+                await asyncio.to_thread(os.remove, os.path.join(self.cache_dir, filename))
+            LOGGER.debug("Evicted %s from the audio cache", filename)
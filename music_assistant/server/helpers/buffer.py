@@ -0,0 +1,57 @@
+"""Buffer for (PCM) audio chunks."""
+
+from __future__ import annotations
+
+
+class ByteBuffer:
+    """
+    FIFO byte buffer with amortized O(1) appends and reads.
+
+    Appending to and slicing immutable bytes copies the whole (remaining) buffer for each
+    chunk, which adds up for large (e.g. crossfade) buffers of hi-res PCM audio.
+    This buffer appends in-place to a bytearray and only advances a read offset when data
+    is read from the front, the consumed space is reclaimed once it exceeds the unread
+    part of the buffer so every byte is moved at most a (small) constant number of times.
+    """
+
+    __slots__ = ("_data", "_offset")
+
+    def __init__(self, data: bytes = b"") -> None:
+        """Initialize buffer."""
+        self._data = bytearray(data)
+        self._offset = 0
+
+    def __len__(self) -> int:
+        """Return the number of (unread) bytes in the buffer."""
+        return len(self._data) - self._offset
+
+    def __bool__(self) -> bool:
+        """Return if the buffer holds any (unread) bytes."""
+        return len(self._data) > self._offset
+
+    def append(self, chunk: bytes) -> None:
+        """Append a chunk of bytes to the end of the buffer."""
+        if self._offset and self._offset >= len(self._data) - self._offset:
+            # reclaim the space of the consumed bytes
+            del self._data[: self._offset]
+            self._offset = 0
+        self._data += chunk
+
+    def read(self, size: int) -> bytes:
+        """Read (and remove) up to size bytes from the front of the buffer."""
+        end = min(self._offset + max(size, 0), len(self._data))
+        with memoryview(self._data) as view:
+            chunk = bytes(view[self._offset : end])
+        self._offset = end
+        if self._offset == len(self._data):
+            self.clear()
+        return chunk
+
+    def read_all(self) -> bytes:
+        """Read (and remove) all bytes from the buffer."""
+        return self.read(len(self))
+
+    def clear(self) -> None:
+        """Clear the buffer."""
+        self._data.clear()
+        self._offset = 0
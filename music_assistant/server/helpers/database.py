@@ -7,6 +7,8 @@ import logging
 import os
 import time
 from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
 from sqlite3 import OperationalError
 from typing import TYPE_CHECKING, Any
 
@@ -15,12 +17,35 @@ import aiosqlite
 from music_assistant.constants import MASS_LOGGER_NAME
 
 if TYPE_CHECKING:
-    from collections.abc import AsyncGenerator, Mapping
+    from collections.abc import AsyncGenerator, Iterable, Mapping
 
 LOGGER = logging.getLogger(f"{MASS_LOGGER_NAME}.database")
 
 ENABLE_DEBUG = os.environ.get("PYTHONDEVMODE") == "1"
 
+# max number of (deferred) writes before a write batch commits
+DEFAULT_BATCH_SIZE = 500
+# max number of seconds a write batch may keep changes uncommitted
+DEFAULT_BATCH_MAX_AGE = 5.0
+# number of (read-only) connections used for read queries
+DEFAULT_READ_POOL_SIZE = 3
+# number of (prepared) statements cached per connection
+STATEMENT_CACHE_SIZE = 512
+
+# pragmas applied to all connections
+CONNECTION_PRAGMAS = (
+    "PRAGMA cache_size=-16000;",  # 16MB page cache
+    "PRAGMA mmap_size=268435456;",  # 256MB memory mapped I/O
+    "PRAGMA temp_store=MEMORY;",
+)
+# pragmas applied to the (single) writer connection
+WRITER_PRAGMAS = (
+    # WAL allows the readers to run concurrently with the writer
+    "PRAGMA journal_mode=WAL;",
+    # in WAL mode NORMAL is safe from corruption and avoids an fsync for each commit
+    "PRAGMA synchronous=NORMAL;",
+)
+
 
 @asynccontextmanager
 async def debug_query(sql_query: str, query_params: dict | None = None):
@@ -67,27 +92,67 @@ def query_params(query: str, params: dict[str, Any] | None) -> tuple[str, dict[s
     return (result_query, result_params)
 
 
+@dataclass
+class WriteBatch:
+    """Handle for an active write batch on a DatabaseConnection."""
+
+    active: bool = True
+
+
 class DatabaseConnection:
     """Class that holds the (connection to the) database with some convenience helper functions."""
 
     _db: aiosqlite.Connection
 
-    def __init__(self, db_path: str) -> None:
+    def __init__(
+        self,
+        db_path: str,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        batch_max_age: float = DEFAULT_BATCH_MAX_AGE,
+        read_pool_size: int = DEFAULT_READ_POOL_SIZE,
+    ) -> None:
         """Initialize class."""
         self.db_path = db_path
+        self.batch_size = batch_size
+        self.batch_max_age = batch_max_age
+        self.read_pool_size = read_pool_size
+        self._readers: list[aiosqlite.Connection] = []
+        self._read_pool: asyncio.Queue[aiosqlite.Connection] = asyncio.Queue()
+        self._write_batch: ContextVar[WriteBatch | None] = ContextVar(
+            f"write_batch_{db_path}", default=None
+        )
+        self._pending_writes = 0
+        self._last_commit = time.monotonic()
 
     async def setup(self) -> None:
         """Perform async initialization."""
-        self._db = await aiosqlite.connect(self.db_path)
+        self._db = await aiosqlite.connect(self.db_path, cached_statements=STATEMENT_CACHE_SIZE)
         self._db.row_factory = aiosqlite.Row
+        for pragma in (*WRITER_PRAGMAS, *CONNECTION_PRAGMAS):
+            await self.execute(pragma)
         await self.execute("PRAGMA analysis_limit=10000;")
         await self.execute("PRAGMA optimize;")
         await self.commit()
+        # setup the pool of read-only connections
+        for _ in range(self.read_pool_size):
+            reader = await aiosqlite.connect(
+                f"file:{self.db_path}?mode=ro", uri=True, cached_statements=STATEMENT_CACHE_SIZE
+            )
+            reader.row_factory = aiosqlite.Row
+            for pragma in CONNECTION_PRAGMAS:
+                await reader.execute(pragma)
+            self._readers.append(reader)
+            self._read_pool.put_nowait(reader)
 
     async def close(self) -> None:
         """Close db connection on exit."""
+        for reader in self._readers:
+            await reader.close()
+        self._readers.clear()
+        self._read_pool = asyncio.Queue()
         await self.execute("PRAGMA optimize;")
-        await self.commit()
+        await self._commit()
+        # closing the (last) writer connection also checkpoints the WAL file
         await self._db.close()
 
     async def get_rows(
@@ -106,8 +171,8 @@ class DatabaseConnection:
             sql_query += f" ORDER BY {order_by}"
         if limit:
             sql_query += f" LIMIT {limit} OFFSET {offset}"
-        async with debug_query(sql_query):
-            return await self._db.execute_fetchall(sql_query, match)
+        async with debug_query(sql_query), self._read_connection() as conn:
+            return await conn.execute_fetchall(sql_query, match)
 
     async def get_rows_from_query(
         self,
@@ -120,8 +185,8 @@ class DatabaseConnection:
         if limit:
             query += f" LIMIT {limit} OFFSET {offset}"
         _query, _params = query_params(query, params)
-        async with debug_query(_query, _params):
-            return await self._db.execute_fetchall(_query, _params)
+        async with debug_query(_query, _params), self._read_connection() as conn:
+            return await conn.execute_fetchall(_query, _params)
 
     async def get_count_from_query(
         self,
@@ -131,8 +196,8 @@ class DatabaseConnection:
         """Get row count for given custom query."""
         query = f"SELECT count() FROM ({query})"
         _query, _params = query_params(query, params)
-        async with debug_query(_query):
-            async with self._db.execute(_query, _params) as cursor:
+        async with debug_query(_query), self._read_connection() as conn:
+            async with conn.execute(_query, _params) as cursor:
                 if result := await cursor.fetchone():
                     return result[0]
             return 0
@@ -143,8 +208,8 @@ class DatabaseConnection:
     ) -> int:
         """Get row count for given table."""
         query = f"SELECT count(*) FROM {table}"
-        async with debug_query(query):
-            async with self._db.execute(query) as cursor:
+        async with debug_query(query), self._read_connection() as conn:
+            async with conn.execute(query) as cursor:
                 if result := await cursor.fetchone():
                     return result[0]
             return 0
@@ -153,14 +218,18 @@ class DatabaseConnection:
         """Search table by column."""
         sql_query = f"SELECT * FROM {table} WHERE {table}.{column} LIKE :search"
         params = {"search": f"%{search}%"}
-        async with debug_query(sql_query, params):
-            return await self._db.execute_fetchall(sql_query, params)
+        async with debug_query(sql_query, params), self._read_connection() as conn:
+            return await conn.execute_fetchall(sql_query, params)
 
     async def get_row(self, table: str, match: dict[str, Any]) -> Mapping | None:
         """Get single row for given table where column matches keys/values."""
         sql_query = f"SELECT * FROM {table} WHERE "
         sql_query += " AND ".join(f"{table}.{x} = :{x}" for x in match)
-        async with debug_query(sql_query, match), self._db.execute(sql_query, match) as cursor:
+        async with (
+            debug_query(sql_query, match),
+            self._read_connection() as conn,
+            conn.execute(sql_query, match) as cursor,
+        ):
             return await cursor.fetchone()
 
     async def insert(
@@ -177,9 +246,29 @@ class DatabaseConnection:
             sql_query = f'INSERT INTO {table}({",".join(keys)})'
         sql_query += f' VALUES ({",".join(f":{x}" for x in keys)})'
         row_id = await self._db.execute_insert(sql_query, values)
-        await self._db.commit()
+        await self.commit()
         return row_id[0]
 
+    async def insert_many(
+        self,
+        table: str,
+        values: Iterable[dict[str, Any]],
+        allow_replace: bool = False,
+    ) -> None:
+        """Insert multiple rows (with the same keys) in given table using a single statement."""
+        values = list(values)
+        if not values:
+            return
+        keys = tuple(values[0].keys())
+        if allow_replace:
+            sql_query = f'INSERT OR REPLACE INTO {table}({",".join(keys)})'
+        else:
+            sql_query = f'INSERT INTO {table}({",".join(keys)})'
+        sql_query += f' VALUES ({",".join(f":{x}" for x in keys)})'
+        async with debug_query(sql_query):
+            await self._db.executemany(sql_query, values)
+        await self.commit()
+
     async def insert_or_replace(self, table: str, values: dict[str, Any]) -> Mapping:
         """Insert or replace data in given table."""
         return await self.insert(table=table, values=values, allow_replace=True)
@@ -195,7 +284,7 @@ class DatabaseConnection:
         sql_query = f'UPDATE {table} SET {",".join(f"{x}=:{x}" for x in keys)} WHERE '
         sql_query += " AND ".join(f"{x} = :{x}" for x in match)
         await self.execute(sql_query, {**match, **values})
-        await self._db.commit()
+        await self.commit()
         # return updated item
         return await self.get_row(table, match)
 
@@ -210,45 +299,135 @@ class DatabaseConnection:
         elif query:
             sql_query += query
         await self.execute(sql_query, match)
-        await self._db.commit()
+        await self.commit()
 
     async def delete_where_query(self, table: str, query: str | None = None) -> None:
         """Delete data in given table using given where clausule."""
         sql_query = f"DELETE FROM {table} WHERE {query}"
         await self.execute(sql_query)
-        await self._db.commit()
+        await self.commit()
 
     async def execute(self, query: str, values: dict | None = None) -> Any:
         """Execute command on the database."""
         return await self._db.execute(query, values)
 
     async def commit(self) -> None:
-        """Commit the current transaction."""
-        return await self._db.commit()
+        """
+        Commit the current transaction.
+
+        When called from within an active write batch (see `batch`), the commit is deferred
+        until the batch exceeds its size or age limits or until the batch is finished.
+        """
+        if (write_batch := self._write_batch.get()) and write_batch.active:
+            self._pending_writes += 1
+            if (
+                self._pending_writes < self.batch_size
+                and time.monotonic() - self._last_commit < self.batch_max_age
+            ):
+                return
+        await self._commit()
+
+    @asynccontextmanager
+    async def batch(self) -> AsyncGenerator[WriteBatch, None]:
+        """
+        Batch all writes done within this context into (bounded) transactions.
+
+        Writes are committed once the batch reaches `batch_size` pending writes,
+        once the last commit is more than `batch_max_age` seconds ago
+        and when the (outermost) batch context exits.
+        Nested batches (also in child tasks) simply join the outer batch.
+        Writes from outside the batch context are committed right away,
+        which also commits any pending writes of the batch.
+        """
+        if (write_batch := self._write_batch.get()) and write_batch.active:
+            # join the already active (outer) batch
+            yield write_batch
+            return
+        write_batch = WriteBatch()
+        token = self._write_batch.set(write_batch)
+        try:
+            yield write_batch
+        finally:
+            write_batch.active = False
+            self._write_batch.reset(token)
+            if self._pending_writes:
+                await self._commit()
+
+    @asynccontextmanager
+    async def _read_connection(self) -> AsyncGenerator[aiosqlite.Connection, None]:
+        """Acquire a connection from the read pool to execute a read query on."""
+        if not self._readers or ((write_batch := self._write_batch.get()) and write_batch.active):
+            # reads from within a write batch must be able to see its (uncommitted) writes
+            yield self._db
+            return
+        conn = await self._read_pool.get()
+        try:
+            yield conn
+        finally:
+            self._read_pool.put_nowait(conn)
+
+    async def _commit(self) -> None:
+        """Commit the current transaction (and all pending writes)."""
+        self._pending_writes = 0
+        self._last_commit = time.monotonic()
+        await self._db.commit()
 
     async def iter_items(
         self,
         table: str,
         match: dict | None = None,
     ) -> AsyncGenerator[Mapping, None]:
-        """Iterate all items within a table."""
-        limit: int = 500
-        offset: int = 0
+        """Iterate all items within a table (in rowid order)."""
+        sql_query = f"SELECT rowid AS _rowid, * FROM {table}"
+        if match is not None:
+            sql_query += " WHERE " + " AND ".join(f"{x} = :{x}" for x in match)
+        async for item in self.iter_rows_from_query(sql_query, match, key_column="_rowid"):
+            yield item
+
+    async def iter_rows_from_query(
+        self,
+        query: str,
+        params: dict | None = None,
+        key_column: str = "item_id",
+        limit: int = 500,
+    ) -> AsyncGenerator[Mapping, None]:
+        """
+        Iterate all rows for given custom query, using keyset pagination.
+
+        The query must return the (unique, not null) key_column, which is used to seek
+        to the next page. Unlike offset based pagination, this does not skip rows
+        when (already visited) rows are deleted while iterating.
+        """
+        params = params or {}
+        sql_query = (
+            f"SELECT * FROM ({query}) WHERE {key_column} > :_keyset_cursor "
+            f"ORDER BY {key_column} LIMIT {limit}"
+        )
+        cursor: Any = -1
         while True:
-            next_items = await self.get_rows(
-                table=table,
-                match=match,
-                offset=offset,
-                limit=limit,
-            )
+            _query, _params = query_params(sql_query, {**params, "_keyset_cursor": cursor})
+            async with debug_query(_query, _params), self._read_connection() as conn:
+                next_items = await conn.execute_fetchall(_query, _params)
             for item in next_items:
                 yield item
             if len(next_items) < limit:
                 break
+            cursor = next_items[-1][key_column]
             await asyncio.sleep(0)  # yield to eventloop
-            offset += limit
 
     async def vacuum(self) -> None:
         """Run vacuum command on database."""
         await self._db.execute("VACUUM")
-        await self._db.commit()
+        await self._commit()
+
+    async def incremental_vacuum(self, max_pages: int = 1000) -> int:
+        """
+        Release (up to max_pages) unused pages of the database file.
+
+        Requires auto_vacuum=INCREMENTAL, returns the number of remaining unused pages.
+        """
+        await self._commit()
+        # executescript steps the pragma to completion (execute only releases a single page)
+        await self._db.executescript(f"PRAGMA incremental_vacuum({max_pages});")
+        async with self._db.execute("PRAGMA freelist_count;") as cursor:
+            return (await cursor.fetchone())[0]
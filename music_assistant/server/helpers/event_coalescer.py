@@ -0,0 +1,79 @@
+"""Coalescing of (high frequency) events into batches."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable, Iterable
+from typing import TYPE_CHECKING
+
+from music_assistant.common.models.enums import EventType
+
+if TYPE_CHECKING:
+    from music_assistant.common.models.event import MassEvent
+
+# state update events that only need to be delivered with their latest data
+COALESCE_EVENT_TYPES = (
+    EventType.PLAYER_UPDATED,
+    EventType.QUEUE_UPDATED,
+    EventType.QUEUE_ITEMS_UPDATED,
+    EventType.QUEUE_TIME_UPDATED,
+    EventType.MEDIA_ITEM_UPDATED,
+    EventType.SYNC_TASKS_UPDATED,
+    EventType.LOUDNESS_ANALYSIS_UPDATED,
+)
+
+
+class EventCoalescer:
+    """
+    Coalesce repeated events and deliver them in batches.
+
+    Events of the coalesced types are held back for (at most) `window` seconds,
+    a repeated event for the same (event type, object id) within that window replaces
+    the pending one, so only the latest data is delivered (at the position of the first).
+    Any other event flushes the pending batch first and is then delivered right away,
+    so the order in which (the latest state of) events are delivered is retained.
+    """
+
+    def __init__(
+        self,
+        callback: Callable[[list[MassEvent]], None],
+        window: float,
+        event_types: Iterable[EventType] = COALESCE_EVENT_TYPES,
+    ) -> None:
+        """Initialize EventCoalescer."""
+        self.callback = callback
+        self.window = window
+        self.event_types = frozenset(event_types)
+        self._pending: dict[tuple[EventType, str | None], MassEvent] = {}
+        self._timer: asyncio.TimerHandle | None = None
+        # metrics
+        self.events_received = 0
+        self.events_delivered = 0
+
+    def add(self, event: MassEvent) -> None:
+        """Add an event to be delivered."""
+        self.events_received += 1
+        if self.window <= 0 or event.event not in self.event_types:
+            self.flush()
+            self._deliver([event])
+            return
+        # (re)assigning an existing key keeps its position in the dict
+        self._pending[(event.event, event.object_id)] = event
+        if self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.window, self.flush)
+
+    def flush(self) -> None:
+        """Deliver all pending events."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        events = list(self._pending.values())
+        self._pending = {}
+        self._deliver(events)
+
+    def _deliver(self, events: list[MassEvent]) -> None:
+        """Deliver a batch of events."""
+        self.events_delivered += len(events)
+        self.callback(events)
@@ -6,6 +6,7 @@ import asyncio
 import logging
 from collections import deque
 from collections.abc import AsyncGenerator
+from contextlib import suppress
 from typing import TYPE_CHECKING
 
 from music_assistant.common.helpers.global_cache import get_global_cache_value
@@ -84,6 +85,16 @@ class FFMpeg(AsyncProcess):
             return
         if self._stdin_task and not self._stdin_task.done():
             self._stdin_task.cancel()
+        if (
+            self._logger_task
+            and not self._logger_task.done()
+            and self.proc.stdout
+            and self.proc.stdout.at_eof()
+        ):
+            # the process is exiting on its own, let the log reader consume the last lines
+            # (e.g. the final stats and the loudnorm measurement) before closing the pipes
+            with suppress(TimeoutError):
+                await asyncio.wait_for(self._logger_task, 5)
         await super().close(send_signal)
 
     async def _log_reader_task(self) -> None:
@@ -296,10 +307,14 @@ def get_ffmpeg_args(  # noqa: PLR0915
             *filter_params,
         ]
 
+    # the loudnorm filter (in dynamic mode) upsamples to 192kHz,
+    # so its output always needs to be resampled to the output sample rate
+    loudnorm = any(x.startswith("loudnorm") for x in filter_params)
     # determine if we need to do resampling
     if (
         input_format.sample_rate != output_format.sample_rate
         or input_format.bit_depth > output_format.bit_depth
+        or loudnorm
     ):
         # prefer resampling with libsoxr due to its high quality
         if libsoxr_support:
@@ -308,7 +323,7 @@ def get_ffmpeg_args(  # noqa: PLR0915
             resample_filter = "aresample=resampler=swr"
 
         # sample rate conversion
-        if input_format.sample_rate != output_format.sample_rate:
+        if input_format.sample_rate != output_format.sample_rate or loudnorm:
             resample_filter += f":osr={output_format.sample_rate}"
 
         # bit depth conversion: apply dithering when going down to 16 bits
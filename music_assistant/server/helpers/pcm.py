@@ -0,0 +1,280 @@
+"""Helpers to process raw PCM audio in-process (with numpy)."""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from music_assistant.common.models.enums import ContentType
+
+if TYPE_CHECKING:
+    from music_assistant.common.models.media_items import AudioFormat
+
+# numpy dtypes of the (little endian) PCM formats that can be processed in-process,
+# 24 bits PCM has no numpy dtype and is (un)packed from/to 32 bits integers
+PCM_DTYPES: dict[ContentType, str] = {
+    ContentType.PCM_S16LE: "<i2",
+    ContentType.PCM_S24LE: "<i4",
+    ContentType.PCM_S32LE: "<i4",
+    ContentType.PCM_F32LE: "<f4",
+    ContentType.PCM_F64LE: "<f8",
+}
+
+CROSSFADE_CURVE_LINEAR = "linear"
+CROSSFADE_CURVE_EQUAL_POWER = "equal_power"
+
+# BS.1770 loudness: blocks of 400 ms with 75% overlap, built from 100 ms sub blocks
+LOUDNESS_SUB_BLOCKS = 4
+LOUDNESS_ABSOLUTE_GATE = -70.0
+LOUDNESS_RELATIVE_GATE = -10.0
+
+
+def is_supported_pcm_format(pcm_format: AudioFormat) -> bool:
+    """Return if the given PCM format can be processed in-process."""
+    return pcm_format.content_type in PCM_DTYPES and pcm_format.channels > 0
+
+
+def get_frame_size(pcm_format: AudioFormat) -> int:
+    """Return the size in bytes of a single (multi channel) PCM frame."""
+    return pcm_format.channels * (pcm_format.bit_depth // 8)
+
+
+def pcm_to_float(data: bytes, pcm_format: AudioFormat) -> np.ndarray:
+    """Convert raw PCM audio to a (frames, channels) array of floats in the range -1..1."""
+    content_type = pcm_format.content_type
+    if content_type == ContentType.PCM_S24LE:
+        # unpack 3 byte samples into the upper bytes of 32 bits integers
+        frame_size = get_frame_size(pcm_format)
+        raw = np.frombuffer(data, dtype=np.uint8, count=len(data) - len(data) % frame_size)
+        packed = np.zeros((len(raw) // 3, 4), dtype=np.uint8)
+        packed[:, 1:] = raw.reshape(-1, 3)
+        samples = packed.view("<i4").reshape(-1)
+    else:
+        itemsize = np.dtype(PCM_DTYPES[content_type]).itemsize
+        count = len(data) // itemsize
+        samples = np.frombuffer(data, dtype=PCM_DTYPES[content_type], count=count)
+    samples = samples[: len(samples) - len(samples) % pcm_format.channels]
+    if content_type in (ContentType.PCM_F32LE, ContentType.PCM_F64LE):
+        result = samples.astype(np.float64 if content_type == ContentType.PCM_F64LE else np.float32)
+    elif content_type == ContentType.PCM_S16LE:
+        result = samples.astype(np.float32) / 2**15
+    else:
+        # 24 bits samples are stored in the upper bytes so both are scaled as 32 bits
+        result = samples.astype(np.float64) / 2**31
+    return result.reshape(-1, pcm_format.channels)
+
+
+def float_to_pcm(samples: np.ndarray, pcm_format: AudioFormat) -> bytes:
+    """Convert an array of floats in the range -1..1 to raw PCM audio."""
+    content_type = pcm_format.content_type
+    samples = samples.reshape(-1)
+    if content_type in (ContentType.PCM_F32LE, ContentType.PCM_F64LE):
+        return samples.astype(PCM_DTYPES[content_type]).tobytes()
+    if content_type == ContentType.PCM_S16LE:
+        return np.clip(np.rint(samples * 2**15), -(2**15), 2**15 - 1).astype("<i2").tobytes()
+    int_samples = np.clip(np.rint(samples.astype(np.float64) * 2**31), -(2**31), 2**31 - 1)
+    int_samples = int_samples.astype("<i4")
+    if content_type == ContentType.PCM_S32LE:
+        return int_samples.tobytes()
+    # 24 bits: round to (and keep) the upper 3 bytes of the 32 bits integers
+    int_samples = np.clip((int_samples.astype(np.int64) + 2**7) >> 8, -(2**23), 2**23 - 1)
+    return int_samples.astype("<i4").view(np.uint8).reshape(-1, 4)[:, :3].tobytes()
+
+
+def get_fade_curves(num_frames: int, curve: str) -> tuple[np.ndarray, np.ndarray]:
+    """Return the (fade out, fade in) gain curves for a crossfade of the given length."""
+    position = (np.arange(num_frames, dtype=np.float64) + 0.5) / num_frames
+    if curve == CROSSFADE_CURVE_EQUAL_POWER:
+        return np.cos(position * np.pi / 2), np.sin(position * np.pi / 2)
+    return 1 - position, position
+
+
+def crossfade_pcm(
+    fade_in_part: bytes,
+    fade_out_part: bytes,
+    pcm_format: AudioFormat,
+    curve: str = CROSSFADE_CURVE_LINEAR,
+) -> bytes:
+    """
+    Crossfade two chunks of PCM audio (blocking).
+
+    The crossfade length is determined by the smallest chunk, the remainder of the largest
+    chunk is kept as-is, just like ffmpeg's acrossfade filter.
+    """
+    frame_size = get_frame_size(pcm_format)
+    crossfade_size = min(len(fade_out_part), len(fade_in_part))
+    crossfade_size -= crossfade_size % frame_size
+    if not crossfade_size:
+        return fade_out_part + fade_in_part
+    # only the overlapping part needs to be converted, the remainders are passed as-is
+    fade_out_end = len(fade_out_part) - len(fade_out_part) % frame_size
+    fade_out = pcm_to_float(fade_out_part[fade_out_end - crossfade_size : fade_out_end], pcm_format)
+    fade_in = pcm_to_float(fade_in_part[:crossfade_size], pcm_format)
+    fade_out_gain, fade_in_gain = get_fade_curves(len(fade_out), curve)
+    fade_out *= fade_out_gain[:, None].astype(fade_out.dtype)
+    fade_out += fade_in * fade_in_gain[:, None].astype(fade_in.dtype)
+    return b"".join(
+        (
+            fade_out_part[: fade_out_end - crossfade_size],
+            float_to_pcm(fade_out, pcm_format),
+            fade_in_part[crossfade_size:],
+        )
+    )
+
+
+def strip_silence_pcm(
+    data: bytes,
+    pcm_format: AudioFormat,
+    reverse: bool = False,
+    threshold: float = 0.02,
+    keep_silence: float = 0.1,
+    skip: float = 0.2,
+    window: float = 0.02,
+) -> bytes:
+    """
+    Strip silence from the begin (or end if reverse) of PCM audio (blocking).
+
+    Mimics ffmpeg's atrim and silenceremove filters: the first (or last) `skip` seconds are
+    always removed, then the audio up to the first window in which the RMS level of any
+    channel exceeds the threshold is removed, except for the last `keep_silence` seconds.
+    """
+    frame_size = get_frame_size(pcm_format)
+    data = data[: len(data) - len(data) % frame_size]
+    skip_size = int(skip * pcm_format.sample_rate) * frame_size
+    data = data[: len(data) - skip_size] if reverse else data[skip_size:]
+    num_frames = len(data) // frame_size
+    window_frames = max(1, int(window * pcm_format.sample_rate))
+    # scan in blocks so only the (usually short) silent part needs to be analyzed
+    block_frames = max(window_frames, pcm_format.sample_rate // 4)
+    pos = 0
+    while pos < num_frames:
+        # each block includes the preceding window to calculate the level of the first frames
+        seg_start = max(0, pos - window_frames + 1)
+        seg_end = min(num_frames, pos + block_frames)
+        if reverse:
+            segment = data[
+                (num_frames - seg_end) * frame_size : (num_frames - seg_start) * frame_size
+            ]
+            samples = pcm_to_float(segment, pcm_format)[::-1]
+        else:
+            samples = pcm_to_float(data[seg_start * frame_size : seg_end * frame_size], pcm_format)
+        # moving (per channel) RMS level over the window, using a cumulative sum of the squares
+        squares = np.cumsum(np.square(samples, dtype=np.float64), axis=0)
+        squares[window_frames:] -= squares[:-window_frames].copy()
+        window_sizes = np.minimum(np.arange(seg_start + 1, seg_end + 1), window_frames)[:, None]
+        levels = (squares / window_sizes)[pos - seg_start :]
+        if len(loud_frames := np.flatnonzero(np.any(levels > threshold**2, axis=1))):
+            start = max(0, pos + int(loud_frames[0]) - int(keep_silence * pcm_format.sample_rate))
+            if reverse:
+                return data[: len(data) - start * frame_size]
+            return data[start * frame_size :]
+        pos = seg_end
+    # all silence
+    return b""
+
+
+@lru_cache
+def get_k_weighting_filter(sample_rate: int) -> np.ndarray:
+    """
+    Return the (truncated) impulse response of the BS.1770 K-weighting filter.
+
+    The pre-filter (high shelf) and RLB filter (high pass) biquads are derived for the
+    sample rate like libebur128 does. Their impulse response decays within 100 ms, so the
+    filter can be applied (statefully) as a FIR filter with a (vectorized) FFT convolution.
+    """
+    # stage 1: high shelf filter, models the acoustic effect of the head
+    k = np.tan(np.pi * 1681.974450955533 / sample_rate)
+    q = 0.7071752369554196
+    vh = 10 ** (3.999843853973347 / 20)
+    vb = vh**0.4996667741545416
+    a0 = 1 + k / q + k * k
+    shelf_b = (
+        (vh + vb * k / q + k * k) / a0,
+        2 * (k * k - vh) / a0,
+        (vh - vb * k / q + k * k) / a0,
+    )
+    shelf_a = (2 * (k * k - 1) / a0, (1 - k / q + k * k) / a0)
+    # stage 2: (revised low-frequency B-curve) high pass filter
+    k = np.tan(np.pi * 38.13547087602444 / sample_rate)
+    q = 0.5003270373238773
+    a0 = 1 + k / q + k * k
+    highpass_b = (1.0, -2.0, 1.0)
+    highpass_a = (2 * (k * k - 1) / a0, (1 - k / q + k * k) / a0)
+    response = np.zeros(max(1, sample_rate // 10))
+    response[0] = 1.0
+    for b, a in ((shelf_b, shelf_a), (highpass_b, highpass_a)):
+        x1 = x2 = y1 = y2 = 0.0
+        for i, x in enumerate(response.tolist()):
+            y = b[0] * x + b[1] * x1 + b[2] * x2 - a[0] * y1 - a[1] * y2
+            x2, x1, y2, y1 = x1, x, y1, y
+            response[i] = y
+    return response
+
+
+class LoudnessMeter:
+    """
+    Incremental BS.1770 (EBU R128) integrated loudness meter for PCM audio.
+
+    The (K-weighted) power of the audio is collected per 100 ms while the audio is
+    processed chunk by chunk, the gated integrated loudness is calculated from those when
+    requested. All channels are weighted equally (which is correct for mono and stereo).
+    """
+
+    def __init__(self, pcm_format: AudioFormat) -> None:
+        """Initialize LoudnessMeter."""
+        self.pcm_format = pcm_format
+        self._filter = get_k_weighting_filter(pcm_format.sample_rate)
+        self._filter_fft: tuple[int, np.ndarray] | None = None
+        # the last input frames, needed to filter the start of the next chunk
+        self._history = np.zeros((len(self._filter) - 1, pcm_format.channels))
+        # (channel summed) squares of the filtered frames that do not fill a sub block yet
+        self._pending = np.zeros(0)
+        self._sub_block_size = max(1, pcm_format.sample_rate // 10)
+        self._sub_block_powers: list[float] = []
+
+    @property
+    def seconds_processed(self) -> float:
+        """Return the number of seconds of audio that has been measured."""
+        return len(self._sub_block_powers) / 10
+
+    def process(self, data: bytes) -> None:
+        """Process a chunk of PCM audio (blocking)."""
+        samples = pcm_to_float(data, self.pcm_format).astype(np.float64)
+        if not len(samples):
+            return
+        signal = np.concatenate((self._history, samples))
+        self._history = signal[len(signal) - len(self._history) :]
+        # FIR filter (valid part of the linear convolution) using the FFT
+        fft_size = 1 << (len(signal) - 1).bit_length()
+        if not self._filter_fft or self._filter_fft[0] != fft_size:
+            self._filter_fft = (fft_size, np.fft.rfft(self._filter, fft_size))
+        filtered = np.fft.irfft(
+            np.fft.rfft(signal, fft_size, axis=0) * self._filter_fft[1][:, None],
+            fft_size,
+            axis=0,
+        )[len(self._filter) - 1 : len(signal)]
+        self._pending = np.concatenate((self._pending, np.square(filtered).sum(axis=1)))
+        num_blocks = len(self._pending) // self._sub_block_size
+        if num_blocks:
+            blocks_size = num_blocks * self._sub_block_size
+            powers = self._pending[:blocks_size].reshape(num_blocks, -1).mean(axis=1)
+            self._sub_block_powers += powers.tolist()
+            self._pending = self._pending[blocks_size:]
+
+    def get_integrated_loudness(self) -> float | None:
+        """Return the (gated) integrated loudness in LUFS, None if there is no (loud) audio."""
+        if len(self._sub_block_powers) < LOUDNESS_SUB_BLOCKS:
+            return None
+        sub_blocks = np.array(self._sub_block_powers)
+        blocks = np.convolve(sub_blocks, np.full(LOUDNESS_SUB_BLOCKS, 1 / LOUDNESS_SUB_BLOCKS))
+        blocks = blocks[LOUDNESS_SUB_BLOCKS - 1 : len(sub_blocks)]
+        with np.errstate(divide="ignore"):
+            loudness = -0.691 + 10 * np.log10(blocks)
+        gated = loudness > LOUDNESS_ABSOLUTE_GATE
+        if not gated.any():
+            return None
+        relative_gate = -0.691 + 10 * np.log10(blocks[gated].mean()) + LOUDNESS_RELATIVE_GATE
+        gated &= loudness > relative_gate
+        return round(float(-0.691 + 10 * np.log10(blocks[gated].mean())), 2)
@@ -0,0 +1,69 @@
+"""Read ahead of an audio stream into a bounded buffer."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import AsyncGenerator
+from contextlib import suppress
+
+from music_assistant.constants import MASS_LOGGER_NAME
+
+LOGGER = logging.getLogger(f"{MASS_LOGGER_NAME}.prefetch")
+
+
+class PrefetchedStream:
+    """
+    Audio source that is read ahead in the background into a bounded buffer.
+
+    Used to start the (provider connection and) decoding of the next queue item before
+    the current one ends, so its first chunks are available right away when it is played.
+    Once `max_chunks` are buffered the source is no longer read until chunks are consumed.
+    A prefetched stream can be consumed only once.
+    """
+
+    def __init__(self, audio_source: AsyncGenerator[bytes, None], max_chunks: int) -> None:
+        """Initialize PrefetchedStream."""
+        self.audio_source = audio_source
+        # None marks the end of the stream
+        self._queue: asyncio.Queue[bytes | None] = asyncio.Queue(max(max_chunks, 1))
+        self._error: Exception | None = None
+        self.consumed = False
+        self.task = asyncio.create_task(self._runner())
+
+    @property
+    def buffered_chunks(self) -> int:
+        """Return the number of chunks that are ready to be consumed."""
+        return self._queue.qsize()
+
+    async def stop(self) -> None:
+        """Stop reading the source (and discard the buffered chunks)."""
+        if not self.task.done():
+            self.task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self.task
+
+    async def read(self) -> AsyncGenerator[bytes, None]:
+        """Read the (buffered and remaining) chunks of the stream."""
+        if self.consumed:
+            raise RuntimeError("Prefetched stream is already consumed")
+        self.consumed = True
+        try:
+            while (chunk := await self._queue.get()) is not None:
+                yield chunk
+            if self._error:
+                raise self._error
+        finally:
+            await self.stop()
+
+    async def _runner(self) -> None:
+        """Read the audio source into the buffer."""
+        try:
+            async for chunk in self.audio_source:
+                await self._queue.put(chunk)
+        except Exception as err:
+            LOGGER.debug("Error in prefetched stream: %s", str(err) or err.__class__.__name__)
+            self._error = err
+        finally:
+            await self.audio_source.aclose()
+        await self._queue.put(None)
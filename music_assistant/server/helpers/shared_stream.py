@@ -0,0 +1,249 @@
+"""Fan-out of a single (decoded) audio stream to multiple subscribers."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import deque
+from collections.abc import AsyncGenerator
+from contextlib import suppress
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import Any
+
+from music_assistant.common.models.errors import AudioError
+from music_assistant.constants import MASS_LOGGER_NAME
+
+LOGGER = logging.getLogger(f"{MASS_LOGGER_NAME}.shared_stream")
+
+
+class LagPolicy(StrEnum):
+    """Policy for a subscriber that lags too much behind on a shared stream."""
+
+    # drop the (oldest) chunks that are no longer buffered for the subscriber
+    DROP = "drop"
+    # skip ahead to the most recent chunk of the stream (resync)
+    SKIP_AHEAD = "skip_ahead"
+    # disconnect the subscriber (its read raises an AudioError)
+    DISCONNECT = "disconnect"
+
+
+@dataclass
+class _Subscriber:
+    """Read position of a single subscriber."""
+
+    # absolute index of the next chunk to read
+    cursor: int = 0
+    dropped: bool = False
+    skipped_chunks: int = 0
+    # the subscriber did not keep up and is not waited for until it caught up
+    lagging: bool = False
+
+
+class SharedStream:
+    """
+    Shared (multi-subscriber) stream of a single audio source.
+
+    All subscribers read from the same buffer of chunks, each at its own position.
+    The source is read ahead at most `backlog` chunks of the slowest subscriber,
+    a subscriber that does not keep up within the timeout is no longer waited for and
+    the lag policy is applied once it lags more than `history` + `backlog` chunks behind.
+    The first `history` chunks are retained so subscribers can (late) join and catch up
+    from the start of the stream, once that history is discarded the stream can no
+    longer be joined (unless `late_join` is set, then subscribers join at the most recent
+    chunk from that point).
+    A live stream is read regardless of subscribers (e.g. a readrate limited radio-like
+    stream), (new) subscribers join at the most recent chunk and it can always be joined.
+    """
+
+    def __init__(
+        self,
+        audio_source: AsyncGenerator[bytes, None],
+        backlog: int = 10,
+        history: int = 30,
+        timeout: float = 5,
+        lag_policy: LagPolicy = LagPolicy.DISCONNECT,
+        live: bool = False,
+        late_join: bool = False,
+    ) -> None:
+        """Initialize SharedStream."""
+        self.audio_source = audio_source
+        self.backlog = backlog
+        self.history = history
+        self.timeout = timeout
+        self.lag_policy = lag_policy
+        self.live = live
+        self.late_join = late_join
+        self._chunks: deque[bytes] = deque()
+        # absolute index of the first chunk in the buffer
+        self._first_index = 0
+        self._subscribers: list[_Subscriber] = []
+        self._condition = asyncio.Condition()
+        self._joinable = True
+        self._eof = False
+        # metrics
+        self._bytes_read = 0
+        self._skipped_chunks = 0
+        self._disconnected = 0
+        self.task = asyncio.create_task(self._runner())
+
+    @property
+    def done(self) -> bool:
+        """Return if the stream is done (source exhausted or stopped)."""
+        return self.task.done()
+
+    @property
+    def joinable(self) -> bool:
+        """Return if a (new) subscriber can still join the stream."""
+        return (self._joinable or self.late_join) and not self.done
+
+    @property
+    def num_subscribers(self) -> int:
+        """Return the number of active subscribers."""
+        return len(self._subscribers)
+
+    @property
+    def metrics(self) -> dict[str, Any]:
+        """Return the (runtime) metrics of the stream."""
+        return {
+            "subscribers": self.num_subscribers,
+            "chunks_read": self._end_index,
+            "bytes_read": self._bytes_read,
+            "buffered_chunks": len(self._chunks),
+            "max_lag": max((self._end_index - x.cursor for x in self._subscribers), default=0),
+            "skipped_chunks": self._skipped_chunks
+            + sum(x.skipped_chunks for x in self._subscribers),
+            "disconnected": self._disconnected,
+        }
+
+    @property
+    def _end_index(self) -> int:
+        """Return the absolute index of the chunk that will be read next from the source."""
+        return self._first_index + len(self._chunks)
+
+    async def stop(self) -> None:
+        """Stop/cancel the stream."""
+        if self.done:
+            return
+        self.task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self.task
+
+    def subscribe(self) -> AsyncGenerator[bytes, None]:
+        """Subscribe to the stream, starting at the first (or most recent if live) chunk."""
+        if not self.joinable:
+            raise AudioError("Stream can no longer be joined")
+        # the history is no longer retained for a late join, start at the most recent chunk
+        at_live_edge = self.live or not self._joinable
+        subscriber = _Subscriber(cursor=self._end_index if at_live_edge else 0)
+        self._subscribers.append(subscriber)
+        return self._read(subscriber)
+
+    async def _read(self, subscriber: _Subscriber) -> AsyncGenerator[bytes, None]:
+        """Read the chunks of the stream for the given subscriber."""
+        async with self._condition:
+            # wake up the runner as it may be waiting for (the first) subscriber
+            self._condition.notify_all()
+        try:
+            while True:
+                async with self._condition:
+                    await self._condition.wait_for(
+                        lambda: subscriber.dropped
+                        or subscriber.cursor < self._end_index
+                        or self._eof
+                    )
+                    if subscriber.dropped:
+                        raise AudioError("Subscriber could not keep up with the stream")
+                    if subscriber.cursor >= self._end_index:
+                        # source exhausted (or stopped) and everything has been read
+                        break
+                    chunk = self._chunks[subscriber.cursor - self._first_index]
+                    subscriber.cursor += 1
+                    if subscriber.cursor == self._end_index:
+                        subscriber.lagging = False
+                    self._trim()
+                    # wake up the runner as it may be waiting for the slowest subscriber
+                    self._condition.notify_all()
+                yield chunk
+        finally:
+            with suppress(ValueError):
+                self._subscribers.remove(subscriber)
+            self._skipped_chunks += subscriber.skipped_chunks
+            self._trim()
+
+    def _trim(self) -> None:
+        """Discard the chunks that have been read by all subscribers (and are not history)."""
+        if self._joinable and not self.live and self._end_index > self.history:
+            # the history is no longer retained so subscribers can no longer join
+            self._joinable = False
+        if self._joinable and not self.live:
+            return
+        min_cursor = min((x.cursor for x in self._subscribers), default=self._end_index)
+        while self._first_index < min_cursor:
+            self._chunks.popleft()
+            self._first_index += 1
+
+    def _is_ready_for_chunk(self) -> bool:
+        """Return if all (up-to-date) subscribers have room for a new chunk."""
+        if not self._subscribers:
+            return self.live
+        return all(
+            self._end_index - x.cursor < self.backlog
+            for x in self._subscribers
+            if not x.lagging and self._end_index - x.cursor <= self.backlog
+        )
+
+    async def _runner(self) -> None:
+        """Read the audio source and make the chunks available to the subscribers."""
+        try:
+            while True:
+                async with self._condition:
+                    try:
+                        await asyncio.wait_for(
+                            self._condition.wait_for(self._is_ready_for_chunk), self.timeout
+                        )
+                    except TimeoutError:
+                        if not self._subscribers:
+                            LOGGER.debug("No subscribers left, stopping shared stream")
+                            return
+                        # the slowest subscriber(s) will have to catch up on their own
+                        LOGGER.debug("Subscriber(s) lagging behind on the shared stream")
+                        for subscriber in self._subscribers:
+                            if self._end_index - subscriber.cursor >= self.backlog:
+                                subscriber.lagging = True
+                try:
+                    chunk = await anext(self.audio_source)
+                except StopAsyncIteration:
+                    break
+                async with self._condition:
+                    self._chunks.append(chunk)
+                    self._bytes_read += len(chunk)
+                    for subscriber in self._subscribers:
+                        if self._end_index - subscriber.cursor > self.history + self.backlog:
+                            self._handle_lag(subscriber)
+                    self._subscribers = [x for x in self._subscribers if not x.dropped]
+                    self._trim()
+                    self._condition.notify_all()
+        except Exception as err:
+            LOGGER.warning("Error in shared stream: %s", str(err) or err.__class__.__name__)
+        finally:
+            LOGGER.debug("Shared stream finished: %s", self.metrics)
+            self._eof = True
+            self._joinable = False
+            await self.audio_source.aclose()
+            # wake up the subscribers so they can finish reading the buffered chunks
+            async with self._condition:
+                self._condition.notify_all()
+
+    def _handle_lag(self, subscriber: _Subscriber) -> None:
+        """Apply the lag policy to a subscriber that lags too much behind."""
+        if self.lag_policy == LagPolicy.DISCONNECT:
+            subscriber.dropped = True
+            self._disconnected += 1
+            return
+        if self.lag_policy == LagPolicy.SKIP_AHEAD:
+            cursor = self._end_index - 1
+        else:
+            cursor = self._end_index - self.history - self.backlog
+        subscriber.skipped_chunks += cursor - subscriber.cursor
+        subscriber.cursor = cursor
@@ -0,0 +1,60 @@
+"""Tracking of the (player and queue) state that is sent as deltas to API clients."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from music_assistant.common.helpers.json import get_serializable_value
+from music_assistant.common.helpers.json_patch import get_patch
+from music_assistant.common.models.api import DELTA_EVENT_TYPES, EventDeltaMessage
+from music_assistant.common.models.enums import EventType
+
+if TYPE_CHECKING:
+    from music_assistant.common.models.event import MassEvent
+
+
+class StateDeltaTracker:
+    """
+    Keep the last sent state of all players and queues to create deltas of the changes.
+
+    The state is tracked once (for all clients), clients that missed a delta (e.g. because
+    of an event filter) detect the gap in the sequence number and request a resync.
+    """
+
+    def __init__(self) -> None:
+        """Initialize StateDeltaTracker."""
+        # (players/queues, object id) --> (sequence number, state)
+        self._states: dict[tuple[str, str], tuple[int, dict[str, Any]]] = {}
+
+    def get_delta(self, event: MassEvent) -> EventDeltaMessage | None:
+        """Return the delta message for a (player/queue) event, None if nothing changed."""
+        if event.event == EventType.PLAYER_REMOVED and event.object_id:
+            # the queue of the player is removed together with it
+            self._states.pop(("players", event.object_id), None)
+            self._states.pop(("queues", event.object_id), None)
+            return None
+        if not (kind := DELTA_EVENT_TYPES.get(event.event)) or not event.object_id:
+            return None
+        key = (kind, event.object_id)
+        state = get_serializable_value(event.data)
+        prev = self._states.get(key)
+        if prev is None or event.event in (EventType.PLAYER_ADDED, EventType.QUEUE_ADDED):
+            seq = 0
+            patch = [{"op": "replace", "path": "", "value": state}]
+        else:
+            seq = prev[0] + 1
+            if not (patch := get_patch(prev[1], state)):
+                return None
+        self._states[key] = (seq, state)
+        return EventDeltaMessage(event.event, event.object_id, seq, patch)
+
+    def get_state(self) -> dict[str, dict[str, dict[str, Any]]]:
+        """Return the (last sent) state and sequence number of all players and queues."""
+        result: dict[str, dict[str, dict[str, Any]]] = {"players": {}, "queues": {}}
+        for (kind, object_id), (seq, state) in self._states.items():
+            result[kind][object_id] = {"seq": seq, "state": state}
+        return result
+
+    def clear(self) -> None:
+        """Clear all tracked state (e.g. when no client uses deltas)."""
+        self._states = {}
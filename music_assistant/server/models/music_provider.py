@@ -28,6 +28,9 @@ if TYPE_CHECKING:
 
 # ruff: noqa: ARG001, ARG002
 
+# number of provider items that are processed at once during the library sync
+SYNC_BATCH_SIZE = 500
+
 
 class MusicProvider(Provider):
     """Base representation of a Music Provider (controller).
@@ -442,83 +445,119 @@ class MusicProvider(Provider):
         """Run library sync for this provider."""
         # this reference implementation can be overridden
         # with a provider specific approach if needed
-        for media_type in media_types:
-            if not self.library_supported(media_type):
+        # writes are batched into bounded transactions to limit the number of commits
+        async with self.mass.music.database.batch():
+            for media_type in media_types:
+                if not self.library_supported(media_type):
+                    continue
+                self.logger.debug("Start sync of %s items.", media_type.value)
+                controller = self.mass.music.get_controller(media_type)
+                cur_db_ids = set()
+                # provider items are processed in batches using the bulk (set based) methods
+                prov_items: list[MediaItemType] = []
+                async for prov_item in self._get_library_gen(media_type):
+                    prov_items.append(prov_item)
+                    if len(prov_items) >= SYNC_BATCH_SIZE:
+                        cur_db_ids.update(await self._sync_library_items(media_type, prov_items))
+                        prov_items = []
+                        await asyncio.sleep(0)  # yield to eventloop
+                cur_db_ids.update(await self._sync_library_items(media_type, prov_items))
+
+                # process deletions (= no longer in library)
+                cache_category = CacheCategory.LIBRARY_ITEMS
+                cache_base_key = self.instance_id
+
+                prev_library_items: list[int] | None
+                if prev_library_items := await self.mass.cache.get(
+                    media_type.value, category=cache_category, base_key=cache_base_key
+                ):
+                    for db_id in prev_library_items:
+                        if db_id not in cur_db_ids:
+                            try:
+                                item = await controller.get_library_item(db_id)
+                            except MediaNotFoundError:
+                                # edge case: the item is already removed
+                                continue
+                            remaining_providers = {
+                                x.provider_domain
+                                for x in item.provider_mappings
+                                if x.provider_domain != self.domain
+                            }
+                            if not remaining_providers and media_type != MediaType.ARTIST:
+                                # this item is removed from the provider's library
+                                # and we have no other providers attached to it
+                                # it is safe to remove it from the MA library too
+                                # note we skip artists here to prevent a recursive removal
+                                # of all albums and tracks underneath this artist
+                                await controller.remove_item_from_library(db_id)
+                            else:
+                                # otherwise: just unmark favorite
+                                await controller.set_favorite(db_id, False)
+                    await asyncio.sleep(0)  # yield to eventloop
+                await self.mass.cache.set(
+                    media_type.value,
+                    list(cur_db_ids),
+                    category=cache_category,
+                    base_key=cache_base_key,
+                )
+
+    async def _sync_library_items(
+        self, media_type: MediaType, prov_items: list[MediaItemType]
+    ) -> set[str]:
+        """Sync a batch of provider library items, return the (synced) library item ids."""
+        controller = self.mass.music.get_controller(media_type)
+        db_ids: set[str] = set()
+        new_items: list[MediaItemType] = []
+        library_items = await controller.get_library_items_by_prov_mappings(prov_items)
+        for prov_item, library_item in zip(prov_items, library_items, strict=True):
+            if not library_item and not prov_item.available:
+                # skip unavailable tracks
+                self.logger.debug(
+                    "Skipping sync of item %s because it is unavailable", prov_item.uri
+                )
                 continue
-            self.logger.debug("Start sync of %s items.", media_type.value)
-            controller = self.mass.music.get_controller(media_type)
-            cur_db_ids = set()
-            async for prov_item in self._get_library_gen(media_type):
-                library_item = await controller.get_library_item_by_prov_mappings(
-                    prov_item.provider_mappings,
+            if not library_item:
+                # create full db item
+                # note that we skip the metadata lookup purely to speed up the sync
+                # the additional metadata is then lazy retrieved afterwards
+                if self.is_streaming_provider:
+                    prov_item.favorite = True
+                new_items.append(prov_item)
+                continue
+            try:
+                if getattr(library_item, "cache_checksum", None) != getattr(
+                    prov_item, "cache_checksum", None
+                ):
+                    # existing dbitem checksum changed (playlists only)
+                    await controller.update_item_in_library(library_item.item_id, prov_item)
+                elif library_item.available != prov_item.available:
+                    # existing item availability changed
+                    await controller.update_item_in_library(library_item.item_id, prov_item)
+            except MusicAssistantError as err:
+                self.logger.warning(
+                    "Skipping sync of item %s - error details: %s", prov_item.uri, str(err)
                 )
+                continue
+            db_ids.add(library_item.item_id)
+        if not new_items:
+            return db_ids
+        try:
+            library_items = await controller.add_items_to_library(new_items)
+        except MusicAssistantError as err:
+            # do not let a single (bad) item fail the whole batch: add the items one by one
+            self.logger.debug("Bulk add of %s items failed: %s", len(new_items), str(err))
+            for prov_item in new_items:
                 try:
-                    if not library_item and not prov_item.available:
-                        # skip unavailable tracks
-                        self.logger.debug(
-                            "Skipping sync of item %s because it is unavailable", prov_item.uri
-                        )
-                        continue
-                    if not library_item:
-                        # create full db item
-                        # note that we skip the metadata lookup purely to speed up the sync
-                        # the additional metadata is then lazy retrieved afterwards
-                        if self.is_streaming_provider:
-                            prov_item.favorite = True
-                        library_item = await controller.add_item_to_library(prov_item)
-                    elif getattr(library_item, "cache_checksum", None) != getattr(
-                        prov_item, "cache_checksum", None
-                    ):
-                        # existing dbitem checksum changed (playlists only)
-                        library_item = await controller.update_item_in_library(
-                            library_item.item_id, prov_item
-                        )
-                    elif library_item.available != prov_item.available:
-                        # existing item availability changed
-                        library_item = await controller.update_item_in_library(
-                            library_item.item_id, prov_item
-                        )
-                    cur_db_ids.add(library_item.item_id)
-                    await asyncio.sleep(0)  # yield to eventloop
+                    library_item = await controller.add_item_to_library(prov_item)
                 except MusicAssistantError as err:
                     self.logger.warning(
                         "Skipping sync of item %s - error details: %s", prov_item.uri, str(err)
                     )
-
-            # process deletions (= no longer in library)
-            cache_category = CacheCategory.LIBRARY_ITEMS
-            cache_base_key = self.instance_id
-
-            prev_library_items: list[int] | None
-            if prev_library_items := await self.mass.cache.get(
-                media_type.value, category=cache_category, base_key=cache_base_key
-            ):
-                for db_id in prev_library_items:
-                    if db_id not in cur_db_ids:
-                        try:
-                            item = await controller.get_library_item(db_id)
-                        except MediaNotFoundError:
-                            # edge case: the item is already removed
-                            continue
-                        remaining_providers = {
-                            x.provider_domain
-                            for x in item.provider_mappings
-                            if x.provider_domain != self.domain
-                        }
-                        if not remaining_providers and media_type != MediaType.ARTIST:
-                            # this item is removed from the provider's library
-                            # and we have no other providers attached to it
-                            # it is safe to remove it from the MA library too
-                            # note we skip artists here to prevent a recursive removal
-                            # of all albums and tracks underneath this artist
-                            await controller.remove_item_from_library(db_id)
-                        else:
-                            # otherwise: just unmark favorite
-                            await controller.set_favorite(db_id, False)
-                await asyncio.sleep(0)  # yield to eventloop
-            await self.mass.cache.set(
-                media_type.value, list(cur_db_ids), category=cache_category, base_key=cache_base_key
-            )
+                    continue
+                db_ids.add(library_item.item_id)
+        else:
+            db_ids.update(x.item_id for x in library_items)
+        return db_ids
 
     # DO NOT OVERRIDE BELOW
 
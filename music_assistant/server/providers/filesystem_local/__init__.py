@@ -61,6 +61,7 @@ from music_assistant.constants import (
     VARIOUS_ARTISTS_MBID,
     VARIOUS_ARTISTS_NAME,
 )
+from music_assistant.server.controllers.media.base import SEARCH_RELEVANCE_SORT_KEY
 from music_assistant.server.helpers.compare import compare_strings, create_safe_string
 from music_assistant.server.helpers.playlists import parse_m3u, parse_pls
 from music_assistant.server.helpers.tags import AudioTags, parse_tags, split_items
@@ -210,7 +211,10 @@ class LocalFileSystemProvider(MusicProvider):
         # so instead we just query the db...
         if media_types is None or MediaType.TRACK in media_types:
             result.tracks = await self.mass.music.tracks._get_library_items_by_query(
-                search=search_query, provider=self.instance_id, limit=limit
+                search=search_query,
+                provider=self.instance_id,
+                limit=limit,
+                order_by=SEARCH_RELEVANCE_SORT_KEY,
             )
 
         if media_types is None or MediaType.ALBUM in media_types:
@@ -218,6 +222,7 @@ class LocalFileSystemProvider(MusicProvider):
                 search=search_query,
                 provider=self.instance_id,
                 limit=limit,
+                order_by=SEARCH_RELEVANCE_SORT_KEY,
             )
 
         if media_types is None or MediaType.ARTIST in media_types:
@@ -225,12 +230,14 @@ class LocalFileSystemProvider(MusicProvider):
                 search=search_query,
                 provider=self.instance_id,
                 limit=limit,
+                order_by=SEARCH_RELEVANCE_SORT_KEY,
             )
         if media_types is None or MediaType.PLAYLIST in media_types:
             result.playlists = await self.mass.music.playlists._get_library_items_by_query(
                 search=search_query,
                 provider=self.instance_id,
                 limit=limit,
+                order_by=SEARCH_RELEVANCE_SORT_KEY,
             )
         return result
 
@@ -288,35 +295,37 @@ class LocalFileSystemProvider(MusicProvider):
         )
         for db_row in await self.mass.music.database.get_rows_from_query(query, limit=0):
             file_checksums[db_row["provider_item_id"]] = str(db_row["details"])
-        # find all music files in the music directory and all subfolders
-        # we work bottom up, as-in we derive all info from the tracks
-        cur_filenames = set()
-        prev_filenames = set(file_checksums.keys())
-        async with TaskManager(self.mass, 25) as tm:
-            async for item in self.listdir("", recursive=True, sort=False):
-                if "." not in item.filename or not item.ext:
-                    # skip system files and files without extension
-                    continue
+        # writes are batched into bounded transactions to limit the number of commits
+        async with self.mass.music.database.batch():
+            # find all music files in the music directory and all subfolders
+            # we work bottom up, as-in we derive all info from the tracks
+            cur_filenames = set()
+            prev_filenames = set(file_checksums.keys())
+            async with TaskManager(self.mass, 25) as tm:
+                async for item in self.listdir("", recursive=True, sort=False):
+                    if "." not in item.filename or not item.ext:
+                        # skip system files and files without extension
+                        continue
 
-                if item.ext not in SUPPORTED_EXTENSIONS:
-                    # unsupported file extension
-                    continue
+                    if item.ext not in SUPPORTED_EXTENSIONS:
+                        # unsupported file extension
+                        continue
 
-                cur_filenames.add(item.path)
+                    cur_filenames.add(item.path)
 
-                # continue if the item did not change (checksum still the same)
-                prev_checksum = file_checksums.get(item.path)
-                if item.checksum == prev_checksum:
-                    continue
+                    # continue if the item did not change (checksum still the same)
+                    prev_checksum = file_checksums.get(item.path)
+                    if item.checksum == prev_checksum:
+                        continue
 
-                await tm.create_task_with_limit(self._process_item(item, prev_checksum))
+                    await tm.create_task_with_limit(self._process_item(item, prev_checksum))
 
-        # work out deletions
-        deleted_files = prev_filenames - cur_filenames
-        await self._process_deletions(deleted_files)
+            # work out deletions
+            deleted_files = prev_filenames - cur_filenames
+            await self._process_deletions(deleted_files)
 
-        # process orphaned albums and artists
-        await self._process_orphaned_albums_and_artists()
+            # process orphaned albums and artists
+            await self._process_orphaned_albums_and_artists()
 
     async def _process_item(self, item: FileSystemItem, prev_checksum: str | None) -> None:
         """Process a single item."""
@@ -359,10 +368,7 @@ class LocalFileSystemProvider(MusicProvider):
             f"AND item_id in ( SELECT item_id from {DB_TABLE_PROVIDER_MAPPINGS} "
             f"WHERE provider_instance = '{self.instance_id}' and media_type = 'album' )"
         )
-        for db_row in await self.mass.music.database.get_rows_from_query(
-            query,
-            limit=100000,
-        ):
+        async for db_row in self.mass.music.database.iter_rows_from_query(query):
             await self.mass.music.albums.remove_item_from_library(db_row["item_id"])
 
         # Remove artists without any tracks or albums
@@ -374,10 +380,7 @@ class LocalFileSystemProvider(MusicProvider):
             f"AND item_id in ( SELECT item_id from {DB_TABLE_PROVIDER_MAPPINGS} "
             f"WHERE provider_instance = '{self.instance_id}' and media_type = 'artist' )"
         )
-        for db_row in await self.mass.music.database.get_rows_from_query(
-            query,
-            limit=100000,
-        ):
+        async for db_row in self.mass.music.database.iter_rows_from_query(query):
             await self.mass.music.artists.remove_item_from_library(db_row["item_id"])
 
     async def _process_deletions(self, deleted_files: set[str]) -> None:
@@ -8,12 +8,12 @@ The MP3 format is chosen because it is widely supported.
 from __future__ import annotations
 
 import asyncio
-from collections.abc import AsyncGenerator, Awaitable, Callable
+from collections.abc import AsyncGenerator
 
-from music_assistant.common.helpers.util import empty_queue
 from music_assistant.common.models.enums import ContentType
 from music_assistant.common.models.media_items import AudioFormat
 from music_assistant.server.helpers.audio import get_ffmpeg_stream
+from music_assistant.server.helpers.shared_stream import LagPolicy, SharedStream
 
 # ruff: noqa: ARG002
 
@@ -41,43 +41,41 @@ class UGPStream:
         self.audio_source = audio_source
         self.input_format = audio_format
         self.output_format = AudioFormat(content_type=ContentType.MP3)
-        self.subscribers: list[Callable[[bytes], Awaitable]] = []
-        self._task: asyncio.Task | None = None
-        self._done: asyncio.Event = asyncio.Event()
+        self._shared_stream: SharedStream | None = None
+        self._stopped = False
 
     @property
     def done(self) -> bool:
         """Return if this stream is already done."""
-        return self._done.is_set() and self._task and self._task.done()
+        return self._stopped or (self._shared_stream is not None and self._shared_stream.done)
 
     async def stop(self) -> None:
         """Stop/cancel the stream."""
-        if self._done.is_set():
+        if self._stopped:
             return
-        if self._task and not self._task.done():
-            self._task.cancel()
-        self._done.set()
+        self._stopped = True
+        if self._shared_stream:
+            await self._shared_stream.stop()
 
     async def subscribe(self) -> AsyncGenerator[bytes, None]:
         """Subscribe to the raw/unaltered audio stream."""
         # start the runner as soon as the (first) client connects
-        if not self._task:
-            self._task = asyncio.create_task(self._runner())
-        queue = asyncio.Queue(10)
-        try:
-            self.subscribers.append(queue.put)
-            while True:
-                chunk = await queue.get()
-                if not chunk:
-                    break
-                yield chunk
-        finally:
-            self.subscribers.remove(queue.put)
-            empty_queue(queue)
-            del queue
+        if not self._shared_stream:
+            # a live stream: it is not throttled by (and it does not wait for) its
+            # subscribers, a subscriber that lags too much behind skips ahead to the live edge
+            self._shared_stream = SharedStream(
+                self._get_stream(),
+                backlog=10,
+                history=20,
+                timeout=2,
+                lag_policy=LagPolicy.SKIP_AHEAD,
+                live=True,
+            )
+        async for chunk in self._shared_stream.subscribe():
+            yield chunk
 
-    async def _runner(self) -> None:
-        """Run the stream for the given audio source."""
+    async def _get_stream(self) -> AsyncGenerator[bytes, None]:
+        """Get the (encoded) stream for the given audio source."""
         await asyncio.sleep(0.25)  # small delay to allow subscribers to connect
         async for chunk in get_ffmpeg_stream(
             audio_input=self.audio_source,
@@ -86,10 +84,4 @@ class UGPStream:
             # we don't allow the player to buffer too much ahead so we use readrate limiting
             extra_input_args=["-readrate", "1.1", "-readrate_initial_burst", "10"],
         ):
-            await asyncio.gather(
-                *[sub(chunk) for sub in self.subscribers],
-                return_exceptions=True,
-            )
-        # empty chunk when done
-        await asyncio.gather(*[sub(b"") for sub in self.subscribers], return_exceptions=True)
-        self._done.set()
+            yield chunk
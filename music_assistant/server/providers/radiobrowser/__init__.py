@@ -222,7 +222,7 @@ class RadioBrowserProvider(MusicProvider):
         )
         return True
 
-    @use_cache(3600 * 24)
+    @use_cache(3600 * 24, stale_while_revalidate=True)
     async def get_tag_folders(self, base_path: str) -> list[BrowseFolder]:
         """Get a list of tag names as BrowseFolder."""
         tags = await self.radios.tags(
@@ -241,7 +241,7 @@ class RadioBrowserProvider(MusicProvider):
             for tag in tags
         ]
 
-    @use_cache(3600 * 24)
+    @use_cache(3600 * 24, stale_while_revalidate=True)
     async def get_country_folders(self, base_path: str) -> list[BrowseFolder]:
         """Get a list of country names as BrowseFolder."""
         items: list[BrowseFolder] = []
@@ -937,7 +937,7 @@ class SlimprotoProvider(PlayerProvider):
         if not (child_player := self.mass.players.get(child_player_id)):
             raise web.HTTPNotFound(reason=f"Unknown player: {child_player_id}")
 
-        if not (stream := self._multi_streams.get(player_id, None)) or stream.done:
+        if not (stream := self._multi_streams.get(player_id, None)) or not stream.joinable:
             raise web.HTTPNotFound(f"There is no active stream for {player_id}!")
 
         resp = web.StreamResponse(
@@ -3,11 +3,11 @@
 import asyncio
 import logging
 from collections.abc import AsyncGenerator
-from contextlib import suppress
+from typing import Any
 
-from music_assistant.common.helpers.util import empty_queue
 from music_assistant.common.models.media_items import AudioFormat
 from music_assistant.server.helpers.audio import get_ffmpeg_stream
+from music_assistant.server.helpers.shared_stream import LagPolicy, SharedStream
 
 LOGGER = logging.getLogger(__name__)
 
@@ -24,24 +24,36 @@ class MultiClientStream:
         """Initialize MultiClientStream."""
         self.audio_source = audio_source
         self.audio_format = audio_format
-        self.subscribers: list[asyncio.Queue] = []
         self.expected_clients = expected_clients
-        self.task = asyncio.create_task(self._runner())
+        # a client that lags too much behind (e.g. a stalled player) does not throttle
+        # the whole sync group, the chunks it missed are dropped for that client.
+        # a client that (re)connects late joins the stream at the most recent chunk.
+        self._shared_stream = SharedStream(
+            self._wait_for_clients(),
+            backlog=2,
+            history=10,
+            lag_policy=LagPolicy.DROP,
+            late_join=True,
+        )
 
     @property
     def done(self) -> bool:
         """Return if this stream is already done."""
-        return self.task.done()
+        return self._shared_stream.done
+
+    @property
+    def joinable(self) -> bool:
+        """Return if a (new) client can still join this stream."""
+        return self._shared_stream.joinable
+
+    @property
+    def metrics(self) -> dict[str, Any]:
+        """Return the (runtime) metrics of the stream."""
+        return self._shared_stream.metrics
 
     async def stop(self) -> None:
         """Stop/cancel the stream."""
-        if self.done:
-            return
-        self.task.cancel()
-        with suppress(asyncio.CancelledError):
-            await self.task
-        for sub_queue in list(self.subscribers):
-            empty_queue(sub_queue)
+        await self._shared_stream.stop()
 
     async def get_stream(
         self,
@@ -59,43 +71,21 @@ class MultiClientStream:
 
     async def subscribe_raw(self) -> AsyncGenerator[bytes, None]:
         """Subscribe to the raw/unaltered audio stream."""
-        try:
-            queue = asyncio.Queue(2)
-            self.subscribers.append(queue)
-            while True:
-                chunk = await queue.get()
-                if chunk == b"":
-                    break
-                yield chunk
-        finally:
-            with suppress(ValueError):
-                self.subscribers.remove(queue)
+        async for chunk in self._shared_stream.subscribe():
+            yield chunk
 
-    async def _runner(self) -> None:
-        """Run the stream for the given audio source."""
+    async def _wait_for_clients(self) -> AsyncGenerator[bytes, None]:
+        """Wait for all expected clients to connect before reading the audio source."""
+        # the shared stream starts reading when the first client subscribed
         expected_clients = self.expected_clients or 1
-        # wait for first/all subscriber
         count = 0
-        while count < 50:
+        while count < 50 and self._shared_stream.num_subscribers < expected_clients:
             await asyncio.sleep(0.1)
             count += 1
-            if len(self.subscribers) >= expected_clients:
-                break
         LOGGER.debug(
             "Starting multi-client stream with %s/%s clients",
-            len(self.subscribers),
+            self._shared_stream.num_subscribers,
             self.expected_clients,
         )
         async for chunk in self.audio_source:
-            fail_count = 0
-            while len(self.subscribers) == 0:
-                await asyncio.sleep(0.1)
-                fail_count += 1
-                if fail_count > 50:
-                    LOGGER.warning("No clients connected, stopping stream")
-                    return
-            await asyncio.gather(
-                *[sub.put(chunk) for sub in self.subscribers], return_exceptions=True
-            )
-        # EOF: send empty chunk
-        await asyncio.gather(*[sub.put(b"") for sub in self.subscribers], return_exceptions=True)
+            yield chunk
@@ -0,0 +1,82 @@
+"""
+Benchmark the ByteBuffer against (immutable) bytes concatenation and slicing.
+
+Simulates the buffering loop of the flow stream (with crossfade enabled) and reports,
+extrapolated to one streamed hour, the number of bytes allocated/copied and the CPU time.
+For bytes, every concatenation and slice allocates a new object of the resulting size.
+For the ByteBuffer, the bytes copied into (and out of) the bytearray are counted.
+
+Usage: python scripts/benchmark_byte_buffer.py [sample_rate] [crossfade_seconds] [seconds]
+"""
+
+import sys
+import time
+
+from music_assistant.server.helpers.buffer import ByteBuffer
+
+# ruff: noqa: D101,D102,D103,D107,T201
+# pylint: disable=missing-function-docstring,missing-class-docstring
+
+
+class CountingByteBuffer(ByteBuffer):
+    __slots__ = ("copied",)
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.copied = 0
+
+    def append(self, chunk: bytes) -> None:
+        if self._offset and self._offset >= len(self._data) - self._offset:
+            self.copied += len(self)
+        self.copied += len(chunk)
+        super().append(chunk)
+
+    def read(self, size: int) -> bytes:
+        chunk = super().read(size)
+        self.copied += len(chunk)
+        return chunk
+
+
+def bench_bytes(chunk: bytes, num_chunks: int, req_buffer_size: int) -> int:
+    allocated = 0
+    buffer = b""
+    for _ in range(num_chunks):
+        buffer += chunk
+        allocated += len(buffer)
+        while len(buffer) > req_buffer_size:
+            part = buffer[: len(chunk)]
+            buffer = buffer[len(chunk) :]
+            allocated += len(part) + len(buffer)
+    return allocated
+
+
+def bench_byte_buffer(chunk: bytes, num_chunks: int, req_buffer_size: int) -> int:
+    buffer = CountingByteBuffer()
+    for _ in range(num_chunks):
+        buffer.append(chunk)
+        while len(buffer) > req_buffer_size:
+            buffer.read(len(chunk))
+    return buffer.copied
+
+
+def main() -> None:
+    sample_rate = int(sys.argv[1]) if len(sys.argv) > 1 else 192000
+    crossfade_seconds = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    seconds = int(sys.argv[3]) if len(sys.argv) > 3 else 300
+    # f32 stereo pcm (flow stream format with volume normalization), 1 second chunks
+    chunk = b"\0" * (sample_rate * 4 * 2)
+    req_buffer_size = len(chunk) * crossfade_seconds
+    scale = 3600 / seconds
+    print(f"f32 stereo {sample_rate}Hz, crossfade buffer of {crossfade_seconds}s")
+    for name, func in (("bytes", bench_bytes), ("ByteBuffer", bench_byte_buffer)):
+        start = time.process_time()
+        copied = func(chunk, seconds, req_buffer_size)
+        duration = time.process_time() - start
+        print(
+            f"{name:<12} per streamed hour: {copied * scale / 1024**3:8.1f} GB allocated/copied, "
+            f"{duration * scale:6.2f}s cpu time"
+        )
+
+
+if __name__ == "__main__":
+    main()
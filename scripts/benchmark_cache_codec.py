@@ -0,0 +1,126 @@
+"""
+Benchmark the (binary) cache codec against the (legacy) json text format.
+
+Fills a cache database with pages of (realistic) playlist tracks in both formats
+and reports the database size and the CPU time to encode/decode all pages.
+
+Usage: python scripts/benchmark_cache_codec.py [num_pages] [page_size]
+"""
+
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+from music_assistant.common.models.enums import ContentType, ImageType, MediaType
+from music_assistant.common.models.media_items import (
+    AudioFormat,
+    ItemMapping,
+    MediaItemImage,
+    MediaItemMetadata,
+    ProviderMapping,
+    Track,
+    UniqueList,
+)
+from music_assistant.server.controllers.cache import decode_cache_data, encode_cache_data
+
+# ruff: noqa: D103,T201,S311,S608
+# pylint: disable=missing-function-docstring
+
+WORDS = (
+    "love night heart dance fire light dream time world baby girl rain summer blue "
+    "little wild home gold river road song moon star sweet black forever down"
+).split()
+
+
+def _name(num_words: int) -> str:
+    return " ".join(random.choice(WORDS) for _ in range(num_words)).title()
+
+
+def create_track(item_id: int) -> Track:
+    provider_item_id = f"{random.getrandbits(64):022x}"
+    return Track(
+        item_id=provider_item_id,
+        provider="spotify--abcd1234",
+        name=_name(random.randint(1, 5)),
+        duration=random.randint(120, 420),
+        provider_mappings={
+            ProviderMapping(
+                item_id=provider_item_id,
+                provider_domain="spotify",
+                provider_instance="spotify--abcd1234",
+                audio_format=AudioFormat(content_type=ContentType.OGG, bit_rate=320),
+                url=f"https://open.spotify.com/track/{provider_item_id}",
+            )
+        },
+        metadata=MediaItemMetadata(
+            explicit=random.random() < 0.2,
+            popularity=random.randint(0, 100),
+            images=UniqueList(
+                [
+                    MediaItemImage(
+                        type=ImageType.THUMB,
+                        path=f"https://i.scdn.co/image/ab67616d0000b273{provider_item_id}",
+                        provider="spotify--abcd1234",
+                        remotely_accessible=True,
+                    )
+                ]
+            ),
+        ),
+        artists=UniqueList(
+            [
+                ItemMapping(
+                    media_type=MediaType.ARTIST,
+                    item_id=f"{random.getrandbits(64):022x}",
+                    provider="spotify--abcd1234",
+                    name=_name(2),
+                )
+                for _ in range(random.randint(1, 3))
+            ]
+        ),
+        album=ItemMapping(
+            media_type=MediaType.ALBUM,
+            item_id=f"{random.getrandbits(64):022x}",
+            provider="spotify--abcd1234",
+            name=_name(3),
+        ),
+        disc_number=1,
+        track_number=item_id % 20 + 1,
+    )
+
+
+def main() -> None:
+    num_pages = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    page_size = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    random.seed(1)
+    pages = [
+        [create_track(page * page_size + i).to_dict() for i in range(page_size)]
+        for page in range(num_pages)
+    ]
+    print(f"{num_pages} pages of {page_size} playlist tracks")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name, compress in (("json text", False), ("binary/zstd", True)):
+            start = time.process_time()
+            payloads = [encode_cache_data(page, compress)[0] for page in pages]
+            encode_time = time.process_time() - start
+            start = time.process_time()
+            for payload in payloads:
+                decode_cache_data(payload)
+            decode_time = time.process_time() - start
+            db_path = os.path.join(tmp_dir, f"{compress}.db")
+            conn = sqlite3.connect(db_path)
+            conn.execute("CREATE TABLE cache(id INTEGER PRIMARY KEY, data TEXT)")
+            conn.executemany("INSERT INTO cache(data) VALUES (?)", ((x,) for x in payloads))
+            conn.commit()
+            conn.execute("VACUUM")
+            conn.close()
+            print(
+                f"{name:<12} db size: {os.path.getsize(db_path) / 1024 / 1024:.1f} MB, "
+                f"encode: {encode_time * 1000:.0f} ms, decode: {decode_time * 1000:.0f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
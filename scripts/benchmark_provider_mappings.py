@@ -0,0 +1,183 @@
+"""
+Benchmark the strategies to fetch the provider mappings of (pages of) library items.
+
+Compares on a synthetic library database:
+- subquery: correlated JSON_GROUP_ARRAY subquery per row (the former base_query)
+- json_column: a provider_mappings JSON column on the media table, maintained by triggers
+  (current approach)
+- batched: a single batched lookup in the provider_mappings table per page, joined in python
+
+Besides the listing time, the extra write cost of the triggers is reported.
+
+Usage: python scripts/benchmark_provider_mappings.py [num_items]
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from collections.abc import Iterator
+
+import orjson
+
+# ruff: noqa: D103,E501,T201,S311,S608
+# pylint: disable=missing-function-docstring
+
+PAGE_SIZE = 500
+
+MAPPING_JSON = """json_object(
+    'item_id', provider_mappings.provider_item_id,
+    'provider_domain', provider_mappings.provider_domain,
+    'provider_instance', provider_mappings.provider_instance,
+    'available', provider_mappings.available,
+    'audio_format', json(provider_mappings.audio_format),
+    'url', provider_mappings.url,
+    'details', provider_mappings.details
+)"""
+
+SUBQUERY_PAGE = f"""
+SELECT tracks.*,
+    (SELECT JSON_GROUP_ARRAY({MAPPING_JSON}) FROM provider_mappings
+     WHERE provider_mappings.item_id = tracks.item_id
+     AND provider_mappings.media_type = 'track') AS provider_mappings
+FROM tracks WHERE tracks.sort_name > ? ORDER BY tracks.sort_name LIMIT {PAGE_SIZE}
+"""
+
+JSON_COLUMN_PAGE = f"""
+SELECT tracks.* FROM tracks WHERE tracks.sort_name > ? ORDER BY tracks.sort_name LIMIT {PAGE_SIZE}
+"""
+
+BATCHED_PAGE = JSON_COLUMN_PAGE
+
+JSON_COLUMN_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS provider_mappings_json_{action.lower()}
+    AFTER {action} ON provider_mappings FOR EACH ROW
+    BEGIN
+        UPDATE tracks SET provider_mappings_json = (
+            SELECT JSON_GROUP_ARRAY({MAPPING_JSON}) FROM provider_mappings
+            WHERE provider_mappings.item_id = {row}.item_id
+            AND provider_mappings.media_type = 'track'
+        ) WHERE item_id = {row}.item_id;
+    END;
+    """
+    for action, row in (("INSERT", "NEW"), ("UPDATE", "NEW"), ("DELETE", "OLD"))
+]
+
+
+def create_database(db_path: str, num_items: int, with_triggers: bool) -> float:
+    """Create the synthetic database, return the time spent inserting the mappings."""
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(
+        "CREATE TABLE tracks(item_id INTEGER PRIMARY KEY, name TEXT, sort_name TEXT, "
+        "metadata json, provider_mappings_json json)"
+    )
+    conn.execute("CREATE INDEX tracks_sort_name_idx ON tracks(sort_name)")
+    conn.execute(
+        "CREATE TABLE provider_mappings(media_type TEXT NOT NULL, item_id INTEGER NOT NULL, "
+        "provider_domain TEXT NOT NULL, provider_instance TEXT NOT NULL, "
+        "provider_item_id TEXT NOT NULL, available BOOLEAN DEFAULT 1, url text, "
+        "audio_format json, details TEXT, "
+        "UNIQUE(media_type, provider_instance, provider_item_id))"
+    )
+    conn.execute("CREATE INDEX pm_media_type_item_id_idx ON provider_mappings(media_type,item_id)")
+    if with_triggers:
+        for trigger in JSON_COLUMN_TRIGGERS:
+            conn.execute(trigger)
+    conn.executemany(
+        "INSERT INTO tracks(item_id, name, sort_name, metadata) VALUES (?, ?, ?, '{}')",
+        ((i, f"Track {i}", f"track {i:08d}") for i in range(1, num_items + 1)),
+    )
+    audio_format = orjson.dumps({"content_type": "flac", "sample_rate": 44100, "bit_depth": 16})
+    start = time.perf_counter()
+    conn.executemany(
+        "INSERT INTO provider_mappings VALUES ('track', ?, ?, ?, ?, 1, NULL, ?, NULL)",
+        (
+            (i, domain, f"{domain}--{num}", f"{domain}-{i}", audio_format)
+            for i in range(1, num_items + 1)
+            # every item has one mapping, half of them a second one
+            for num, domain in enumerate(("filesystem_local", "spotify")[: 1 + i % 2])
+        ),
+    )
+    conn.commit()
+    conn.close()
+    return time.perf_counter() - start
+
+
+def iter_pages(conn: sqlite3.Connection, query: str) -> Iterator[sqlite3.Row]:
+    last = ""
+    while True:
+        rows = conn.execute(query, (last,)).fetchall()
+        if not rows:
+            return
+        yield rows
+        last = rows[-1]["sort_name"]
+
+
+def bench_subquery(conn: sqlite3.Connection) -> int:
+    count = 0
+    for rows in iter_pages(conn, SUBQUERY_PAGE):
+        count += sum(len(orjson.loads(row["provider_mappings"])) for row in rows)
+    return count
+
+
+def bench_json_column(conn: sqlite3.Connection) -> int:
+    count = 0
+    for rows in iter_pages(conn, JSON_COLUMN_PAGE):
+        count += sum(len(orjson.loads(row["provider_mappings_json"])) for row in rows)
+    return count
+
+
+def bench_batched(conn: sqlite3.Connection) -> int:
+    count = 0
+    for rows in iter_pages(conn, BATCHED_PAGE):
+        item_ids = [row["item_id"] for row in rows]
+        mappings: dict[int, list[dict]] = {}
+        for mapping in conn.execute(
+            "SELECT * FROM provider_mappings WHERE media_type = 'track' AND item_id IN "
+            f"({','.join('?' * len(item_ids))})",
+            item_ids,
+        ):
+            mappings.setdefault(mapping["item_id"], []).append(
+                {
+                    "item_id": mapping["provider_item_id"],
+                    "provider_domain": mapping["provider_domain"],
+                    "provider_instance": mapping["provider_instance"],
+                    "available": bool(mapping["available"]),
+                    "audio_format": orjson.loads(mapping["audio_format"]),
+                    "url": mapping["url"],
+                    "details": mapping["details"],
+                }
+            )
+        count += sum(len(mappings.get(item_id, [])) for item_id in item_ids)
+    return count
+
+
+def main() -> None:
+    num_items = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        plain_db = os.path.join(tmp_dir, "plain.db")
+        trigger_db = os.path.join(tmp_dir, "triggers.db")
+        insert_plain = create_database(plain_db, num_items, with_triggers=False)
+        insert_triggers = create_database(trigger_db, num_items, with_triggers=True)
+        print(f"{num_items} items, pages of {PAGE_SIZE}")
+        print(f"insert mappings without triggers: {insert_plain:.3f}s")
+        print(f"insert mappings with triggers:    {insert_triggers:.3f}s")
+        for name, db_path, func in (
+            ("subquery", plain_db, bench_subquery),
+            ("json_column", trigger_db, bench_json_column),
+            ("batched", plain_db, bench_batched),
+        ):
+            conn = sqlite3.connect(db_path)
+            conn.row_factory = sqlite3.Row
+            start = time.perf_counter()
+            count = func(conn)
+            duration = time.perf_counter() - start
+            conn.close()
+            print(f"{name:<12} full listing: {duration:.3f}s ({count} mappings)")
+
+
+if __name__ == "__main__":
+    main()
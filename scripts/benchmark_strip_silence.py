@@ -0,0 +1,74 @@
+"""
+Benchmark the (in-process) numpy silence stripping against the ffmpeg implementation.
+
+Strips the silence from the begin and end of synthetic track buffers (silence followed by
+a fade-in of noise) like get_media_stream does and reports the wall time per call and
+the number of stripped bytes for both implementations.
+
+Usage: python scripts/benchmark_strip_silence.py [iterations]
+"""
+
+import asyncio
+import sys
+import time
+
+import numpy as np
+
+from music_assistant.common.models.enums import ContentType
+from music_assistant.common.models.media_items import AudioFormat
+from music_assistant.server.helpers.audio import _strip_silence_ffmpeg
+from music_assistant.server.helpers.pcm import float_to_pcm, strip_silence_pcm
+
+# ruff: noqa: D103,T201
+# pylint: disable=missing-function-docstring
+
+PCM_FORMATS = (
+    AudioFormat(content_type=ContentType.PCM_S16LE, sample_rate=44100, bit_depth=16, channels=2),
+    AudioFormat(content_type=ContentType.PCM_F32LE, sample_rate=96000, bit_depth=32, channels=2),
+)
+
+
+def create_buffer(pcm_format: AudioFormat, seconds: float, silence: float) -> bytes:
+    rng = np.random.default_rng(1)
+    frames = int(seconds * pcm_format.sample_rate)
+    silent_frames = int(silence * pcm_format.sample_rate)
+    samples = rng.uniform(-0.5, 0.5, (frames, 2))
+    samples[:silent_frames] *= 0.001
+    # short fade in of the audio after the silence
+    fade_frames = int(0.05 * pcm_format.sample_rate)
+    samples[silent_frames : silent_frames + fade_frames] *= np.linspace(0, 1, fade_frames)[:, None]
+    return float_to_pcm(samples, pcm_format)
+
+
+async def bench(pcm_format: AudioFormat, iterations: int) -> None:
+    # 4 seconds at the start of the track, 8 seconds at the end (reversed)
+    for reverse, seconds in ((False, 4), (True, 8)):
+        data = create_buffer(pcm_format, seconds, silence=1.5)
+        if reverse:
+            frame_size = pcm_format.channels * pcm_format.bit_depth // 8
+            frames = np.frombuffer(data, dtype=np.uint8).reshape(-1, frame_size)
+            data = frames[::-1].tobytes()
+        start = time.perf_counter()
+        for _ in range(iterations):
+            ffmpeg_result = await _strip_silence_ffmpeg(data, pcm_format, reverse=reverse)
+        ffmpeg_time = (time.perf_counter() - start) / iterations
+        start = time.perf_counter()
+        for _ in range(iterations):
+            numpy_result = strip_silence_pcm(data, pcm_format, reverse=reverse)
+        numpy_time = (time.perf_counter() - start) / iterations
+        location = "end" if reverse else "begin"
+        print(
+            f"{pcm_format.content_type.value} {pcm_format.sample_rate}Hz {location:<5} "
+            f"ffmpeg: {ffmpeg_time * 1000:6.1f} ms ({len(data) - len(ffmpeg_result)} bytes) - "
+            f"numpy: {numpy_time * 1000:6.1f} ms ({len(data) - len(numpy_result)} bytes)"
+        )
+
+
+async def main() -> None:
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    for pcm_format in PCM_FORMATS:
+        await bench(pcm_format, iterations)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -6,7 +6,10 @@ from unittest import mock
 import pytest
 from aiojellyfin.testing import FixtureBuilder
 
+from music_assistant.common.helpers.json import json_loads
 from music_assistant.common.models.config_entries import ProviderConfig
+from music_assistant.common.models.errors import MediaNotFoundError
+from music_assistant.common.models.media_items import ProviderMapping, Track
 from music_assistant.server.server import MusicAssistant
 from tests.common import get_fixtures_dir, wait_for_sync_completion
 
@@ -53,3 +56,117 @@ async def test_initial_sync(mass: MusicAssistant) -> None:
 
     tracks = await mass.music.tracks.library_items(search="where the bands are")
     assert tracks[0].name == "Where the Bands Are (2018 Version)"
+
+
+@pytest.mark.usefixtures("jellyfin_provider")
+async def test_library_items_page(mass: MusicAssistant) -> None:
+    """Test cursor based pagination of library items."""
+    for order_by in ("sort_name", "timestamp_added_desc", "timestamp_modified"):
+        expected = [x.item_id for x in await mass.music.tracks.library_items(order_by=order_by)]
+        result = []
+        cursor = None
+        while True:
+            page = await mass.music.tracks.library_items_page(
+                limit=2, order_by=order_by, cursor=cursor
+            )
+            result += [x.item_id for x in page.items]
+            if not (cursor := page.next_cursor):
+                break
+        assert result == expected
+
+
+@pytest.mark.usefixtures("jellyfin_provider")
+async def test_library_search(mass: MusicAssistant) -> None:
+    """Test (full text) library search with prefix matching and diacritics folding."""
+    tracks = await mass.music.tracks.search("Dead Like - Whére the band", "library")
+    assert tracks[0].name == "Where the Bands Are (2018 Version)"
+    albums = await mass.music.albums.search("christ", "library")
+    assert albums[0].name == "This Is Christmas"
+
+
+@pytest.mark.usefixtures("jellyfin_provider")
+async def test_add_items_to_library(mass: MusicAssistant) -> None:
+    """Test that the bulk add matches existing library items and only inserts new ones."""
+    library_tracks = await mass.music.tracks.library_items()
+    count = await mass.music.tracks.library_count()
+    prov_tracks = []
+    for library_track in library_tracks:
+        mapping = next(iter(library_track.provider_mappings))
+        prov_tracks.append(
+            await mass.music.tracks.get_provider_item(mapping.item_id, mapping.provider_instance)
+        )
+    # an (unmatched) new item, twice in the same batch
+    instance_id = mapping.provider_instance
+    new_track = Track.from_dict(
+        {**prov_tracks[0].to_dict(), "item_id": "new", "name": "A brand new track"}
+    )
+    new_track.external_ids = set()
+    new_track.provider_mappings = {
+        ProviderMapping(item_id="new", provider_domain="jellyfin", provider_instance=instance_id)
+    }
+    result = await mass.music.tracks.add_items_to_library([*prov_tracks, new_track, new_track])
+    assert {x.item_id for x in result} >= {x.item_id for x in library_tracks}
+    assert await mass.music.tracks.library_count() == count + 1
+    added = await mass.music.tracks.get_library_item_by_prov_id("new", instance_id)
+    assert added is not None
+    assert added.name == "A brand new track"
+    assert added.artists
+
+
+@pytest.mark.usefixtures("jellyfin_provider")
+async def test_provider_mappings_column(mass: MusicAssistant) -> None:
+    """Test that the (denormalized) provider_mappings column follows moved mappings."""
+    database = mass.music.database
+    assert database is not None
+    track_a, track_b = (await mass.music.tracks.library_items())[:2]
+    mapping = next(iter(track_a.provider_mappings))
+    # a timestamp in the future, which the timestamp trigger would reset to now
+    timestamp_modified = 2000000000
+    for track in (track_a, track_b):
+        await database.update(
+            "tracks", {"item_id": track.item_id}, {"timestamp_modified": timestamp_modified}
+        )
+    # move the mapping of track a to track b (INSERT OR REPLACE)
+    await mass.music.tracks._set_provider_mappings(track_b.item_id, [mapping])
+    for track in (track_a, track_b):
+        db_row = await database.get_row("tracks", {"item_id": track.item_id})
+        assert db_row is not None
+        # writing the mappings does not mark the items as modified
+        assert db_row["timestamp_modified"] == timestamp_modified
+        mapping_ids = {x["item_id"] for x in json_loads(db_row["provider_mappings"])}
+        assert (mapping.item_id in mapping_ids) == (track is track_b)
+
+
+@pytest.mark.usefixtures("jellyfin_provider")
+async def test_add_items_to_library_relation_error(mass: MusicAssistant) -> None:
+    """Test that an item of which the relations can not be set does not fail the batch."""
+    library_track = (await mass.music.tracks.library_items())[0]
+    mapping = next(iter(library_track.provider_mappings))
+    prov_track = await mass.music.tracks.get_provider_item(
+        mapping.item_id, mapping.provider_instance
+    )
+    count = await mass.music.tracks.library_count()
+    new_tracks = []
+    for name in ("bad", "good"):
+        new_track = Track.from_dict({**prov_track.to_dict(), "item_id": name, "name": name})
+        new_track.external_ids = set()
+        new_track.provider_mappings = {
+            ProviderMapping(
+                item_id=name,
+                provider_domain="jellyfin",
+                provider_instance=mapping.provider_instance,
+            )
+        }
+        new_tracks.append(new_track)
+    set_relations = mass.music.tracks._set_library_item_relations
+
+    async def _set_relations(db_id: int, item: Track) -> None:
+        if item.name == "bad":
+            raise MediaNotFoundError("Album not found")
+        await set_relations(db_id, item)
+
+    with mock.patch.object(mass.music.tracks, "_set_library_item_relations", _set_relations):
+        result = await mass.music.tracks.add_items_to_library(new_tracks)
+    assert [x.name for x in result] == ["good"]
+    assert await mass.music.tracks.library_count() == count + 1
+    assert result[0].artists
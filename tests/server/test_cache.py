@@ -0,0 +1,115 @@
+"""Tests for the cache controller."""
+
+import asyncio
+
+from music_assistant.common.models.enums import CacheCategory
+from music_assistant.server.controllers.cache import (
+    MemoryCache,
+    decode_cache_data,
+    encode_cache_data,
+    estimate_size,
+    use_cache,
+)
+from music_assistant.server.server import MusicAssistant
+
+
+def test_memory_cache_size_and_expiration() -> None:
+    """Test that the memory cache is bounded by size and honors the expiration."""
+    mem_cache = MemoryCache(100)
+    for key in ("a", "b", "c", "d"):
+        mem_cache.set(key, key, size=25, expires=2**40)
+    assert mem_cache.get("a") == "a"
+    # b is the least recently used item and gets evicted
+    mem_cache.set("e", "e", size=25, expires=2**40)
+    assert "b" not in mem_cache
+    assert mem_cache.size == 100
+    # items that are too large are not stored
+    mem_cache.set("f", "f", size=50, expires=2**40)
+    assert "f" not in mem_cache
+    # expired items are not returned
+    mem_cache.set("a", "a", size=25, expires=0)
+    assert mem_cache.get("a") is None
+    assert mem_cache.size == 75
+
+
+def test_estimate_size() -> None:
+    """Test that the (cheap) size estimate is in the range of the json size."""
+    data = {"tracks": [{"name": f"track {i}", "duration": i} for i in range(1000)]}
+    json_size = encode_cache_data(data)[1]
+    assert json_size / 4 < estimate_size(data) < json_size * 4
+    assert estimate_size("x" * 100) == 100
+
+
+def test_cache_codec() -> None:
+    """Test the binary cache codec (and that legacy json rows can still be read)."""
+    data = {"tracks": [{"name": f"track {i}", "duration": i} for i in range(100)]}
+    payload, size = encode_cache_data(data)
+    assert payload[:1] == b"z"
+    assert len(payload) < size
+    assert decode_cache_data(payload) == (data, size)
+    payload, size = encode_cache_data({"foo": "bar"})
+    assert payload == b'j{"foo":"bar"}'
+    assert decode_cache_data('{"foo":"bar"}') == ({"foo": "bar"}, size)
+
+
+async def test_buffered_db_writes(mass: MusicAssistant) -> None:
+    """Test that db writes are buffered and can be read back before and after flushing."""
+    database = mass.cache.database
+    assert database is not None
+    category = CacheCategory.MUSIC_PROVIDER_ITEM
+    await mass.cache.set("key", {"foo": "bar"}, category=category, base_key="test")
+    assert await database.get_count_from_query("SELECT * FROM cache WHERE base_key = 'test'") == 0
+    mass.cache._mem_cache.clear()
+    assert await mass.cache.get("key", category=category, base_key="test") == {"foo": "bar"}
+    await mass.cache.flush()
+    assert await database.get_count_from_query("SELECT * FROM cache WHERE base_key = 'test'") == 1
+    mass.cache._mem_cache.clear()
+    assert await mass.cache.get("key", category=category, base_key="test") == {"foo": "bar"}
+    assert await mass.cache.get("other", category=category, base_key="test") is None
+    stats = mass.cache.get_stats()["music_provider_item"]
+    assert stats == {"memory_hits": 0, "db_hits": 2, "misses": 1}
+
+
+async def test_auto_cleanup(mass: MusicAssistant) -> None:
+    """Test that the cleanup removes the expired items and enables incremental vacuum."""
+    database = mass.cache.database
+    assert database is not None
+    await database.insert_many(
+        "cache",
+        [
+            {"category": 0, "base_key": "test", "sub_key": str(i), "expires": i, "data": "{}"}
+            for i in range(1000)
+        ],
+    )
+    await mass.cache.auto_cleanup()
+    query = "SELECT * FROM cache WHERE base_key = 'test'"
+    assert await database.get_count_from_query(query) == 0
+    cursor = await database.execute("PRAGMA auto_vacuum;")
+    assert (await cursor.fetchone())[0] == 2
+
+
+async def test_use_cache_single_flight(mass: MusicAssistant) -> None:
+    """Test that concurrent calls are coalesced and stale results are revalidated."""
+
+    class Provider:
+        def __init__(self) -> None:
+            self.mass = mass
+            self.cache = mass.cache
+            self.calls = 0
+
+        @use_cache(3600, stale_while_revalidate=True)
+        async def get_data(self, value: str) -> str:
+            self.calls += 1
+            await asyncio.sleep(0.1)
+            return f"{value}{self.calls}"
+
+    prov = Provider()
+    results = await asyncio.gather(*(prov.get_data("foo") for _ in range(5)))
+    assert results == ["foo1"] * 5
+    assert prov.calls == 1
+    # expire the cached result: the stale value is returned and refreshed in the background
+    await mass.cache.set("foo", "foo1", expiration=-1, base_key="Provider.get_data")
+    assert await prov.get_data("foo") == "foo1"
+    await asyncio.sleep(0.2)
+    assert prov.calls == 2
+    assert await prov.get_data("foo") == "foo2"
@@ -0,0 +1,95 @@
+"""Tests for the database helper."""
+
+import pathlib
+import sqlite3
+from collections.abc import AsyncGenerator
+
+import pytest
+
+from music_assistant.server.helpers.database import DatabaseConnection
+
+
+@pytest.fixture
+async def database(tmp_path: pathlib.Path) -> AsyncGenerator[DatabaseConnection, None]:
+    """Return a (file based) test database with a single table."""
+    db = DatabaseConnection(str(tmp_path / "test.db"), batch_size=3)
+    await db.setup()
+    await db.execute("CREATE TABLE items([item_id] INTEGER PRIMARY KEY, [name] TEXT)")
+    await db.commit()
+    try:
+        yield db
+    finally:
+        await db.close()
+
+
+def _committed_count(db: DatabaseConnection) -> int:
+    """Return the row count as seen by another (independent) connection."""
+    with sqlite3.connect(db.db_path) as conn:
+        count: int = conn.execute("SELECT count(*) FROM items").fetchone()[0]
+        return count
+
+
+async def test_batch_defers_commits(database: DatabaseConnection) -> None:
+    """Test that writes within a batch are committed in bounded batches."""
+    async with database.batch():
+        await database.insert("items", {"name": "a"})
+        await database.insert("items", {"name": "b"})
+        # writes are visible on the connection itself but not committed yet
+        assert await database.get_count("items") == 2
+        assert _committed_count(database) == 0
+        # batch size reached: all writes are committed
+        await database.insert("items", {"name": "c"})
+        assert _committed_count(database) == 3
+        await database.insert("items", {"name": "d"})
+        assert _committed_count(database) == 3
+    # leaving the batch commits the remainder
+    assert _committed_count(database) == 4
+
+
+async def test_nested_batch_and_insert_many(database: DatabaseConnection) -> None:
+    """Test that nested batches join the outer batch."""
+    async with database.batch() as outer:
+        async with database.batch() as inner:
+            assert inner is outer
+            await database.insert_many("items", [{"name": "a"}, {"name": "b"}])
+        assert _committed_count(database) == 0
+    assert not outer.active
+    assert _committed_count(database) == 2
+    # writes outside of a batch are committed right away
+    await database.insert("items", {"name": "c"})
+    assert _committed_count(database) == 3
+
+
+async def test_wal_mode_and_read_pool(database: DatabaseConnection) -> None:
+    """Test that reads use the read pool unless they are part of a write batch."""
+    async with database._db.execute("PRAGMA journal_mode;") as cursor:
+        journal_mode = await cursor.fetchone()
+        assert journal_mode is not None
+        assert journal_mode[0] == "wal"
+    await database.insert("items", {"item_id": 1, "name": "a"})
+    # committed writes are visible for the (read-only) pool connections
+    db_row = await database.get_row("items", {"item_id": 1})
+    assert db_row is not None
+    assert db_row["name"] == "a"
+    async with database.batch():
+        await database.update("items", {"item_id": 1}, {"name": "b"})
+        # reads within the batch see its uncommitted writes
+        db_row = await database.get_row("items", {"item_id": 1})
+        assert db_row is not None
+        assert db_row["name"] == "b"
+        # the read-only pool connections only see committed data
+        reader = database._readers[0]
+        assert next(iter(await reader.execute_fetchall("SELECT name FROM items")))["name"] == "a"
+    assert (await database.get_rows_from_query("SELECT * FROM items"))[0]["name"] == "b"
+
+
+async def test_iter_rows_keyset(database: DatabaseConnection) -> None:
+    """Test that keyset iteration does not skip rows that are deleted while iterating."""
+    await database.insert_many("items", [{"name": f"item{i}"} for i in range(10)])
+    seen = []
+    query = "SELECT item_id, name FROM items"
+    async for row in database.iter_rows_from_query(query, limit=3):
+        seen.append(row["item_id"])
+        await database.delete("items", {"item_id": row["item_id"]})
+    assert seen == list(range(1, 11))
+    assert [x async for x in database.iter_items("items")] == []
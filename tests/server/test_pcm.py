@@ -0,0 +1,93 @@
+"""Tests for the (in-process) PCM helpers."""
+
+import numpy as np
+import pytest
+
+from music_assistant.common.models.enums import ContentType
+from music_assistant.common.models.media_items import AudioFormat
+from music_assistant.server.helpers.pcm import (
+    CROSSFADE_CURVE_EQUAL_POWER,
+    CROSSFADE_CURVE_LINEAR,
+    LoudnessMeter,
+    crossfade_pcm,
+    float_to_pcm,
+    pcm_to_float,
+    strip_silence_pcm,
+)
+
+
+def _pcm_format(content_type: ContentType) -> AudioFormat:
+    bit_depth = {ContentType.PCM_S16LE: 16, ContentType.PCM_S24LE: 24}.get(content_type, 32)
+    return AudioFormat(
+        content_type=content_type, sample_rate=44100, bit_depth=bit_depth, channels=2
+    )
+
+
+@pytest.mark.parametrize(
+    "content_type",
+    [ContentType.PCM_S16LE, ContentType.PCM_S24LE, ContentType.PCM_S32LE, ContentType.PCM_F32LE],
+)
+def test_pcm_float_roundtrip(content_type: ContentType) -> None:
+    """Test that the conversion from and to floats is lossless."""
+    pcm_format = _pcm_format(content_type)
+    samples = np.sin(np.linspace(0, 100, 2000)).reshape(-1, 2) * 0.9
+    data = float_to_pcm(samples, pcm_format)
+    assert len(data) == 1000 * 2 * pcm_format.bit_depth // 8
+    assert np.allclose(pcm_to_float(data, pcm_format), samples, atol=2**-14)
+    assert float_to_pcm(pcm_to_float(data, pcm_format), pcm_format) == data
+
+
+@pytest.mark.parametrize("content_type", [ContentType.PCM_S24LE, ContentType.PCM_F32LE])
+def test_crossfade_pcm(content_type: ContentType) -> None:
+    """Test the crossfade curves and that the remainder of the largest part is kept."""
+    pcm_format = _pcm_format(content_type)
+    fade_out_part = float_to_pcm(np.full((1500, 2), 0.5), pcm_format)
+    fade_in_part = float_to_pcm(np.full((1000, 2), 0.5), pcm_format)
+    # linear: the sum of the gains is constant
+    result = crossfade_pcm(fade_in_part, fade_out_part, pcm_format, CROSSFADE_CURVE_LINEAR)
+    assert len(result) == len(fade_out_part)
+    head_size = len(fade_out_part) - len(fade_in_part)
+    assert result[:head_size] == fade_out_part[:head_size]
+    assert np.allclose(pcm_to_float(result, pcm_format), 0.5, atol=1e-6)
+    # equal power: quarter sine/cosine gain curves
+    fade_in_part = float_to_pcm(np.full((1000, 2), -0.5), pcm_format)
+    result = crossfade_pcm(fade_in_part, fade_out_part, pcm_format, CROSSFADE_CURVE_EQUAL_POWER)
+    samples = pcm_to_float(result, pcm_format)[500:]
+    position = (np.arange(1000) + 0.5) / 1000
+    expected = 0.5 * np.cos(position * np.pi / 2) - 0.5 * np.sin(position * np.pi / 2)
+    assert np.allclose(samples[:, 0], expected, atol=1e-6)
+
+
+def test_strip_silence_pcm() -> None:
+    """Test stripping the silence from the begin and end of pcm audio."""
+    pcm_format = _pcm_format(ContentType.PCM_S16LE)
+    samples = np.zeros((44100 * 3, 2))
+    samples[44100:88200] = 0.5
+    data = float_to_pcm(samples, pcm_format)
+    # 0.2 seconds is always skipped, 0.1 seconds of silence is kept
+    for reverse in (False, True):
+        stripped = strip_silence_pcm(data, pcm_format, reverse=reverse)
+        assert abs((len(data) - len(stripped)) / 4 - 44100 * 0.9) < 44100 * 0.02
+    assert strip_silence_pcm(data, pcm_format)[-4:] == data[-4:]
+    assert strip_silence_pcm(data, pcm_format, reverse=True)[:4] == data[:4]
+    assert strip_silence_pcm(float_to_pcm(samples[:44100], pcm_format), pcm_format) == b""
+
+
+def test_loudness_meter() -> None:
+    """Test the BS.1770 loudness measurement (EBU Tech 3341 test case 1)."""
+    pcm_format = AudioFormat(content_type=ContentType.PCM_S16LE, sample_rate=48000, bit_depth=16)
+    # 20 seconds of a 1 kHz sine wave at -23 dBFS on both channels measures -23 LUFS
+    frames = np.arange(20 * 48000) / 48000
+    sine = 10 ** (-23 / 20) * np.sin(2 * np.pi * 1000 * frames)
+    audio = float_to_pcm(np.stack((sine, sine), axis=1), pcm_format)
+    meter = LoudnessMeter(pcm_format)
+    assert meter.get_integrated_loudness() is None
+    # the audio is measured chunk by chunk
+    for pos in range(0, len(audio), 12345 * 4):
+        meter.process(audio[pos : pos + 12345 * 4])
+    assert meter.seconds_processed == 20
+    assert meter.get_integrated_loudness() == pytest.approx(-23, abs=0.1)
+    # silence is gated
+    meter = LoudnessMeter(pcm_format)
+    meter.process(bytes(len(audio)))
+    assert meter.get_integrated_loudness() is None
@@ -0,0 +1,126 @@
+"""Tests for the (polling of the) players controller."""
+
+import asyncio
+from typing import Any
+
+import pytest
+
+from music_assistant.common.models.enums import PlayerState, PlayerType
+from music_assistant.common.models.player import DeviceInfo, Player
+from music_assistant.server.controllers import players as players_controller
+from music_assistant.server.server import MusicAssistant
+
+
+class PollingProvider:
+    """Player provider (stub) that records the polls of its players."""
+
+    def __init__(self, slow_players: tuple[str, ...] = ()) -> None:
+        """Initialize PollingProvider."""
+        self.slow_players = slow_players
+        self.polls: list[str] = []
+        self.cancelled: list[str] = []
+
+    async def poll_player(self, player_id: str) -> None:
+        """Poll the player (a slow player never responds)."""
+        self.polls.append(player_id)
+        if player_id in self.slow_players:
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                self.cancelled.append(player_id)
+                raise
+
+
+def add_player(mass: MusicAssistant, player_id: str, **kwargs: Any) -> Player:
+    """Add a (dummy) player to the players controller."""
+    player = Player(
+        player_id=player_id,
+        provider="test",
+        type=PlayerType.PLAYER,
+        name=player_id,
+        available=True,
+        powered=True,
+        device_info=DeviceInfo(),
+        **kwargs,
+    )
+    mass.players._players[player_id] = player
+    mass.players.update(player_id)
+    return player
+
+
+@pytest.fixture
+def provider(mass: MusicAssistant, monkeypatch: pytest.MonkeyPatch) -> PollingProvider:
+    """Return the player provider (stub) that is used for all players."""
+    provider = PollingProvider(slow_players=("slow",))
+    monkeypatch.setattr(mass.players, "get_player_provider", lambda _: provider)
+    monkeypatch.setattr(players_controller, "POLL_TIMEOUT_MIN", 0.2)
+    monkeypatch.setattr(players_controller, "POLL_TIMEOUT_MAX", 0.2)
+    return provider
+
+
+async def test_poll_players(mass: MusicAssistant, provider: PollingProvider) -> None:
+    """Test that players are polled concurrently and that a slow poll is cancelled."""
+    add_player(mass, "slow", needs_poll=True, poll_interval=1)
+    add_player(mass, "fast", needs_poll=True, poll_interval=1)
+    await asyncio.sleep(0.1)
+    # both players are polled right away, the slow poll does not delay the other
+    assert sorted(provider.polls) == ["fast", "slow"]
+    assert "slow" in mass.players._poll_tasks
+    assert "fast" not in mass.players._poll_tasks
+    assert "fast" in mass.players._poll_timers
+    await asyncio.sleep(0.3)
+    # the slow poll is cancelled at its deadline and the next poll is scheduled
+    assert provider.cancelled == ["slow"]
+    assert "slow" not in mass.players._poll_tasks
+    assert "slow" in mass.players._poll_timers
+    await asyncio.sleep(1.2)
+    assert provider.polls.count("fast") == 2
+    assert provider.polls.count("slow") == 2
+
+
+async def test_poll_schedule(mass: MusicAssistant, provider: PollingProvider) -> None:
+    """Test (re)scheduling the poll timer of a player."""
+    add_player(mass, "push")
+    # a player that does not need polling never gets a timer
+    assert "push" not in mass.players._poll_timers
+    player = add_player(mass, "fast", needs_poll=True, poll_interval=30)
+    await asyncio.sleep(0.1)
+    assert provider.polls == ["fast"]
+    timer = mass.players._poll_timers["fast"]
+    assert timer.when() > mass.loop.time() + 20
+    # the timer is rescheduled when the poll interval decreases
+    player.poll_interval = 1
+    mass.players.update("fast")
+    assert mass.players._poll_timers["fast"] is not timer
+    assert mass.players._poll_timers["fast"].when() < mass.loop.time() + 2
+    # the timer is removed when the player no longer needs polling
+    player.needs_poll = False
+    mass.players.update("fast")
+    assert "fast" not in mass.players._poll_timers
+    assert timer.cancelled()
+
+
+@pytest.mark.usefixtures("provider")
+async def test_progress_update(mass: MusicAssistant, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that only a player that is playing its own queue gets progress updates."""
+    updates: list[str] = []
+    monkeypatch.setattr(
+        mass.player_queues, "on_player_update", lambda player, _: updates.append(player.player_id)
+    )
+    monkeypatch.setattr(players_controller, "PROGRESS_UPDATE_INTERVAL", 0.1)
+    playing = add_player(mass, "playing", state=PlayerState.PLAYING, active_source="playing")
+    add_player(mass, "other_source", state=PlayerState.PLAYING, active_source="other")
+    add_player(mass, "paused", state=PlayerState.PAUSED, active_source="paused")
+    assert set(mass.players._progress_timers) == {"playing"}
+    updates.clear()
+    await asyncio.sleep(0.35)
+    assert set(updates) == {"playing"}
+    assert len(updates) >= 2
+    # the progress updates stop when the player is no longer playing
+    playing.state = PlayerState.IDLE
+    mass.players.update("playing")
+    await asyncio.sleep(0.15)
+    updates.clear()
+    await asyncio.sleep(0.2)
+    assert not updates
+    assert not mass.players._progress_timers
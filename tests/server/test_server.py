@@ -1,9 +1,22 @@
 """Tests for the core Music Assistant server object."""
 
 import asyncio
+from collections.abc import AsyncGenerator
 
-from music_assistant.common.models.enums import EventType
+import orjson
+from aiohttp.test_utils import make_mocked_request
+
+from music_assistant.common.helpers.json_patch import apply_patch
+from music_assistant.common.models.api import (
+    CommandMessage,
+    EventDeltaMessage,
+    SuccessResultMessage,
+    parse_message,
+)
+from music_assistant.common.models.enums import EventType, PlayerType
 from music_assistant.common.models.event import MassEvent
+from music_assistant.common.models.player import DeviceInfo, Player
+from music_assistant.server.controllers.webserver import WebsocketClientHandler
 from music_assistant.server.server import MusicAssistant
 
 
@@ -48,3 +61,115 @@ async def test_events(mass: MusicAssistant) -> None:
         mass.signal_event(EventType.UNKNOWN)
         await asyncio.sleep(0)
         assert flag is False
+
+
+async def test_websocket_events(mass: MusicAssistant) -> None:
+    """Test that events are serialized once and filtered per websocket client."""
+    request = make_mocked_request("GET", "/ws")
+    clients = [WebsocketClientHandler(mass.webserver, request) for _ in range(3)]
+    for client in clients:
+        client._subscribed = True
+        client._event_filter = {EventType.UNKNOWN}
+        mass.webserver.clients.add(client)
+    clients[1]._event_filter = {EventType.AUTH_SESSION}
+    clients[2]._id_filter = {"myid1"}
+
+    mass.signal_event(EventType.UNKNOWN, "myid1", "mytestdata")
+    mass.signal_event(EventType.UNKNOWN, "myid2", "mytestdata")
+    await asyncio.sleep(0)
+
+    assert clients[0]._to_write.qsize() == 2
+    assert clients[1]._to_write.qsize() == 0
+    assert clients[2]._to_write.qsize() == 1
+    # all clients share the same serialized message
+    assert clients[0]._to_write.get_nowait() is clients[2]._to_write.get_nowait()
+    for client in clients:
+        mass.webserver.clients.discard(client)
+
+
+async def test_websocket_delta_updates(mass: MusicAssistant) -> None:
+    """Test that the player and queue events are sent as deltas to delta clients."""
+    request = make_mocked_request("GET", "/ws")
+    client = WebsocketClientHandler(mass.webserver, request)
+    client._subscribed = True
+    client._event_filter = {EventType.PLAYER_UPDATED}
+    client.delta_updates = True
+    mass.webserver.clients.add(client)
+    player = Player(
+        player_id="player1",
+        provider="test",
+        type=PlayerType.PLAYER,
+        name="Test",
+        available=True,
+        powered=True,
+        device_info=DeviceInfo(),
+    )
+
+    mass.webserver._send_events([MassEvent(EventType.PLAYER_UPDATED, "player1", player)])
+    player.volume_level = 50
+    mass.webserver._send_events([MassEvent(EventType.PLAYER_UPDATED, "player1", player)])
+    # unchanged state is not sent
+    mass.webserver._send_events([MassEvent(EventType.PLAYER_UPDATED, "player1", player)])
+
+    assert client._to_write.qsize() == 2
+    first = parse_message(orjson.loads(client._to_write.get_nowait()))
+    second = parse_message(orjson.loads(client._to_write.get_nowait()))
+    assert isinstance(first, EventDeltaMessage)
+    assert isinstance(second, EventDeltaMessage)
+    assert (first.seq, second.seq) == (0, 1)
+    assert second.patch == [{"op": "replace", "path": "/volume_level", "value": 50}]
+    state = apply_patch(apply_patch({}, first.patch), second.patch)
+    assert state == player.to_dict()
+    assert mass.webserver.resync_state()["players"]["player1"] == {"seq": 1, "state": state}
+    mass.webserver.clients.discard(client)
+
+
+async def test_websocket_result_pages(mass: MusicAssistant) -> None:
+    """Test that (large) results are sent in pages with flow control."""
+    request = make_mocked_request("GET", "/ws")
+    client = WebsocketClientHandler(mass.webserver, request)
+
+    async def list_items(count: int) -> AsyncGenerator[int, None]:
+        for item in range(count):
+            yield item
+
+    mass.register_api_command("test/list_items", list_items)
+    client._handle_command(
+        CommandMessage("1", "test/list_items", {"count": 7}, page_size=2, credits=1)
+    )
+    await asyncio.sleep(0.01)
+    # only a single page is sent until the client acknowledges it
+    assert client._to_write.qsize() == 1
+    client._handle_command(CommandMessage("2", "ack_result", {"message_id": "1", "credits": 5}))
+    await asyncio.sleep(0.01)
+    results = [
+        parse_message(orjson.loads(client._to_write.get_nowait()))
+        for _ in range(client._to_write.qsize())
+    ]
+    assert all(isinstance(x, SuccessResultMessage) for x in results)
+    assert [(x.result, x.partial) for x in results if isinstance(x, SuccessResultMessage)] == [
+        ([0, 1], True),
+        ([2, 3], True),
+        ([4, 5], True),
+        ([6], False),
+    ]
+
+    # a (waiting) result can be cancelled
+    client._handle_command(
+        CommandMessage("3", "test/list_items", {"count": 7}, page_size=2, credits=0)
+    )
+    await asyncio.sleep(0.01)
+    assert "3" in client._command_tasks
+    client._handle_command(CommandMessage("4", "cancel_result", {"message_id": "3"}))
+    await asyncio.sleep(0.01)
+    assert "3" not in client._command_tasks
+    assert client._to_write.qsize() == 0
+
+    # clients that did not request paging (e.g. older clients) get the full result at once
+    client._handle_command(CommandMessage("5", "test/list_items", {"count": 1200}))
+    await asyncio.sleep(0.01)
+    assert client._to_write.qsize() == 1
+    result = parse_message(orjson.loads(client._to_write.get_nowait()))
+    assert isinstance(result, SuccessResultMessage)
+    assert result.result == list(range(1200))
+    assert not result.partial
@@ -1,11 +1,30 @@
 """Tests for utility/helper functions."""
 
+import asyncio
+import pathlib
+from collections.abc import AsyncGenerator
+
 import pytest
 
 from music_assistant.common.helpers import uri, util
+from music_assistant.common.helpers.json_patch import apply_patch, get_patch
 from music_assistant.common.models import media_items
-from music_assistant.common.models.errors import MusicAssistantError
+from music_assistant.common.models.enums import ContentType, EventType
+from music_assistant.common.models.errors import AudioError, MusicAssistantError
+from music_assistant.common.models.event import MassEvent
+from music_assistant.common.models.media_items import AudioFormat
 from music_assistant.constants import SILENCE_FILE
+from music_assistant.server.helpers.audio import (
+    check_audio_support,
+    get_album_loudness,
+    parse_ffmpeg_time,
+)
+from music_assistant.server.helpers.audio_cache import AudioCache
+from music_assistant.server.helpers.buffer import ByteBuffer
+from music_assistant.server.helpers.event_coalescer import EventCoalescer
+from music_assistant.server.helpers.ffmpeg import FFMpeg
+from music_assistant.server.helpers.prefetch import PrefetchedStream
+from music_assistant.server.helpers.shared_stream import LagPolicy, SharedStream
 
 
 def test_version_extract() -> None:
@@ -81,3 +100,233 @@ async def test_uri_parsing() -> None:
     # test invalid uri
     with pytest.raises(MusicAssistantError):
         await uri.parse_uri("invalid://blah")
+
+
+def test_byte_buffer() -> None:
+    """Test the ByteBuffer appends and reads (and reclaims the consumed space)."""
+    buffer = ByteBuffer(b"abc")
+    buffer.append(b"def")
+    assert len(buffer) == 6
+    assert buffer.read(2) == b"ab"
+    assert buffer.read(-1) == b""
+    expected = b"cdef"
+    for chunk in (b"gh", b"ij", b"kl", b"mn"):
+        buffer.append(chunk)
+        expected += chunk
+        assert buffer.read(3) == expected[:3]
+        expected = expected[3:]
+        assert len(buffer) == len(expected)
+    assert buffer.read(10) == expected
+    assert not buffer
+
+
+def test_parse_ffmpeg_time() -> None:
+    """Test parsing the output time from the ffmpeg log."""
+    log_lines = [
+        "[out#0/mp3 @ 0x37723880] video:0KiB audio:28KiB subtitle:0KiB other streams:0KiB",
+        "size=      28KiB time=00:03:03.50 bitrate=  64.6kbits/s speed= 207x",
+    ]
+    assert parse_ffmpeg_time(log_lines) == 183.5
+    assert parse_ffmpeg_time(log_lines[:1]) is None
+
+
+def test_get_album_loudness() -> None:
+    """Test the calculation of the album loudness from its track measurements."""
+    assert get_album_loudness([]) is None
+    assert get_album_loudness([(-10, 200), (-10, 100)]) == -10
+    # the album loudness is a (duration weighted) power mean, not the mean of the loudness
+    assert get_album_loudness([(-10, 100), (-20, 100)]) == -12.6
+    assert get_album_loudness([(-10, 100), (-20, 300)]) == -14.88
+
+
+def test_json_patch() -> None:
+    """Test creating and applying (JSON-patch style) deltas."""
+    old = {"name": "a/b", "volume": 10, "media": {"title": "x", "artist": "y"}, "group": [1]}
+    new = {"name": "a/b", "volume": 20, "media": {"title": "z"}, "group": [1, 2], "new~key": 1}
+    patch = get_patch(old, new)
+    assert patch == [
+        {"op": "replace", "path": "/volume", "value": 20},
+        {"op": "replace", "path": "/media/title", "value": "z"},
+        {"op": "remove", "path": "/media/artist"},
+        {"op": "replace", "path": "/group", "value": [1, 2]},
+        {"op": "add", "path": "/new~0key", "value": 1},
+    ]
+    assert apply_patch(old, patch) == new
+    # the original dict is not modified
+    assert old["media"] == {"title": "x", "artist": "y"}
+    assert get_patch(new, new) == []
+    assert apply_patch(old, [{"op": "replace", "path": "", "value": new}]) == new
+
+
+async def test_event_coalescer() -> None:
+    """Test the coalescing of repeated events into batches."""
+    batches: list[list[MassEvent]] = []
+    coalescer = EventCoalescer(batches.append, 0.05)
+    for elapsed_time in range(10):
+        coalescer.add(MassEvent(EventType.QUEUE_TIME_UPDATED, "queue1", elapsed_time))
+        coalescer.add(MassEvent(EventType.PLAYER_UPDATED, "player1", elapsed_time))
+        coalescer.add(MassEvent(EventType.PLAYER_UPDATED, "player2", elapsed_time))
+    assert batches == []
+    await asyncio.sleep(0.1)
+    assert batches == [
+        [
+            MassEvent(EventType.QUEUE_TIME_UPDATED, "queue1", 9),
+            MassEvent(EventType.PLAYER_UPDATED, "player1", 9),
+            MassEvent(EventType.PLAYER_UPDATED, "player2", 9),
+        ]
+    ]
+    # other events flush the pending batch first to retain the order
+    batches.clear()
+    coalescer.add(MassEvent(EventType.PLAYER_UPDATED, "player1", 10))
+    coalescer.add(MassEvent(EventType.PLAYER_REMOVED, "player1"))
+    assert batches == [
+        [MassEvent(EventType.PLAYER_UPDATED, "player1", 10)],
+        [MassEvent(EventType.PLAYER_REMOVED, "player1")],
+    ]
+    assert coalescer.events_received == 32
+    assert coalescer.events_delivered == 5
+
+
+async def test_ffmpeg_final_log_lines() -> None:
+    """Test that the final ffmpeg log lines are collected when the process exits by itself."""
+    await check_audio_support()
+    pcm_format = AudioFormat(content_type=ContentType.PCM_S16LE, sample_rate=44100, bit_depth=16)
+
+    async def source() -> AsyncGenerator[bytes, None]:
+        for _ in range(4):
+            yield bytes(pcm_format.pcm_sample_size // 2)
+
+    ffmpeg_proc = FFMpeg(
+        source(), pcm_format, AudioFormat(content_type=ContentType.MP3), collect_log_history=True
+    )
+    await ffmpeg_proc.start()
+    async for _ in ffmpeg_proc.iter_any():
+        pass
+    await ffmpeg_proc.close()
+    assert parse_ffmpeg_time(ffmpeg_proc.log_history) == pytest.approx(2, abs=0.1)
+
+
+async def test_shared_stream() -> None:
+    """Test the fan-out of a shared stream with a late joining and a stalled subscriber."""
+
+    async def source() -> AsyncGenerator[bytes, None]:
+        for i in range(20):
+            yield bytes([i])
+
+    async def read_all(agen: AsyncGenerator[bytes, None]) -> bytes:
+        return b"".join([chunk async for chunk in agen])
+
+    stream = SharedStream(source(), backlog=2, history=5, timeout=0.1)
+    first = asyncio.create_task(read_all(stream.subscribe()))
+    # a stalled subscriber is no longer waited for and dropped when lagging too much
+    stalled = stream.subscribe()
+    assert await anext(stalled) == b"\x00"
+    await asyncio.sleep(0)
+    # a late joiner catches up from the start of the stream
+    late = asyncio.create_task(read_all(stream.subscribe()))
+    assert await first == await late == bytes(range(20))
+    assert not stream.joinable
+    with pytest.raises(AudioError):
+        await anext(stalled)
+    with pytest.raises(AudioError):
+        stream.subscribe()
+
+
+async def test_shared_stream_late_join() -> None:
+    """Test that a subscriber can still join once the history is discarded (if allowed)."""
+
+    async def source() -> AsyncGenerator[bytes, None]:
+        for i in range(20):
+            yield bytes([i])
+
+    async def read_all(agen: AsyncGenerator[bytes, None]) -> bytes:
+        return b"".join([chunk async for chunk in agen])
+
+    stream = SharedStream(source(), backlog=2, history=5, timeout=0.1, late_join=True)
+    first = stream.subscribe()
+    received = b"".join([await anext(first) for _ in range(10)])
+    assert stream.joinable
+    # the late joiner starts at the most recent chunk
+    late = stream.subscribe()
+    rest, late_received = await asyncio.gather(read_all(first), read_all(late))
+    received += rest
+    assert received == bytes(range(20))
+    assert late_received[0] >= 10
+    assert received.endswith(late_received)
+    assert not stream.joinable
+
+
+@pytest.mark.parametrize(
+    ("lag_policy", "expected"),
+    [
+        (LagPolicy.DROP, bytes([0, *range(13, 20)])),
+        (LagPolicy.SKIP_AHEAD, bytes([0, *range(15, 20)])),
+    ],
+)
+async def test_shared_stream_lag_policy(lag_policy: LagPolicy, expected: bytes) -> None:
+    """Test that a stalled subscriber does not throttle a live shared stream."""
+
+    async def source() -> AsyncGenerator[bytes, None]:
+        for i in range(20):
+            yield bytes([i])
+            await asyncio.sleep(0.01)
+
+    stream = SharedStream(
+        source(), backlog=2, history=5, timeout=0.05, lag_policy=lag_policy, live=True
+    )
+    stalled = stream.subscribe()
+    first = await anext(stalled)
+    await stream.task
+    # the stalled subscriber never lags more than history + backlog chunks behind
+    assert stream.metrics["max_lag"] <= 7
+    # the stalled subscriber continues from the chunks that are still buffered
+    assert first + b"".join([chunk async for chunk in stalled]) == expected
+    assert stream.metrics["skipped_chunks"] == 20 - len(expected)
+
+
+async def test_prefetched_stream() -> None:
+    """Test reading ahead of a stream into a bounded buffer."""
+
+    async def source() -> AsyncGenerator[bytes, None]:
+        for i in range(10):
+            yield bytes([i])
+
+    stream = PrefetchedStream(source(), max_chunks=3)
+    await asyncio.sleep(0.1)
+    # the source is only read until the buffer is full
+    assert stream.buffered_chunks == 3
+    assert not stream.task.done()
+    assert b"".join([chunk async for chunk in stream.read()]) == bytes(range(10))
+    assert stream.task.done()
+    with pytest.raises(RuntimeError):
+        await anext(stream.read())
+
+
+async def test_audio_cache(tmp_path: pathlib.Path) -> None:
+    """Test caching a (fully consumed) stream and the LRU eviction of the audio cache."""
+
+    async def source(size: int) -> AsyncGenerator[bytes, None]:
+        for _ in range(size // 100):
+            yield b"x" * 100
+
+    cache = AudioCache(str(tmp_path), max_size=2500)
+    await cache.setup()
+    assert b"".join([x async for x in cache.tee("track1", source(1000))]) == b"x" * 1000
+    # an aborted stream is not cached
+    tee = cache.tee("track2", source(1000))
+    await anext(tee)
+    await tee.aclose()
+    assert await cache.get("track2") is None
+    [x async for x in cache.tee("track2", source(1000))]
+    # accessing track1 makes track2 the least recently used entry
+    track1_path = await cache.get("track1")
+    assert track1_path is not None
+    assert pathlib.Path(track1_path).read_bytes() == b"x" * 1000
+    [x async for x in cache.tee("track3", source(1000))]
+    assert await cache.get("track2") is None
+    assert cache.size == 2000
+    assert len(list(tmp_path.iterdir())) == 2
+    # the entries are restored from disk
+    cache = AudioCache(str(tmp_path), max_size=2500)
+    await cache.setup()
+    assert await cache.get("track1") == track1_path